@@ -0,0 +1,42 @@
+"""add_dso_catalog_lookup_indexes
+
+Revision ID: b3d9e7a1c452
+Revises: 7171fad8dfe0
+Create Date: 2026-01-10 14:12:05.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9e7a1c452'
+down_revision: Union[str, Sequence[str], None] = '7171fad8dfe0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add indexes for catalog ID lookups and filtered magnitude-ordered listings."""
+    op.create_index('idx_dso_catalog_name_number', 'dso_catalog', ['catalog_name', 'catalog_number'], unique=False)
+    # Caldwell lookups use the index from 0f7dcc26ea5b, which 4e15e74c0778 dropped; restore it
+    # under its original name (a no-op where it still exists) rather than adding a second one
+    op.create_index(
+        'ix_dso_catalog_caldwell_number', 'dso_catalog', ['caldwell_number'], unique=False, if_not_exists=True
+    )
+    op.create_index('idx_dso_catalog_common_name', 'dso_catalog', ['common_name'], unique=False)
+    op.create_index('idx_dso_catalog_type_magnitude', 'dso_catalog', ['object_type', 'magnitude'], unique=False)
+    op.create_index(
+        'idx_dso_catalog_constellation_magnitude', 'dso_catalog', ['constellation', 'magnitude'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Remove catalog lookup indexes."""
+    op.drop_index('idx_dso_catalog_constellation_magnitude', table_name='dso_catalog')
+    op.drop_index('idx_dso_catalog_type_magnitude', table_name='dso_catalog')
+    op.drop_index('idx_dso_catalog_common_name', table_name='dso_catalog')
+    op.drop_index('ix_dso_catalog_caldwell_number', table_name='dso_catalog')
+    op.drop_index('idx_dso_catalog_name_number', table_name='dso_catalog')
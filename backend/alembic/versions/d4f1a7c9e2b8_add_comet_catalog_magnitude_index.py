@@ -0,0 +1,44 @@
+"""add_comet_catalog_magnitude_index
+
+Revision ID: d4f1a7c9e2b8
+Revises: b3d9e7a1c452
+Create Date: 2026-10-17 10:24:51.402317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1a7c9e2b8'
+down_revision: Union[str, Sequence[str], None] = 'b3d9e7a1c452'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add magnitude index covering the orbital elements read by the visibility query."""
+    op.create_index(
+        'idx_comet_catalog_magnitude',
+        'comet_catalog',
+        ['current_magnitude'],
+        unique=False,
+        postgresql_include=[
+            'id',
+            'perihelion_distance_au',
+            'eccentricity',
+            'inclination_deg',
+            'arg_perihelion_deg',
+            'ascending_node_deg',
+            'perihelion_time_jd',
+            'absolute_magnitude',
+            'magnitude_slope',
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Remove comet magnitude index."""
+    op.drop_index('idx_comet_catalog_magnitude', table_name='comet_catalog')
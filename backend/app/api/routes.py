@@ -148,15 +148,21 @@ async def list_targets(
 
         catalog_service = CatalogService(db)
 
-        # Get filtered targets (without pagination to allow sorting)
-        targets = catalog_service.filter_targets(
-            object_types=object_types,
-            min_magnitude=min_magnitude,
-            max_magnitude=max_magnitude,
-            constellation=constellation,
-            limit=None,  # Get all for sorting, then paginate
-            offset=0,
-        )
+        unfiltered = not object_types and min_magnitude is None and max_magnitude is None and not constellation
+        if unfiltered and sort_by == "magnitude" and limit:
+            # Catalog order is magnitude order: read just the page (from the database
+            # if the catalog index is still loading) instead of every target
+            targets = None
+        else:
+            # Get filtered targets (without pagination to allow sorting)
+            targets = catalog_service.filter_targets(
+                object_types=object_types,
+                min_magnitude=min_magnitude,
+                max_magnitude=max_magnitude,
+                constellation=constellation,
+                limit=None,  # Get all for sorting, then paginate
+                offset=0,
+            )
 
         # Performance optimization: Only calculate visibility for ALL targets if sorting by visibility
         # Otherwise, sort first, paginate, then calculate visibility only for paginated results
@@ -179,11 +185,10 @@ async def list_targets(
                     ephemeris = EphemerisService()
                     current_time = datetime.now(pytz.timezone(location.timezone))
 
-                    # Add visibility to each target (only brightest 500)
-                    targets_for_visibility = [
-                        catalog_service.add_visibility_info(target, location, ephemeris, current_time)
-                        for target in targets_for_visibility
-                    ]
+                    # Add visibility to the brightest 500 in one batched pass
+                    targets_for_visibility = catalog_service.add_visibility_info_bulk(
+                        targets_for_visibility, location, ephemeris, current_time
+                    )
             except Exception as e:
                 # If visibility fails, continue without it
                 print(f"Warning: Could not calculate visibility: {e}")
@@ -208,16 +213,19 @@ async def list_targets(
             paginated = targets_for_visibility[offset : offset + limit] if limit else targets_for_visibility[offset:]
 
         else:
-            # Sort by non-visibility fields first (no visibility calculation needed)
-            if sort_by == "magnitude":
-                targets.sort(key=lambda t: t.magnitude)
-            elif sort_by == "size":
-                targets.sort(key=lambda t: t.size_arcmin, reverse=True)
-            elif sort_by == "name":
-                targets.sort(key=lambda t: t.catalog_id)
+            if targets is None:
+                paginated = catalog_service.get_targets_page(offset=offset, page_size=limit)
+            else:
+                # Sort by non-visibility fields first (no visibility calculation needed)
+                if sort_by == "magnitude":
+                    targets.sort(key=lambda t: t.magnitude)
+                elif sort_by == "size":
+                    targets.sort(key=lambda t: t.size_arcmin, reverse=True)
+                elif sort_by == "name":
+                    targets.sort(key=lambda t: t.catalog_id)
 
-            # Apply pagination BEFORE calculating visibility (performance optimization)
-            paginated = targets[offset : offset + limit] if limit else targets[offset:]
+                # Apply pagination BEFORE calculating visibility (performance optimization)
+                paginated = targets[offset : offset + limit] if limit else targets[offset:]
 
             # Now add visibility only to the paginated results
             if include_visibility:
@@ -229,11 +237,10 @@ async def list_targets(
                         ephemeris = EphemerisService()
                         current_time = datetime.now(pytz.timezone(location.timezone))
 
-                        # Add visibility to each paginated target
-                        paginated = [
-                            catalog_service.add_visibility_info(target, location, ephemeris, current_time)
-                            for target in paginated
-                        ]
+                        # Add visibility to the paginated targets in one batched pass
+                        paginated = catalog_service.add_visibility_info_bulk(
+                            paginated, location, ephemeris, current_time
+                        )
                 except Exception as e:
                     # If visibility fails, continue without it
                     print(f"Warning: Could not calculate visibility: {e}")
@@ -519,10 +526,6 @@ async def search_catalog(
     try:
         import time
 
-        from sqlalchemy import func, or_
-
-        from app.models.catalog_models import DSOCatalog
-
         # Create cache key from query parameters
         cache_key = f"catalog:{search}:{type}:{constellation}:{max_magnitude}:{sort_by}:{page}:{page_size}"
 
@@ -535,65 +538,35 @@ async def search_catalog(
                 # Remove expired entry
                 del catalog_cache[cache_key]
 
-        # Build query with filters (do NOT call .all() yet!)
-        query = db.query(DSOCatalog)
-
-        # Apply type filter
-        if type:
-            query = query.filter(DSOCatalog.object_type == type)
-
-        # Apply constellation filter
-        if constellation:
-            query = query.filter(DSOCatalog.constellation == constellation)
-
-        # Apply magnitude filter
-        if max_magnitude:
-            query = query.filter(DSOCatalog.magnitude <= max_magnitude)
-
-        # Apply search filter using SQL ILIKE for case-insensitive search
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    DSOCatalog.common_name.ilike(search_pattern),
-                    func.concat(DSOCatalog.catalog_name, DSOCatalog.catalog_number).ilike(search_pattern),
-                )
-            )
-
-        # Get total count BEFORE pagination (efficient - just counts, doesn't fetch rows)
-        total = query.count()
-
-        # Apply sorting using SQL ORDER BY
-        if sort_by == "magnitude":
-            query = query.order_by(DSOCatalog.magnitude.asc().nullslast())
-        elif sort_by == "type":
-            query = query.order_by(DSOCatalog.object_type.asc())
-        else:  # name (default)
-            query = query.order_by(DSOCatalog.catalog_name.asc(), DSOCatalog.catalog_number.asc())
-
-        # Apply pagination using SQL LIMIT/OFFSET
-        offset = (page - 1) * page_size
-        paginated_results = query.limit(page_size).offset(offset).all()
+        # Filtering, counting, sorting and pagination happen in SQL; constellation
+        # names are joined in rather than looked up per row
+        catalog_service = CatalogService(db)
+        paginated_results, total = catalog_service.search_catalog(
+            search=search,
+            object_type=type,
+            constellation=constellation,
+            max_magnitude=max_magnitude,
+            sort_by=sort_by,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+        )
 
         # Convert ONLY the paginated results to response format
-        catalog_service = CatalogService(db)
         items = []
-        for dso in paginated_results:
-            target = catalog_service._db_row_to_target(dso)
-            # Get constellation details
-            constellation_details = catalog_service._get_constellation_details(dso.constellation)
+        for row in paginated_results:
+            # Unknown abbreviations fall back to the abbreviation itself
+            constellation_full = row.full_constellation or row.constellation
+            target = catalog_service._db_row_to_target(row, constellation_full)
 
             items.append(
                 {
                     "id": target.catalog_id,
                     "name": target.name,
-                    "common_name": dso.common_name,  # Include common_name from database
+                    "common_name": row.common_name,  # Include common_name from database
                     "type": target.object_type,
-                    "constellation": dso.constellation,
-                    "constellation_full": (
-                        constellation_details["full_name"] if constellation_details else dso.constellation
-                    ),
-                    "constellation_common": constellation_details["common_name"] if constellation_details else None,
+                    "constellation": row.constellation,
+                    "constellation_full": constellation_full,
+                    "constellation_common": row.constellation_common,
                     "magnitude": target.magnitude,
                     "ra": target.ra_hours * 15,  # Convert hours to degrees
                     "dec": target.dec_degrees,
@@ -1806,53 +1779,14 @@ async def get_target_preview(sanitized_catalog_id: str, db: Session = Depends(ge
         Image file (JPEG)
     """
     try:
-        from app.services.catalog_service import CatalogService
-        from app.services.image_preview_service import ImagePreviewService
-
-        # Parse catalog ID to find target in database
-        # Catalog IDs are like: M31, NGC224, IC434, C80
-        catalog_service = CatalogService(db)
-
-        target = None
-
-        # Try to parse catalog ID format
         import logging
-        import re
-
-        logger = logging.getLogger(__name__)
-
-        # Match patterns like M31, NGC224, IC434, C80
-        match = re.match(r"([A-Z]+)(\d+)", sanitized_catalog_id)
-        if match:
-            catalog_name = match.group(1)
-            catalog_number = int(match.group(2))
-
-            logger.info(f"Looking up target: {catalog_name}{catalog_number}")
 
-            # Query database for this specific catalog entry
-            from app.models.catalog_models import DSOCatalog
+        from app.services.image_preview_service import ImagePreviewService
 
-            # Handle special cases
-            if catalog_name == "M":
-                # Messier objects - find by common_name starting with M
-                dso = db.query(DSOCatalog).filter(DSOCatalog.common_name.like(f"M%{catalog_number:03d}")).first()
-            elif catalog_name == "C":
-                # Caldwell objects - find by caldwell_number
-                dso = db.query(DSOCatalog).filter(DSOCatalog.caldwell_number == catalog_number).first()
-            else:
-                # NGC, IC, etc. - find by catalog_name and catalog_number
-                dso = (
-                    db.query(DSOCatalog)
-                    .filter(DSOCatalog.catalog_name == catalog_name, DSOCatalog.catalog_number == catalog_number)
-                    .first()
-                )
-                logger.info(f"DSO query result for {catalog_name}{catalog_number}: {dso is not None}")
+        logger = logging.getLogger(__name__)
 
-            if dso:
-                target = catalog_service._db_row_to_target(dso)
-                logger.info(f"Successfully created target for {sanitized_catalog_id}")
-        else:
-            logger.warning(f"Failed to parse catalog ID: {sanitized_catalog_id}")
+        # Catalog IDs are like: M31, NGC224, IC434, C80; resolved from the in-memory catalog index
+        target = CatalogService(db).get_target_by_id(sanitized_catalog_id)
 
         if not target:
             logger.warning(f"Target not found: {sanitized_catalog_id}")
@@ -51,6 +51,8 @@ class Settings(BaseSettings):
     # Processing
     fits_dir: str = "./fits"  # Directory for FITS file storage
     processing_dir: str = "./data/processing"  # Directory for processing work
+    fits_cache_dir: str = ""  # On-disk cache of decoded FITS frames (.npy); empty disables it
+    fits_cache_max_mb: int = 2048  # Least recently used frames are evicted beyond this size
 
     # Seestar Authentication
     seestar_private_key_path: str = "./secrets/seestar_private_key.pem"  # Path to Seestar RSA private key
@@ -67,6 +69,9 @@ class Settings(BaseSettings):
     capture_complete_hours: float = 3.0
     capture_needs_more_hours: float = 1.0
 
+    # Build the in-memory catalog index in the background at startup
+    preload_catalog_index: bool = True
+
     # File scanner settings
     file_scan_on_startup: bool = False
     file_scan_extensions: List[str] = [".fit", ".fits", ".jpg", ".png", ".tiff", ".avi"]
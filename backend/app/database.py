@@ -2,7 +2,7 @@
 
 import logging
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -16,12 +16,34 @@ settings = get_settings()
 DATABASE_URL = settings.database_url
 logger.info("Database URL configured: %s", DATABASE_URL)
 
+# Pragmas applied to each new SQLite connection (PostgreSQL is the default backend).
+# Pooled connections keep them, so reads hit a warm page cache / mmap instead of
+# re-reading pages; WAL also lets readers proceed while a write is in progress.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # ~20 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune a freshly opened SQLite connection for read-heavy catalog queries."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
     echo=False,  # Set to True for SQL logging during development
 )
+if "sqlite" in DATABASE_URL:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -31,6 +53,8 @@ TEST_DATABASE_URL = settings.test_database_url
 test_engine = create_engine(
     TEST_DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in TEST_DATABASE_URL else {}, echo=False
 )
+if "sqlite" in TEST_DATABASE_URL:
+    event.listen(test_engine, "connect", _apply_sqlite_pragmas)
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
 # Create declarative base
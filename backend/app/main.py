@@ -1,5 +1,6 @@
 """Main FastAPI application."""
 
+import asyncio
 import logging
 from pathlib import Path
 
@@ -10,6 +11,9 @@ from fastapi.staticfiles import StaticFiles
 
 from app.api import router
 from app.core import get_settings
+from app.database import SessionLocal
+from app.services.catalog_service import CatalogService
+from app.services.cleardarksky_service import close_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +63,18 @@ else:
     logger.warning("Frontend not found at %s", frontend_path)
 
 
+def _preload_catalog_index():
+    """Build the in-memory catalog index so the first catalog request doesn't pay for it."""
+    db = SessionLocal()
+    try:
+        CatalogService(db).load_index()
+        logger.info("Catalog index loaded")
+    except Exception as e:
+        logger.warning("Catalog index preload failed, will load on first use: %s", e)
+    finally:
+        db.close()
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
@@ -67,12 +83,25 @@ async def startup_event():
     logger.info("Seestar S50 FOV: %s° × %s°", settings.seestar_fov_width, settings.seestar_fov_height)
     logger.info("Min target duration: %s minutes", settings.min_target_duration_minutes)
 
+    # Load the catalog in the background; requests arriving before it finishes
+    # wait for it (filters) or read their page straight from the database.
+    app.state.catalog_preload = None
+    if settings.preload_catalog_index:
+        app.state.catalog_preload = asyncio.get_running_loop().run_in_executor(None, _preload_catalog_index)
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Astro Planner API shutting down...")
 
+    # Let a still-running catalog preload finish and close its session
+    catalog_preload = getattr(app.state, "catalog_preload", None)
+    if catalog_preload is not None:
+        await catalog_preload
+
+    close_http_client()
+
 
 if __name__ == "__main__":
     import uvicorn
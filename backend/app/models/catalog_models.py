@@ -2,7 +2,8 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, Float, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, Float, Index, Integer, String, Text, case, cast, func, literal
+from sqlalchemy.orm import column_property
 
 from app.database import Base
 
@@ -11,6 +12,16 @@ class DSOCatalog(Base):
     """Deep Sky Object catalog table."""
 
     __tablename__ = "dso_catalog"
+    __table_args__ = (
+        # Catalog ID lookups (NGC224, C80, M31)
+        Index("idx_dso_catalog_name_number", "catalog_name", "catalog_number"),
+        Index("ix_dso_catalog_caldwell_number", "caldwell_number"),
+        Index("idx_dso_catalog_common_name", "common_name"),
+        # Magnitude-ordered listings, optionally filtered by type or constellation
+        Index("idx_dso_catalog_magnitude", "magnitude"),
+        Index("idx_dso_catalog_type_magnitude", "object_type", "magnitude"),
+        Index("idx_dso_catalog_constellation_magnitude", "constellation", "magnitude"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     catalog_name = Column(String(10), nullable=False)  # NGC, IC
@@ -28,11 +39,48 @@ class DSOCatalog(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Canonical catalog ID (M31, C80, NGC224, IC434), computed by the database in the SELECT.
+    # Messier objects are stored with common_name like "M031"; the designation drops the
+    # leading zeros. Otherwise the Caldwell designation is preferred over NGC/IC.
+    catalog_id = column_property(
+        case(
+            (
+                common_name.regexp_match(r"^M[0-9]+$"),
+                literal("M") + cast(cast(func.substr(common_name, 2), Integer), String),
+            ),
+            (caldwell_number.isnot(None), literal("C") + cast(caldwell_number, String)),
+            else_=catalog_name + cast(catalog_number, String),
+        )
+    )
+
+
+# Columns read by the batched comet ephemeris (CometService._fetch_orbital_arrays)
+COMET_ELEMENT_COLUMNS = [
+    "id",
+    "perihelion_distance_au",
+    "eccentricity",
+    "inclination_deg",
+    "arg_perihelion_deg",
+    "ascending_node_deg",
+    "perihelion_time_jd",
+    "absolute_magnitude",
+    "magnitude_slope",
+]
+
 
 class CometCatalog(Base):
     """Comet catalog table."""
 
     __tablename__ = "comet_catalog"
+    __table_args__ = (
+        # Magnitude-ordered listings and the visibility query's magnitude cut; on
+        # PostgreSQL the orbital elements ride along so that query reads only the index
+        Index(
+            "idx_comet_catalog_magnitude",
+            "current_magnitude",
+            postgresql_include=COMET_ELEMENT_COLUMNS,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     designation = Column(String(50), nullable=False, unique=True)  # Official designation (e.g., C/2020 F3)
@@ -1,5 +1,6 @@
 """Caldwell catalog of deep-sky objects for amateur astronomers."""
 
+from functools import lru_cache
 from typing import List, Optional
 
 from pydantic import BaseModel
@@ -211,3 +212,9 @@ class CaldwellCatalog:
         """
         min_dec = latitude - 90.0 + min_altitude
         return [obj for obj in self.objects if obj.dec_degrees >= min_dec]
+
+
+@lru_cache(maxsize=1)
+def get_caldwell_catalog() -> CaldwellCatalog:
+    """Get the shared catalog instance, built once per process."""
+    return CaldwellCatalog()
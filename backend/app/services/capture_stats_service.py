@@ -19,7 +19,7 @@ class CaptureStatsService:
         self.complete_threshold_hours = settings.capture_complete_hours
         self.needs_more_threshold_hours = settings.capture_needs_more_hours
 
-    def update_capture_history(self, catalog_id: str) -> CaptureHistory:
+    def update_capture_history(self, catalog_id: str, commit: bool = True) -> CaptureHistory:
         """
         Update or create capture history for target.
 
@@ -33,6 +33,8 @@ class CaptureStatsService:
 
         Args:
             catalog_id: Catalog identifier (e.g., "M31")
+            commit: Commit the session after updating. Pass False when batching
+                several updates into one transaction.
 
         Returns:
             Updated or created CaptureHistory record
@@ -102,7 +104,8 @@ class CaptureStatsService:
             )
             self.db.add(capture)
 
-        self.db.commit()
+        if commit:
+            self.db.commit()
         self.logger.info(f"Updated capture history for {catalog_id}: {total_frames} frames, {total_hours:.1f}h")
 
         return capture
@@ -118,10 +121,17 @@ class CaptureStatsService:
         catalog_ids = self.db.query(OutputFile.catalog_id).distinct().all()
         catalog_ids = [c[0] for c in catalog_ids]
 
+        # Update all targets in a single transaction (one commit instead of one per target)
         count = 0
-        for catalog_id in catalog_ids:
-            self.update_capture_history(catalog_id)
-            count += 1
+        try:
+            for catalog_id in catalog_ids:
+                self.update_capture_history(catalog_id, commit=False)
+                count += 1
+            self.db.commit()
+        except Exception:
+            self.logger.exception("Failed to update capture histories, rolling back")
+            self.db.rollback()
+            raise
 
         self.logger.info(f"Updated {count} capture histories")
         return count
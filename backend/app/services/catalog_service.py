@@ -1,17 +1,249 @@
 """DSO catalog management service."""
 
+import re
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, List, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pytz
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
-from app.models import DSOTarget, Location, TargetVisibility
+from app.models import DSOTarget, Location, TargetVisibility, VisibilityStatus
 from app.models.catalog_models import ConstellationName, DSOCatalog
 
 if TYPE_CHECKING:
     from app.services.ephemeris_service import EphemerisService
 
+# Catalog IDs accepted by get_target_by_id: M31, C80, NGC224, IC434
+CATALOG_ID_PATTERN = re.compile(r"^(M|C|NGC|IC)\s*(\d+)$")
+
+# Columns read by CatalogService._db_row_to_target; the catalog index load selects
+# only these (plus the joined constellation name) instead of hydrating full ORM rows
+TARGET_COLUMNS = (
+    DSOCatalog.catalog_id,
+    DSOCatalog.catalog_name,
+    DSOCatalog.catalog_number,
+    DSOCatalog.common_name,
+    DSOCatalog.caldwell_number,
+    DSOCatalog.object_type,
+    DSOCatalog.ra_hours,
+    DSOCatalog.dec_degrees,
+    DSOCatalog.magnitude,
+    DSOCatalog.size_major_arcmin,
+    DSOCatalog.constellation,
+)
+
+# Catalog listing order: brightest first, unknown magnitude last (ties by insertion order)
+TARGET_ORDER = (DSOCatalog.magnitude.asc().nullslast(), DSOCatalog.id.asc())
+
+
+@dataclass(eq=False)
+class CatalogIndex:
+    """In-memory copy of the DSO catalog, built once per process.
+
+    The catalog is small (a few thousand rows) and read-only during normal
+    operation, so listings and lookups are served from here instead of the
+    database. Call CatalogService.clear_cache() after re-importing the catalog.
+
+    Filterable columns are kept as arrays aligned with targets, so filters are
+    evaluated as vectorized masks and only matching targets are touched.
+
+    Compared by identity, so an index can key the filter result cache.
+    """
+
+    # Targets in magnitude order (brightest first, unknown magnitude last)
+    targets: List[DSOTarget]
+    # Normalized catalog ID (M31, C80, NGC224, IC434) -> target
+    by_id: Dict[str, DSOTarget]
+    # Caldwell targets in Caldwell number order
+    caldwell: List[DSOTarget]
+    # Object type -> positions in targets
+    by_type: Dict[str, np.ndarray]
+    # Column values aligned with targets (magnitude is NaN where unknown)
+    magnitude: np.ndarray
+    constellation: np.ndarray
+    catalog_name: np.ndarray
+    is_messier: np.ndarray
+    has_caldwell: np.ndarray
+    # Coordinates in radians, aligned with targets
+    ra_radians: np.ndarray
+    dec_radians: np.ndarray
+    # Sky box ID (see sky_box_ids) -> positions in targets, so region queries only
+    # visit the boxes covering the region
+    by_box: Dict[int, np.ndarray]
+
+
+# Sky boxes: a fixed RA/Dec grid of square cells, numbered row-major from the south pole
+SKY_BOX_SIZE_DEG = 2.5
+SKY_BOX_ROWS = int(180 / SKY_BOX_SIZE_DEG)
+SKY_BOX_COLUMNS = int(360 / SKY_BOX_SIZE_DEG)
+
+# Distinct filter combinations whose matching positions are remembered
+FILTER_CACHE_SIZE = 512
+
+# Rows fetched per round trip while streaming the catalog into the index
+INDEX_LOAD_BATCH_SIZE = 500
+
+# Visibility status for each integer code returned by _classify_altitudes
+VISIBILITY_STATUS_CODES = (
+    VisibilityStatus.BELOW_HORIZON,
+    VisibilityStatus.RISING,
+    VisibilityStatus.VISIBLE,
+    VisibilityStatus.SETTING,
+)
+
+_catalog_index: Optional[CatalogIndex] = None
+_catalog_index_lock = threading.Lock()
+
+
+def _is_messier_id(catalog_id: str) -> bool:
+    """Whether a computed catalog ID is a Messier designation (M31, not Messier31 or NGC224)."""
+    return catalog_id[:1] == "M" and catalog_id[1:].isdigit()
+
+
+def _paginate(items: List[DSOTarget], limit: Optional[int], offset: int) -> List[DSOTarget]:
+    """Apply limit/offset like the SQL queries did (offset only applies with a limit)."""
+    if limit:
+        return items[offset : offset + limit]
+    return list(items)
+
+
+@lru_cache(maxsize=None)
+def _object_type_name(object_type: str) -> str:
+    """Display form of an object type (e.g. "planetary_nebula" -> "Planetary Nebula").
+
+    There are only a handful of distinct types, so the result is cached for the process.
+    """
+    return object_type.replace("_", " ").title()
+
+
+def angular_separation_arcmin(ra1: np.ndarray, dec1: np.ndarray, ra2: np.ndarray, dec2: np.ndarray) -> np.ndarray:
+    """
+    Great-circle separation between sky positions, element-wise (inputs broadcast).
+
+    Uses the haversine formula, which stays accurate for the small separations
+    typical of field-of-view checks.
+
+    Args:
+        ra1, dec1: First positions in radians
+        ra2, dec2: Second positions in radians
+
+    Returns:
+        Separations in arcminutes
+    """
+    hav = np.sin((dec2 - dec1) / 2) ** 2 + np.cos(dec1) * np.cos(dec2) * np.sin((ra2 - ra1) / 2) ** 2
+    return np.degrees(2 * np.arcsin(np.sqrt(np.clip(hav, 0.0, 1.0)))) * 60.0
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _filter_positions(
+    index: CatalogIndex,
+    object_types: FrozenSet[str],
+    min_magnitude: Optional[float],
+    max_magnitude: Optional[float],
+    constellation: Optional[str],
+    catalog: Optional[str],
+) -> np.ndarray:
+    """
+    Positions in index.targets matching a filter (see CatalogService.filter_targets).
+
+    The catalog is read-only at runtime, so results are cached per filter
+    combination; the arrays are read-only because they are shared between calls.
+    """
+    mask = np.ones(len(index.targets), dtype=bool)
+
+    if object_types:
+        mask[:] = False
+        for object_type in object_types:
+            mask[index.by_type.get(object_type, [])] = True
+    # NaN (unknown) magnitudes never satisfy a bound, matching SQL NULL semantics
+    if min_magnitude is not None:
+        mask &= index.magnitude >= min_magnitude
+    if max_magnitude is not None:
+        mask &= index.magnitude <= max_magnitude
+    if constellation:
+        mask &= index.constellation == constellation
+
+    if catalog == "M":
+        mask &= index.is_messier
+    elif catalog == "C":
+        mask &= index.has_caldwell
+    elif catalog:
+        mask &= index.catalog_name == catalog
+
+    positions = np.flatnonzero(mask)
+    positions.setflags(write=False)
+    return positions
+
+
+def sky_box_ids(ra_hours: np.ndarray, dec_degrees: np.ndarray) -> np.ndarray:
+    """
+    Sky box ID for each position (inputs broadcast).
+
+    Args:
+        ra_hours: Right ascensions in hours
+        dec_degrees: Declinations in degrees
+
+    Returns:
+        Integer box IDs in [0, SKY_BOX_ROWS * SKY_BOX_COLUMNS)
+    """
+    rows = np.clip(((np.asarray(dec_degrees) + 90.0) // SKY_BOX_SIZE_DEG).astype(np.intp), 0, SKY_BOX_ROWS - 1)
+    columns = ((np.asarray(ra_hours) * 15.0 % 360.0) // SKY_BOX_SIZE_DEG).astype(np.intp) % SKY_BOX_COLUMNS
+    return rows * SKY_BOX_COLUMNS + columns
+
+
+def sky_boxes_in_cone(ra_hours: float, dec_degrees: float, radius_degrees: float) -> np.ndarray:
+    """
+    IDs of the sky boxes that together cover a cone (a superset; corners may lie outside it).
+
+    Args:
+        ra_hours: Right ascension of the cone center in hours
+        dec_degrees: Declination of the cone center in degrees
+        radius_degrees: Cone radius in degrees
+
+    Returns:
+        Array of box IDs
+    """
+    dec_lo = dec_degrees - radius_degrees
+    dec_hi = dec_degrees + radius_degrees
+    rows = np.arange(
+        max(int((dec_lo + 90.0) // SKY_BOX_SIZE_DEG), 0),
+        min(int((dec_hi + 90.0) // SKY_BOX_SIZE_DEG), SKY_BOX_ROWS - 1) + 1,
+    )
+
+    if dec_lo <= -90.0 or dec_hi >= 90.0:
+        # Cone contains a pole: every right ascension is inside the band
+        columns = np.arange(SKY_BOX_COLUMNS)
+    else:
+        # Widest RA extent of a cone that doesn't contain a pole
+        half_width = np.degrees(np.arcsin(np.sin(np.radians(radius_degrees)) / np.cos(np.radians(dec_degrees))))
+        ra_degrees = ra_hours * 15.0
+        first = int((ra_degrees - half_width) // SKY_BOX_SIZE_DEG)
+        last = int((ra_degrees + half_width) // SKY_BOX_SIZE_DEG)
+        columns = np.arange(first, min(last, first + SKY_BOX_COLUMNS - 1) + 1) % SKY_BOX_COLUMNS
+
+    return (rows[:, np.newaxis] * SKY_BOX_COLUMNS + columns[np.newaxis, :]).ravel()
+
+
+def _classify_altitudes(altitudes: np.ndarray) -> np.ndarray:
+    """
+    Classify altitudes into visibility status codes (see VISIBILITY_STATUS_CODES).
+
+    Vectorized form of the cascade in add_visibility_info: at or below 0° is
+    below the horizon, under 30° rising, over 70° setting, otherwise visible.
+    Codes are assigned from lowest to highest precedence so later masks win.
+    """
+    codes = np.full(altitudes.shape, 2, dtype=np.int8)
+    codes[altitudes > 70] = 3
+    codes[altitudes < 30] = 1
+    codes[altitudes <= 0] = 0
+    return codes
+
 
 class CatalogService:
     """Service for managing deep sky object catalog."""
@@ -19,25 +251,105 @@ class CatalogService:
     def __init__(self, db: Session):
         """Initialize catalog service with database session."""
         self.db = db
+        # Constellation abbreviation -> full name, loaded on first use so listing
+        # many targets does not issue one lookup query per row
+        self._constellation_map: Optional[Dict[str, str]] = None
+        # (object_type, full constellation) -> description prefix; a listing has
+        # far fewer distinct pairs than rows, so the string work is done once per pair
+        self._description_prefixes: Dict[Tuple[str, Optional[str]], str] = {}
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop the in-memory catalog index (e.g. after the catalog tables change)."""
+        global _catalog_index
+        with _catalog_index_lock:
+            _catalog_index = None
+            _filter_positions.cache_clear()
+
+    @staticmethod
+    def is_index_loaded() -> bool:
+        """Whether the process-wide catalog index has been built."""
+        return _catalog_index is not None
+
+    def load_index(self) -> None:
+        """Build the catalog index now (e.g. at startup) instead of on first use."""
+        self._get_index()
+
+    def _get_index(self) -> CatalogIndex:
+        """Get the process-wide catalog index, loading it on first use."""
+        global _catalog_index
+        index = _catalog_index
+        if index is None:
+            with _catalog_index_lock:
+                if _catalog_index is None:
+                    _catalog_index = self._build_index()
+                index = _catalog_index
+        return index
+
+    def _build_index(self) -> CatalogIndex:
+        """Load every catalog row in one query and build the lookup structures."""
+        # Stream rows in batches (server-side cursor) instead of materializing the
+        # whole result first, so each row is converted as soon as it arrives
+        rows = self._query_with_constellation().order_by(*TARGET_ORDER).yield_per(INDEX_LOAD_BATCH_SIZE)
+
+        targets = []
+        by_id: Dict[str, DSOTarget] = {}
+        by_type: Dict[str, List[int]] = {}
+        caldwell = []
+        columns: Dict[str, list] = {"magnitude": [], "constellation": [], "catalog_name": [], "caldwell_number": []}
+        for row in rows:
+            # Unknown abbreviations fall back to the abbreviation itself, as in _get_constellation_full_name
+            target = self._db_row_to_target(row, row.full_constellation or row.constellation)
+            by_type.setdefault(row.object_type, []).append(len(targets))
+            targets.append(target)
+            for name, values in columns.items():
+                values.append(getattr(row, name))
+
+            # First (brightest) match wins, like the .first() lookups it replaces
+            by_id.setdefault(target.catalog_id, target)
+            by_id.setdefault(f"{row.catalog_name}{row.catalog_number}", target)
+            if row.caldwell_number is not None:
+                by_id.setdefault(f"C{row.caldwell_number}", target)
+                caldwell.append((row.caldwell_number, target))
+
+        caldwell.sort(key=lambda item: item[0])
+        ra_hours = np.array([target.ra_hours for target in targets], dtype=np.float64)
+        dec_degrees = np.array([target.dec_degrees for target in targets], dtype=np.float64)
+        # Group positions by box: sort by box ID, then split at each new ID
+        box_ids = sky_box_ids(ra_hours, dec_degrees)
+        box_order = np.argsort(box_ids, kind="stable")
+        boxes, starts = np.unique(box_ids[box_order], return_index=True)
+        return CatalogIndex(
+            targets=targets,
+            by_id=by_id,
+            caldwell=[target for _, target in caldwell],
+            by_type={object_type: np.array(positions, dtype=np.intp) for object_type, positions in by_type.items()},
+            magnitude=np.array(columns["magnitude"], dtype=np.float64),  # None -> NaN
+            constellation=np.array(columns["constellation"], dtype=object),
+            catalog_name=np.array(columns["catalog_name"], dtype=object),
+            is_messier=np.array([_is_messier_id(target.catalog_id) for target in targets], dtype=bool),
+            has_caldwell=np.array([number is not None for number in columns["caldwell_number"]], dtype=bool),
+            ra_radians=np.radians(ra_hours * 15.0),
+            dec_radians=np.radians(dec_degrees),
+            by_box=dict(zip(boxes.tolist(), np.split(box_order, starts[1:]))),
+        )
 
-    def _db_row_to_target(self, dso: DSOCatalog) -> DSOTarget:
-        """Convert database model to DSOTarget."""
-        # Generate catalog ID (e.g., "M31", "NGC224", "IC434", "C80")
-        # For Messier objects (stored with common_name like "M031"), use that as catalog_id
-        if dso.common_name and dso.common_name.startswith("M") and dso.common_name[1:].isdigit():
-            # Convert M031 -> M31 by removing leading zeros
-            messier_num = int(dso.common_name[1:])
-            catalog_id = f"M{messier_num}"
-            name = catalog_id  # Use M31 as both catalog_id and name
-        elif dso.caldwell_number:
-            # Prefer Caldwell designation if available
-            catalog_id = f"C{dso.caldwell_number}"
-            # Use common name if available, otherwise use Caldwell designation
-            name = dso.common_name if dso.common_name else catalog_id
-        else:
-            catalog_id = f"{dso.catalog_name}{dso.catalog_number}"
-            # Use common name if available, otherwise generate from catalog
-            name = dso.common_name if dso.common_name else catalog_id
+    def _db_row_to_target(self, dso: DSOCatalog, full_constellation: Optional[str] = None) -> DSOTarget:
+        """Convert database model to DSOTarget.
+
+        Args:
+            dso: Catalog row, either a DSOCatalog entity or a result row selecting TARGET_COLUMNS
+            full_constellation: Pre-resolved full constellation name (e.g. from a join);
+                looked up from the abbreviation when not provided
+        """
+        # Catalog ID (e.g., "M31", "NGC224", "IC434", "C80") is computed by the database,
+        # see DSOCatalog.catalog_id
+        catalog_id = dso.catalog_id
+        common_name = dso.common_name
+        is_messier = _is_messier_id(catalog_id)
+
+        # Use M31 as both catalog_id and name; otherwise prefer the common name if available
+        name = catalog_id if is_messier or not common_name else common_name
 
         # Use major axis for size, default to 1.0 if None
         size_arcmin = dso.size_major_arcmin if dso.size_major_arcmin else 1.0
@@ -45,15 +357,16 @@ class CatalogService:
         # Default magnitude if None
         mag = dso.magnitude if dso.magnitude else 99.0
 
+        # Look up full constellation name unless the caller already joined it
+        if full_constellation is None and dso.constellation:
+            full_constellation = self._get_constellation_full_name(dso.constellation)
+
         # Generate description
-        type_name = dso.object_type.replace("_", " ").title()
-        # Look up full constellation name
-        full_constellation = self._get_constellation_full_name(dso.constellation) if dso.constellation else None
-        description = f"{type_name} in {full_constellation}" if full_constellation else type_name
+        description = self._description_prefix(dso.object_type, full_constellation)
 
         # Add common name if available and different from Messier/catalog designation
-        if dso.common_name and not (dso.common_name.startswith("M") and dso.common_name[1:].isdigit()):
-            description += f" - {dso.common_name}"
+        if common_name and not is_messier:
+            description += f" - {common_name}"
 
         # Add additional info for better descriptions
         if mag and mag < 99:
@@ -65,7 +378,8 @@ class CatalogService:
         sanitized_id = catalog_id.replace(" ", "_").replace("/", "_").replace(":", "_")
         image_url = f"/api/images/targets/{sanitized_id}"
 
-        return DSOTarget(
+        # Column types are enforced by the database, so skip Pydantic validation
+        return DSOTarget.model_construct(
             name=name,
             catalog_id=catalog_id,
             object_type=dso.object_type,
@@ -77,14 +391,27 @@ class CatalogService:
             image_url=image_url,
         )
 
+    def _description_prefix(self, object_type: str, full_constellation: Optional[str]) -> str:
+        """Build (and memoize) the "<Type> in <Constellation>" start of a target description."""
+        key = (object_type, full_constellation)
+        prefix = self._description_prefixes.get(key)
+        if prefix is None:
+            type_name = _object_type_name(object_type)
+            prefix = f"{type_name} in {full_constellation}" if full_constellation else type_name
+            self._description_prefixes[key] = prefix
+        return prefix
+
     def _get_constellation_full_name(self, abbreviation: str) -> str:
         """Look up full constellation name from abbreviation."""
         if not abbreviation:
             return None
 
-        constellation = self.db.query(ConstellationName).filter(ConstellationName.abbreviation == abbreviation).first()
+        if self._constellation_map is None:
+            self._constellation_map = dict(
+                self.db.query(ConstellationName.abbreviation, ConstellationName.full_name).all()
+            )
 
-        return constellation.full_name if constellation else abbreviation
+        return self._constellation_map.get(abbreviation, abbreviation)
 
     def _get_constellation_details(self, abbreviation: str) -> dict:
         """Look up constellation details from abbreviation."""
@@ -101,6 +428,12 @@ class CatalogService:
             }
         return None
 
+    def _query_with_constellation(self):
+        """Query the target columns together with the full constellation name in one round trip."""
+        return self.db.query(*TARGET_COLUMNS, ConstellationName.full_name.label("full_constellation")).outerjoin(
+            ConstellationName, DSOCatalog.constellation == ConstellationName.abbreviation
+        )
+
     def get_all_targets(self, limit: Optional[int] = None, offset: int = 0) -> List[DSOTarget]:
         """
         Get all targets in catalog.
@@ -112,13 +445,103 @@ class CatalogService:
         Returns:
             List of DSOTarget objects
         """
-        query = self.db.query(DSOCatalog).order_by(DSOCatalog.magnitude.asc())
+        return list(self.iter_all_targets(limit=limit, offset=offset))
 
-        if limit:
-            query = query.limit(limit).offset(offset)
+    def get_targets_page(self, offset: int = 0, page_size: int = 50) -> List[DSOTarget]:
+        """
+        Get one page of targets in magnitude order.
+
+        Served from the catalog index once it is loaded. Until then (e.g. while it is
+        still being built at startup) only the requested rows are read from the
+        database, so a first page never waits for the whole catalog.
+
+        Args:
+            offset: Number of targets to skip
+            page_size: Number of targets to return
+
+        Returns:
+            List of DSOTarget objects
+        """
+        index = _catalog_index
+        if index is not None:
+            return index.targets[offset : offset + page_size]
+
+        rows = self._query_with_constellation().order_by(*TARGET_ORDER).offset(offset).limit(page_size).all()
+        return [self._db_row_to_target(row, row.full_constellation or row.constellation) for row in rows]
+
+    def search_catalog(
+        self,
+        search: Optional[str] = None,
+        object_type: Optional[str] = None,
+        constellation: Optional[str] = None,
+        max_magnitude: Optional[float] = None,
+        sort_by: str = "name",
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[Any], int]:
+        """
+        Search and filter catalog rows in SQL for the catalog search interface.
+
+        Args:
+            search: Free text matched case-insensitively against the common name and catalog ID
+            object_type: Object type filter
+            constellation: Constellation abbreviation filter
+            max_magnitude: Maximum magnitude filter
+            sort_by: Sort field (name, magnitude, type)
+            offset: Number of rows to skip
+            limit: Number of rows to return
+
+        Returns:
+            Tuple of (rows, total matching rows). Rows carry the target columns (for
+            _db_row_to_target) plus full_constellation and constellation_common.
+        """
+        query = self._query_with_constellation().add_columns(
+            ConstellationName.common_name.label("constellation_common")
+        )
 
-        dso_objects = query.all()
-        return [self._db_row_to_target(dso) for dso in dso_objects]
+        if object_type:
+            query = query.filter(DSOCatalog.object_type == object_type)
+        if constellation:
+            query = query.filter(DSOCatalog.constellation == constellation)
+        if max_magnitude:
+            query = query.filter(DSOCatalog.magnitude <= max_magnitude)
+        if search:
+            search_pattern = f"%{search}%"
+            query = query.filter(
+                or_(
+                    DSOCatalog.common_name.ilike(search_pattern),
+                    func.concat(DSOCatalog.catalog_name, DSOCatalog.catalog_number).ilike(search_pattern),
+                )
+            )
+
+        # Count before pagination (just counts, doesn't fetch rows)
+        total = query.count()
+
+        if sort_by == "magnitude":
+            query = query.order_by(DSOCatalog.magnitude.asc().nullslast())
+        elif sort_by == "type":
+            query = query.order_by(DSOCatalog.object_type.asc())
+        else:  # name (default)
+            query = query.order_by(DSOCatalog.catalog_name.asc(), DSOCatalog.catalog_number.asc())
+
+        return query.limit(limit).offset(offset).all(), total
+
+    def iter_all_targets(self, limit: Optional[int] = None, offset: int = 0) -> Iterator[DSOTarget]:
+        """
+        Iterate over targets in catalog without building an intermediate list.
+
+        Args:
+            limit: Maximum number of targets to yield (None = all)
+            offset: Number of targets to skip (only applied together with limit, as in get_all_targets)
+
+        Yields:
+            DSOTarget objects in magnitude order
+        """
+        targets = self._get_index().targets
+        if limit:
+            yield from islice(targets, offset, offset + limit)
+        else:
+            yield from targets
 
     def get_target_by_id(self, catalog_id: str) -> Optional[DSOTarget]:
         """
@@ -130,39 +553,35 @@ class CatalogService:
         Returns:
             DSOTarget object or None if not found
         """
-        # Parse catalog ID to extract catalog name and number
+        # Parse catalog ID into catalog prefix and number
         # Handle formats: M31, NGC224, IC434, C80
-        catalog_id_upper = catalog_id.upper()
-
-        # For Messier objects, search by common_name (stored as M042, M031, etc.)
-        if catalog_id_upper.startswith("M") and len(catalog_id_upper) > 1 and catalog_id_upper[1:].isdigit():
-            # Pad the Messier number to 3 digits (M42 -> M042)
-            messier_padded = f"M{int(catalog_id_upper[1:]):03d}"
-            dso = self.db.query(DSOCatalog).filter(DSOCatalog.common_name == messier_padded).first()
-        elif catalog_id_upper.startswith("C") and len(catalog_id_upper) > 1 and catalog_id_upper[1:].isdigit():
-            # Caldwell objects (C1-C109)
-            caldwell_number = int(catalog_id_upper[1:])
-            dso = self.db.query(DSOCatalog).filter(DSOCatalog.caldwell_number == caldwell_number).first()
-        elif catalog_id_upper.startswith("NGC"):
-            catalog_number = int(catalog_id_upper[3:])
-            dso = (
-                self.db.query(DSOCatalog)
-                .filter(DSOCatalog.catalog_name == "NGC", DSOCatalog.catalog_number == catalog_number)
-                .first()
-            )
-        elif catalog_id_upper.startswith("IC"):
-            catalog_number = int(catalog_id_upper[2:])
-            dso = (
-                self.db.query(DSOCatalog)
-                .filter(DSOCatalog.catalog_name == "IC", DSOCatalog.catalog_number == catalog_number)
-                .first()
-            )
-        else:
+        match = CATALOG_ID_PATTERN.match(catalog_id.strip().upper())
+        if not match:
             return None
 
-        if dso:
-            return self._db_row_to_target(dso)
-        return None
+        prefix, number = match.group(1), int(match.group(2))
+        return self._get_index().by_id.get(f"{prefix}{number}")
+
+    def get_targets_by_ids(self, catalog_ids: List[str]) -> Dict[str, DSOTarget]:
+        """
+        Get several targets by catalog ID in one call.
+
+        Args:
+            catalog_ids: Catalog identifiers (e.g., ["M31", "NGC224", "C80"])
+
+        Returns:
+            Dictionary mapping each requested ID that was found to its DSOTarget
+        """
+        by_id = self._get_index().by_id
+        targets = {}
+        for catalog_id in catalog_ids:
+            match = CATALOG_ID_PATTERN.match(catalog_id.strip().upper())
+            if not match:
+                continue
+            target = by_id.get(f"{match.group(1)}{int(match.group(2))}")
+            if target is not None:
+                targets[catalog_id] = target
+        return targets
 
     def filter_targets(
         self,
@@ -170,6 +589,7 @@ class CatalogService:
         min_magnitude: Optional[float] = None,
         max_magnitude: Optional[float] = None,
         constellation: Optional[str] = None,
+        catalog: Optional[str] = None,
         limit: Optional[int] = None,
         offset: int = 0,
     ) -> List[DSOTarget]:
@@ -181,34 +601,114 @@ class CatalogService:
             min_magnitude: Minimum magnitude (brighter)
             max_magnitude: Maximum magnitude (fainter)
             constellation: Constellation name filter
+            catalog: Restrict to one catalog: "M" (Messier), "C" (Caldwell), "NGC" or "IC"
             limit: Maximum number of results
             offset: Number of results to skip (for pagination)
 
         Returns:
             Filtered list of targets
         """
-        query = self.db.query(DSOCatalog)
+        return list(
+            self.iter_targets(object_types, min_magnitude, max_magnitude, constellation, catalog, limit, offset)
+        )
+
+    def iter_targets(
+        self,
+        object_types: Optional[List[str]] = None,
+        min_magnitude: Optional[float] = None,
+        max_magnitude: Optional[float] = None,
+        constellation: Optional[str] = None,
+        catalog: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Iterator[DSOTarget]:
+        """
+        Iterate over targets matching various criteria without building a list.
 
-        if object_types and len(object_types) > 0:
-            query = query.filter(DSOCatalog.object_type.in_(object_types))
+        Args:
+            object_types: List of object types to include (None = all)
+            min_magnitude: Minimum magnitude (brighter)
+            max_magnitude: Maximum magnitude (fainter)
+            constellation: Constellation name filter
+            catalog: Restrict to one catalog: "M" (Messier), "C" (Caldwell), "NGC" or "IC"
+            limit: Maximum number of results
+            offset: Number of results to skip (for pagination)
 
-        if min_magnitude is not None:
-            query = query.filter(DSOCatalog.magnitude >= min_magnitude)
+        Yields:
+            Matching DSOTarget objects in magnitude order
+        """
+        # Matching positions are cached per filter combination, so repeated
+        # filters (e.g. every page of a listing) skip the mask evaluation
+        index = self._get_index()
+        positions = _filter_positions(
+            index,
+            frozenset(object_types or ()),
+            min_magnitude,
+            max_magnitude,
+            constellation or None,
+            catalog.upper() if catalog else None,
+        )
 
-        if max_magnitude is not None:
-            query = query.filter(DSOCatalog.magnitude <= max_magnitude)
+        # Targets are already ordered by magnitude (brightest first); only the
+        # selected page is visited
+        if limit:
+            positions = positions[offset : offset + limit]
+        targets = index.targets
+        for position in positions:
+            yield targets[position]
 
-        if constellation:
-            query = query.filter(DSOCatalog.constellation == constellation)
+    def filter_targets_in_cone(
+        self,
+        ra_hours: float,
+        dec_degrees: float,
+        radius_arcmin: float,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[DSOTarget]:
+        """
+        Find targets within an angular radius of a sky position (e.g. inside a telescope field of view).
 
-        # Order by magnitude (brightest first)
-        query = query.order_by(DSOCatalog.magnitude.asc())
+        Args:
+            ra_hours: Right ascension of the cone center in hours
+            dec_degrees: Declination of the cone center in degrees
+            radius_arcmin: Cone radius in arcminutes
+            limit: Maximum number of results
+            offset: Number of results to skip (for pagination)
 
-        if limit:
-            query = query.limit(limit).offset(offset)
+        Returns:
+            Targets inside the cone, brightest first
+        """
+        index = self._get_index()
+        ra0 = np.radians(ra_hours * 15.0)
+        dec0 = np.radians(dec_degrees)
+
+        # Only objects in the boxes covering the cone can be inside it
+        candidates = self._positions_in_boxes(index, sky_boxes_in_cone(ra_hours, dec_degrees, radius_arcmin / 60.0))
+
+        # Exact angular separation for the box candidates
+        separation = angular_separation_arcmin(ra0, dec0, index.ra_radians[candidates], index.dec_radians[candidates])
+        inside = np.sort(candidates[separation <= radius_arcmin])
+
+        return _paginate([index.targets[position] for position in inside], limit, offset)
+
+    def get_targets_in_boxes(self, box_ids: List[int]) -> List[DSOTarget]:
+        """
+        Get the targets in the given sky boxes (see sky_box_ids, sky_boxes_in_cone).
+
+        Args:
+            box_ids: Sky box IDs
+
+        Returns:
+            Targets in those boxes, brightest first
+        """
+        index = self._get_index()
+        return [index.targets[position] for position in np.sort(self._positions_in_boxes(index, box_ids))]
 
-        dso_objects = query.all()
-        return [self._db_row_to_target(dso) for dso in dso_objects]
+    @staticmethod
+    def _positions_in_boxes(index: CatalogIndex, box_ids) -> np.ndarray:
+        """Target positions (unordered) in the given sky boxes."""
+        groups = [index.by_box[box_id] for box_id in set(np.asarray(box_ids).tolist()) if box_id in index.by_box]
+        return np.concatenate(groups) if groups else np.empty(0, dtype=np.intp)
 
     def get_caldwell_targets(self, limit: Optional[int] = None, offset: int = 0) -> List[DSOTarget]:
         """
@@ -221,17 +721,7 @@ class CatalogService:
         Returns:
             List of Caldwell DSOTarget objects ordered by Caldwell number
         """
-        query = (
-            self.db.query(DSOCatalog)
-            .filter(DSOCatalog.caldwell_number.isnot(None))
-            .order_by(DSOCatalog.caldwell_number.asc())
-        )
-
-        if limit:
-            query = query.limit(limit).offset(offset)
-
-        dso_objects = query.all()
-        return [self._db_row_to_target(dso) for dso in dso_objects]
+        return _paginate(self._get_index().caldwell, limit, offset)
 
     def add_visibility_info(
         self,
@@ -305,3 +795,89 @@ class CatalogService:
 
         # Return copy of target with visibility added
         return target.model_copy(update={"visibility": visibility})
+
+    def add_visibility_info_bulk(
+        self,
+        targets: List[DSOTarget],
+        location: Location,
+        ephemeris: "EphemerisService",
+        current_time: datetime,
+    ) -> List[DSOTarget]:
+        """
+        Add tonight's visibility information to many targets at once.
+
+        Produces the same result as calling add_visibility_info for each target,
+        but computes twilight once and evaluates positions for all targets per
+        sample time with a single vectorized ephemeris call.
+
+        Args:
+            targets: DSO targets
+            location: Observer location
+            ephemeris: Ephemeris service instance
+            current_time: Current time (timezone-aware), used to determine tonight's window
+
+        Returns:
+            Copies of the targets with visibility populated, in the same order
+        """
+        if not targets:
+            return []
+
+        ra_hours = np.array([target.ra_hours for target in targets])
+        dec_degrees = np.array([target.dec_degrees for target in targets])
+
+        # Tonight's observing window only depends on location and date
+        twilight_times = ephemeris.calculate_twilight_times(location, current_time)
+        astro_end = twilight_times.get("astronomical_twilight_end")
+        astro_start = twilight_times.get("astronomical_twilight_start")
+
+        # Peak altitude during the dark hours, sampled every 15 minutes (see get_best_viewing_time)
+        sample_times: List[datetime] = []
+        best_alt = np.full(len(targets), -90.0)
+        best_az = np.zeros(len(targets))
+        best_idx = np.full(len(targets), -1)
+        if astro_end and astro_start:
+            sample_time = astro_end
+            while sample_time <= astro_start:
+                alt, az = ephemeris.calculate_positions_batch(ra_hours, dec_degrees, location, sample_time)
+                higher = alt > best_alt
+                best_alt[higher] = alt[higher]
+                best_az[higher] = az[higher]
+                best_idx[higher] = len(sample_times)
+                sample_times.append(sample_time)
+                sample_time += timedelta(minutes=15)
+
+        has_best = (best_idx >= 0) & (best_alt >= 0)
+        use_best = has_best & (best_alt > 0)
+
+        # Objects that don't rise tonight are evaluated at midnight for consistency
+        current_alt = best_alt.copy()
+        current_az = best_az.copy()
+        if not use_best.all():
+            tz = pytz.timezone(location.timezone)
+            midnight = tz.localize(datetime.combine(current_time.date(), datetime.min.time()))
+            if midnight < current_time:
+                midnight += timedelta(days=1)
+            rest = ~use_best
+            current_alt[rest], current_az[rest] = ephemeris.calculate_positions_batch(
+                ra_hours[rest], dec_degrees[rest], location, midnight
+            )
+
+        # Visibility status and optimal (45-65°) check, as in add_visibility_info
+        status_codes = _classify_altitudes(current_alt)
+        is_optimal = (current_alt >= 45.0) & (current_alt <= 65.0)
+
+        # Values are already typed (floats, enum members, datetimes) and come from the
+        # ephemeris, so the per-target models are built without validation
+        enriched = []
+        for i, target in enumerate(targets):
+            visibility = TargetVisibility.model_construct(
+                current_altitude=float(current_alt[i]),
+                current_azimuth=float(current_az[i]),
+                status=VISIBILITY_STATUS_CODES[status_codes[i]],
+                best_time_tonight=sample_times[best_idx[i]] if has_best[i] else None,
+                best_altitude_tonight=float(best_alt[i]) if has_best[i] else None,
+                is_optimal_now=bool(is_optimal[i]),
+            )
+            enriched.append(target.model_copy(update={"visibility": visibility}))
+
+        return enriched
@@ -1,13 +1,93 @@
 """ClearDarkSky weather service integration for astronomy."""
 
-import math
+import threading
+import time
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 
-import requests
+import httpx
+import numpy as np
 from pydantic import BaseModel
 
+# Known chart locations (subset for demonstration): (chart ID, latitude, longitude)
+KNOWN_CHARTS = (
+    ("NYC", 40.7, -74.0),
+    ("LA", 34.0, -118.2),
+    ("Chicago", 41.9, -87.6),
+    ("Denver", 39.7, -105.0),
+)
+
+# Maximum lat/lon distance (degrees) to a chart for it to count as nearby
+CHART_MAX_DISTANCE_DEG = 5.0
+
+_CHART_IDS = [chart_id for chart_id, _, _ in KNOWN_CHARTS]
+_CHART_COORDS = np.array([(lat, lon) for _, lat, lon in KNOWN_CHARTS], dtype=np.float64)
+
+# Astronomy score weights; transparency and seeing are 1-5 scales, so their
+# 35% and 25% shares are pre-divided by 5
+CLOUD_COVER_WEIGHT = 0.4
+TRANSPARENCY_WEIGHT = 0.35 / 5
+SEEING_WEIGHT = 0.25 / 5
+
+# Chart lookups remembered per process, keyed on location quantized to 0.01°
+CHART_CACHE_SIZE = 4096
+
+
+def _nearest_chart_ids(latitudes: Sequence[float], longitudes: Sequence[float]) -> List[Optional[str]]:
+    """Nearest known chart per location, or None when none is within CHART_MAX_DISTANCE_DEG."""
+    points = np.column_stack((np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64)))
+    # (locations, charts) squared distances; compare squared to avoid the sqrt
+    sq_dist = ((points[:, np.newaxis, :] - _CHART_COORDS[np.newaxis, :, :]) ** 2).sum(axis=2)
+    nearest = sq_dist.argmin(axis=1)
+    within = sq_dist[np.arange(len(points)), nearest] < CHART_MAX_DISTANCE_DEG**2
+
+    return [_CHART_IDS[idx] if ok else None for idx, ok in zip(nearest, within)]
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _nearest_chart_quantized(lat_centideg: int, lon_centideg: int) -> Optional[str]:
+    """Cached nearest-chart lookup for a location given in hundredths of a degree."""
+    return _nearest_chart_ids([lat_centideg / 100], [lon_centideg / 100])[0]
+
+
+# Parsed forecasts per chart, shared across service instances and threads (guarded
+# by _forecast_cache_lock); charts update roughly hourly
+# (chart_id -> (forecasts, expiry_time, validator headers))
+FORECAST_CACHE_TTL = 1800  # seconds
+FORECAST_CACHE_SIZE = 256
+_forecast_cache: Dict[str, Tuple[List["ClearDarkSkyForecast"], float, Dict[str, str]]] = {}
+_forecast_cache_lock = threading.Lock()
+
+# Response headers kept to revalidate an expired chart, with the request header each feeds
+_VALIDATOR_HEADERS = {"etag": "If-None-Match", "last-modified": "If-Modified-Since"}
+
+CLEARDARKSKY_BASE_URL = "https://www.cleardarksky.com"
+CLEARDARKSKY_TIMEOUT = 10  # seconds
+
+# Pooled keep-alive connections shared by every service instance; created on
+# first fetch and closed by close_http_client() at application shutdown. A sync
+# client is thread-safe and not bound to an event loop, so it can be shared by
+# API requests, Celery tasks and scripts alike
+_http_client: Optional[httpx.Client] = None
+
+
+def _get_http_client() -> httpx.Client:
+    """Get the shared ClearDarkSky HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.Client(base_url=CLEARDARKSKY_BASE_URL, timeout=CLEARDARKSKY_TIMEOUT)
+    return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared ClearDarkSky HTTP client and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
 
 class CloudCover(Enum):
     """Cloud cover categories (percentage ranges)."""
@@ -18,6 +98,10 @@ class CloudCover(Enum):
     MOSTLY_CLOUDY = (70, 90)
     OVERCAST = (90, 100)
 
+    def __init__(self, low: int, high: int):
+        # Range midpoint as a 0-1 fraction, computed once per member
+        self.midpoint = (low + high) / 200.0
+
 
 class Transparency(Enum):
     """Atmospheric transparency levels (1-5 scale)."""
@@ -58,21 +142,31 @@ class ClearDarkSkyForecast(BaseModel):
         - Transparency: 35%
         - Seeing: 25%
         """
-        # Cloud cover score (invert - less is better)
-        cloud_min, cloud_max = self.cloud_cover.value
-        cloud_avg = (cloud_min + cloud_max) / 2
-        cloud_score = 1.0 - (cloud_avg / 100.0)
+        # Cloud cover inverted (less is better)
+        return (
+            (1.0 - self.cloud_cover.midpoint) * CLOUD_COVER_WEIGHT
+            + self.transparency.value * TRANSPARENCY_WEIGHT
+            + self.seeing.value * SEEING_WEIGHT
+        )
 
-        # Transparency score (normalized to 0-1)
-        transp_score = self.transparency.value / 5.0
 
-        # Seeing score (normalized to 0-1)
-        seeing_score = self.seeing.value / 5.0
+def astronomy_scores(forecasts: Sequence[ClearDarkSkyForecast]) -> np.ndarray:
+    """
+    Astronomy quality scores (0-1) for many forecasts in one vectorized pass.
 
-        # Weighted average
-        total_score = cloud_score * 0.4 + transp_score * 0.35 + seeing_score * 0.25
+    Same weighting as ClearDarkSkyForecast.astronomy_score.
 
-        return total_score
+    Args:
+        forecasts: Forecast entries to score
+
+    Returns:
+        Array of scores, one per forecast
+    """
+    cloud = np.fromiter((f.cloud_cover.midpoint for f in forecasts), dtype=np.float64, count=len(forecasts))
+    transparency = np.fromiter((f.transparency.value for f in forecasts), dtype=np.float64, count=len(forecasts))
+    seeing = np.fromiter((f.seeing.value for f in forecasts), dtype=np.float64, count=len(forecasts))
+
+    return (1.0 - cloud) * CLOUD_COVER_WEIGHT + transparency * TRANSPARENCY_WEIGHT + seeing * SEEING_WEIGHT
 
 
 class ClearDarkSkyService:
@@ -80,9 +174,13 @@ class ClearDarkSkyService:
 
     def __init__(self):
         """Initialize service."""
-        self.base_url = "https://www.cleardarksky.com"
-        self.timeout = 10
-        self._chart_cache = {}  # Cache chart lookups
+        self.base_url = CLEARDARKSKY_BASE_URL
+        self.timeout = CLEARDARKSKY_TIMEOUT
+
+    @property
+    def _client(self) -> httpx.Client:
+        """Shared HTTP client, so chart fetches reuse pooled connections across instances."""
+        return _get_http_client()
 
     def find_nearest_chart(self, latitude: float, longitude: float) -> Optional[str]:
         """
@@ -92,19 +190,10 @@ class ClearDarkSkyService:
         Note: This is simplified - actual implementation would need
         ClearDarkSky's chart database.
         """
-        # Cache key
-        cache_key = f"{latitude:.2f},{longitude:.2f}"
-        if cache_key in self._chart_cache:
-            return self._chart_cache[cache_key]
-
-        # Simplified: estimate based on known locations
+        # Simplified: estimate based on known locations, cached in a bounded
+        # LRU keyed on integer hundredths of a degree
         # In production, would query ClearDarkSky's chart database
-        chart_id = self._estimate_chart_id(latitude, longitude)
-
-        if chart_id:
-            self._chart_cache[cache_key] = chart_id
-
-        return chart_id
+        return _nearest_chart_quantized(round(latitude * 100), round(longitude * 100))
 
     def _estimate_chart_id(self, latitude: float, longitude: float) -> Optional[str]:
         """
@@ -113,46 +202,68 @@ class ClearDarkSkyService:
         This is a simplified placeholder. Real implementation would
         need ClearDarkSky's actual chart database.
         """
-        # Known chart locations (subset for demonstration)
-        known_charts = [
-            ("NYC", 40.7, -74.0),
-            ("LA", 34.0, -118.2),
-            ("Chicago", 41.9, -87.6),
-            ("Denver", 39.7, -105.0),
-        ]
-
-        # Find nearest
-        min_dist = float("inf")
-        nearest_id = None
-
-        for chart_id, lat, lon in known_charts:
-            dist = math.sqrt((latitude - lat) ** 2 + (longitude - lon) ** 2)
-            if dist < min_dist:
-                min_dist = dist
-                nearest_id = chart_id
-
-        # Return if within reasonable distance (5 degrees)
-        return nearest_id if min_dist < 5.0 else None
+        return _nearest_chart_ids([latitude], [longitude])[0]
+
+    def find_nearest_chart_batch(self, latitudes: Sequence[float], longitudes: Sequence[float]) -> List[Optional[str]]:
+        """
+        Find the nearest known chart for many locations at once.
+
+        Distances from every location to every chart are computed in one
+        vectorized pass over the precomputed chart coordinate table.
+
+        Args:
+            latitudes: Location latitudes in degrees
+            longitudes: Location longitudes in degrees
+
+        Returns:
+            Chart ID (or None when no chart is within CHART_MAX_DISTANCE_DEG) per location
+        """
+        return _nearest_chart_ids(latitudes, longitudes)
 
     def fetch_forecast(self, chart_id: str) -> List[ClearDarkSkyForecast]:
         """
         Fetch forecast for a specific chart.
 
+        Parsed forecasts are cached per chart for FORECAST_CACHE_TTL seconds; if
+        revalidating an expired chart fails, its last good forecast is returned.
+
         Note: ClearDarkSky provides forecasts as images, which requires
         image processing to extract data. This is a simplified version.
         """
+        with _forecast_cache_lock:
+            cached = _forecast_cache.get(chart_id)
+        if cached and cached[1] > time.time():
+            return cached[0]
+
         try:
+            # Revalidate an expired entry so an unchanged chart isn't downloaded again
+            headers = {}
+            if cached:
+                headers = {_VALIDATOR_HEADERS[name]: value for name, value in cached[2].items()}
+
             # In production, would fetch and parse chart image
-            url = f"{self.base_url}/c/{chart_id}csk.gif"
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._client.get(f"/c/{chart_id}csk.gif", headers=headers)
+            if cached and response.status_code == 304:
+                forecasts, validators = cached[0], cached[2]
+            else:
+                response.raise_for_status()
 
-            # Parse chart data
-            return self._parse_chart_data(response.content)
+                # Parse chart data
+                forecasts = self._parse_chart_data(response.content)
+                validators = {name: response.headers[name] for name in _VALIDATOR_HEADERS if name in response.headers}
 
         except Exception:
-            # Return empty list on error
-            return []
+            # Fall back to the last good forecast for an expired chart, else an empty list
+            return cached[0] if cached else []
+
+        # Re-insert so the oldest entry is evicted first when full
+        with _forecast_cache_lock:
+            _forecast_cache.pop(chart_id, None)
+            if len(_forecast_cache) >= FORECAST_CACHE_SIZE:
+                del _forecast_cache[next(iter(_forecast_cache))]
+            _forecast_cache[chart_id] = (forecasts, time.time() + FORECAST_CACHE_TTL, validators)
+
+        return forecasts
 
     def _parse_chart_data(self, chart_data: bytes) -> List[ClearDarkSkyForecast]:
         """
@@ -163,10 +274,11 @@ class ClearDarkSkyService:
         """
         # Placeholder: return empty list
         # Real implementation would:
-        # 1. Load image with PIL
-        # 2. Extract color bands for each forecast period
-        # 3. Map colors to conditions based on ClearDarkSky's color scheme
-        # 4. Create forecast objects
+        # 1. Load image with PIL and view it as an RGB ndarray (np.asarray)
+        # 2. Slice the cloud/transparency/seeing rows at the hourly columns
+        # 3. Map colors to conditions based on ClearDarkSky's color scheme with a
+        #    vectorized nearest-palette match over each row, not per-pixel loops
+        # 4. Create forecast objects from the resulting condition index arrays
 
         return []
 
@@ -1,17 +1,426 @@
 """Comet catalog and ephemeris service."""
 
+import math
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from astropy import units as u
 from astropy.coordinates import AltAz, EarthLocation, SkyCoord, get_sun
 from astropy.time import Time
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session
 
 from app.models import CometEphemeris, CometTarget, CometVisibility, Location, OrbitalElements
 from app.models.catalog_models import CometCatalog
 
+# Gaussian gravitational constant: mean motion in rad/day for a = 1 AU
+GAUSSIAN_GRAVITATIONAL_CONSTANT = 0.01720209895
+
+# Obliquity of the ecliptic (J2000)
+OBLIQUITY_J2000_RAD = math.radians(23.4393)
+SIN_OBLIQUITY = math.sin(OBLIQUITY_J2000_RAD)
+COS_OBLIQUITY = math.cos(OBLIQUITY_J2000_RAD)
+
+# Right ascension hours per radian (24h per 2π)
+HOURS_PER_RADIAN = 12.0 / math.pi
+
+# Rotation from ecliptic to equatorial coordinates (J2000)
+ECLIPTIC_TO_EQUATORIAL = np.array(
+    [
+        [1.0, 0.0, 0.0],
+        [0.0, COS_OBLIQUITY, -SIN_OBLIQUITY],
+        [0.0, SIN_OBLIQUITY, COS_OBLIQUITY],
+    ]
+)
+
+# Kepler's equation solver: iteration cap and convergence tolerance (radians)
+KEPLER_MAX_ITERATIONS = 10
+KEPLER_TOLERANCE = 1e-12
+
+# Largest eccentricity seeded with the third-order series in M; beyond it the
+# series diverges from E and Danby's starting value is closer
+KEPLER_SERIES_MAX_ECCENTRICITY = 0.9
+
+# Observer frames and darkness checks remembered per (location, time)
+FRAME_CACHE_SIZE = 128
+
+# Single-comet ephemerides remembered per (orbit, time); times are rounded to
+# EPHEMERIS_JD_DECIMALS places of a day (~9 s) so nearby queries share an entry
+EPHEMERIS_CACHE_SIZE = 8192
+EPHEMERIS_JD_DECIMALS = 4
+
+# Ephemeris values, in the order _compute_ephemeris_scalar returns them
+EPHEMERIS_FIELDS = ("ra_hours", "dec_degrees", "helio_distance_au", "geo_distance_au", "magnitude")
+
+
+@lru_cache(maxsize=FRAME_CACHE_SIZE)
+def _altaz_frame(latitude: float, longitude: float, elevation: float, time_utc: datetime) -> AltAz:
+    """AltAz frame for an observer and time, shared by every comet evaluated there."""
+    obs_location = EarthLocation(lat=latitude * u.deg, lon=longitude * u.deg, height=elevation * u.m)
+    return AltAz(obstime=Time(time_utc), location=obs_location)
+
+
+@lru_cache(maxsize=FRAME_CACHE_SIZE)
+def _is_dark_enough(latitude: float, longitude: float, elevation: float, time_utc: datetime) -> bool:
+    """Whether the Sun is below -18 degrees (astronomical darkness) for an observer and time."""
+    altaz_frame = _altaz_frame(latitude, longitude, elevation, time_utc)
+    return bool(get_sun(altaz_frame.obstime).transform_to(altaz_frame).alt.degree < -18)
+
+
+def _horizon_rotations(altaz_frame: AltAz) -> np.ndarray:
+    """
+    Rotations from ICRS unit vectors to an observer's (north, east, up) axes.
+
+    Built by sending the three ICRS axes through astropy's AltAz transform
+    (precession, nutation, Earth rotation) in one call over every time of the frame,
+    and taking the nearest proper rotation. Annual aberration isn't a rotation, so
+    directions come out within about 30 arcseconds of a full transform; every
+    visibility path goes through these rotations so they agree with each other.
+
+    Returns:
+        Array of shape (3, 3) for a scalar obstime, else (times, 3, 3)
+    """
+    axes = SkyCoord(ra=[0.0, 90.0, 0.0] * u.deg, dec=[0.0, 0.0, 90.0] * u.deg, frame="icrs")
+    horizon = axes.reshape((3,) + (1,) * altaz_frame.obstime.ndim).transform_to(altaz_frame)
+    alt, az = horizon.alt.rad, horizon.az.rad
+    # (component, axis, ...) moved to (..., component, axis): one matrix of columns per time
+    columns = np.stack((np.cos(alt) * np.cos(az), np.cos(alt) * np.sin(az), np.sin(alt)))
+    columns = np.moveaxis(columns, (0, 1), (-2, -1))
+
+    left, _, right = np.linalg.svd(columns)
+    return left @ right
+
+
+@lru_cache(maxsize=FRAME_CACHE_SIZE)
+def _icrs_to_horizon(latitude: float, longitude: float, elevation: float, time_utc: datetime) -> np.ndarray:
+    """ICRS-to-horizon rotation (3x3) for an observer and time, shared by every comet evaluated there."""
+    rotation = _horizon_rotations(_altaz_frame(latitude, longitude, elevation, time_utc))
+    rotation.flags.writeable = False
+    return rotation
+
+
+def _horizon_coordinates(
+    ra_hours: np.ndarray, dec_degrees: np.ndarray, rotation: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Altitudes and azimuths (degrees, azimuth east of north) of ICRS directions.
+
+    rotation is one 3x3 rotation for all directions, or one per direction (directions, 3, 3).
+    """
+    ra = ra_hours / HOURS_PER_RADIAN
+    dec = np.radians(dec_degrees)
+    cos_dec = np.cos(dec)
+    directions = np.stack((cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)))
+    north, east, up = np.einsum("...ij,j...->i...", rotation, directions)
+
+    return np.degrees(np.arcsin(np.clip(up, -1.0, 1.0))), np.mod(np.degrees(np.arctan2(east, north)), 360.0)
+
+
+def _element_arrays(
+    perihelion_distance_au,
+    eccentricity,
+    inclination_deg,
+    arg_perihelion_deg,
+    ascending_node_deg,
+    perihelion_time_jd,
+    absolute_magnitude,
+    magnitude_slope,
+) -> Dict[str, np.ndarray]:
+    """Aligned element arrays (angles in radians, NaN where unknown) from per-comet value columns."""
+
+    def column(values) -> np.ndarray:
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+    return {
+        "q": column(perihelion_distance_au),
+        "e": column(eccentricity),
+        "incl": np.radians(column(inclination_deg)),
+        "arg_perihelion": np.radians(column(arg_perihelion_deg)),
+        "node": np.radians(column(ascending_node_deg)),
+        "perihelion_jd": column(perihelion_time_jd),
+        "abs_magnitude": column(absolute_magnitude),
+        "slope": column(magnitude_slope),
+    }
+
+
+def _orbital_element_arrays(comets: List[CometTarget]) -> Dict[str, np.ndarray]:
+    """Orbital elements and magnitude parameters of many comets as aligned arrays (NaN where unknown)."""
+    elements = [comet.orbital_elements for comet in comets]
+    return _element_arrays(
+        [oe.perihelion_distance_au for oe in elements],
+        [oe.eccentricity for oe in elements],
+        [oe.inclination_deg for oe in elements],
+        [oe.arg_perihelion_deg for oe in elements],
+        [oe.ascending_node_deg for oe in elements],
+        [oe.perihelion_time_jd for oe in elements],
+        [comet.absolute_magnitude for comet in comets],
+        [comet.magnitude_slope for comet in comets],
+    )
+
+
+def _orbital_plane_to_equatorial(elements: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Per-orbit rotation from orbital-plane to equatorial coordinates, shape (N, 3, 2).
+
+    The columns are the equatorial unit vectors toward perihelion (P) and 90° ahead of it
+    in the direction of motion (Q), i.e. the first two columns of Rz(Ω) Rx(i) Rz(ω)
+    rotated by the obliquity; orbital-plane positions have no third component.
+    """
+    sin_node, cos_node = np.sin(elements["node"]), np.cos(elements["node"])
+    sin_incl, cos_incl = np.sin(elements["incl"]), np.cos(elements["incl"])
+    sin_peri, cos_peri = np.sin(elements["arg_perihelion"]), np.cos(elements["arg_perihelion"])
+
+    p_ecl = np.stack(
+        (
+            cos_node * cos_peri - sin_node * sin_peri * cos_incl,
+            sin_node * cos_peri + cos_node * sin_peri * cos_incl,
+            sin_peri * sin_incl,
+        ),
+        axis=-1,
+    )
+    q_ecl = np.stack(
+        (
+            -cos_node * sin_peri - sin_node * cos_peri * cos_incl,
+            -sin_node * sin_peri + cos_node * cos_peri * cos_incl,
+            cos_peri * sin_incl,
+        ),
+        axis=-1,
+    )
+    return ECLIPTIC_TO_EQUATORIAL @ np.stack((p_ecl, q_ecl), axis=-1)
+
+
+def _danby_step(f: np.ndarray, f1: np.ndarray, f2: np.ndarray, f3: np.ndarray) -> np.ndarray:
+    """Danby's quartic correction from f and its first three derivatives."""
+    d1 = -f / f1
+    d2 = -f / (f1 + 0.5 * d1 * f2)
+    return -f / (f1 + 0.5 * d2 * f2 + d2 * d2 * f3 / 6.0)
+
+
+def _kepler_series_seed(m, e, sin_m, cos_m):
+    """
+    Third-order series for the eccentric anomaly, a starting value for moderate e.
+
+    E ≈ M + e sin M + (e²/2) sin 2M + (e³/8)(3 sin 3M - sin M), with the multiple-angle
+    sines built from sin M and cos M. Works on floats and arrays alike.
+    """
+    sin_2m = 2 * sin_m * cos_m
+    sin_3m = sin_m * (3 - 4 * sin_m * sin_m)
+    return m + e * sin_m + 0.5 * e * e * sin_2m + (e * e * e / 8.0) * (3 * sin_3m - sin_m)
+
+
+def _solve_kepler(mean_anomaly: np.ndarray, e: np.ndarray) -> np.ndarray:
+    """
+    Solve Kepler's equation for many orbits with Danby's quartic-convergence iteration.
+
+    Elliptical orbits (e < 1) solve M = E - e*sin(E) for the eccentric anomaly E;
+    hyperbolic orbits (e > 1) solve M = e*sinh(H) - H for the hyperbolic anomaly H.
+    Each step reuses one sin/cos (or sinh/cosh) pair for f and its first three
+    derivatives, and iteration stops once every orbit has converged (typically
+    after 1-3 steps). Elliptical orbits with e <= KEPLER_SERIES_MAX_ECCENTRICITY
+    start from a third-order series in M, others from Danby's
+    E0 = M + 0.85*e*sign(sin M). Parabolic orbits (e == 1) are left as NaN.
+
+    Args:
+        mean_anomaly: Mean anomalies in radians
+        e: Eccentricities
+
+    Returns:
+        Eccentric (or hyperbolic) anomalies in radians
+    """
+    anomaly = np.full(np.shape(mean_anomaly), np.nan)
+    elliptic = e < 1.0
+    hyperbolic = e > 1.0
+
+    # Elliptical: reduce M into [0, 2π) and seed
+    m_ell = np.mod(mean_anomaly[elliptic], 2 * np.pi)
+    e_ell = e[elliptic]
+    sin_m = np.sin(m_ell)
+    E = np.where(
+        e_ell <= KEPLER_SERIES_MAX_ECCENTRICITY,
+        _kepler_series_seed(m_ell, e_ell, sin_m, np.cos(m_ell)),
+        m_ell + 0.85 * e_ell * np.sign(sin_m),
+    )
+    for _ in range(KEPLER_MAX_ITERATIONS):
+        e_sin, e_cos = e_ell * np.sin(E), e_ell * np.cos(E)
+        f = E - e_sin - m_ell
+        if not np.any(np.abs(f) >= KEPLER_TOLERANCE):
+            break
+        E = E + _danby_step(f, 1.0 - e_cos, e_sin, e_cos)
+    anomaly[elliptic] = E
+
+    # Hyperbolic: seed with Danby's H0 = sign(M) * ln(2|M|/e + 1.8)
+    m_hyp = mean_anomaly[hyperbolic]
+    e_hyp = e[hyperbolic]
+    H = np.sign(m_hyp) * np.log(2 * np.abs(m_hyp) / e_hyp + 1.8)
+    for _ in range(KEPLER_MAX_ITERATIONS):
+        e_sinh, e_cosh = e_hyp * np.sinh(H), e_hyp * np.cosh(H)
+        f = e_sinh - H - m_hyp
+        if not np.any(np.abs(f) >= KEPLER_TOLERANCE):
+            break
+        H = H + _danby_step(f, e_cosh - 1.0, e_sinh, e_cosh)
+    anomaly[hyperbolic] = H
+
+    return anomaly
+
+
+@lru_cache(maxsize=EPHEMERIS_CACHE_SIZE)
+def _compute_ephemeris_scalar(
+    q: float,
+    e: float,
+    inclination_deg: float,
+    arg_perihelion_deg: float,
+    ascending_node_deg: float,
+    perihelion_time_jd: float,
+    absolute_magnitude: Optional[float],
+    magnitude_slope: Optional[float],
+    jd: float,
+) -> Tuple[float, ...]:
+    """
+    Compute the simplified ephemeris of one comet with scalar math.
+
+    Same model as _compute_ephemeris_batch, written with the math module because
+    NumPy's per-call dispatch dominates when there is only one orbit. Takes plain
+    floats so repeated queries for the same orbit and time are served from the cache.
+
+    Returns:
+        Values in EPHEMERIS_FIELDS order; NaN where the orbit can't be solved
+    """
+    if not (e < 1.0 or e > 1.0):
+        # Parabolic orbits aren't handled by the solver
+        return (float("nan"),) * len(EPHEMERIS_FIELDS)
+
+    # Mean motion from Kepler's 3rd law and mean anomaly since perihelion
+    semi_major_axis = q / (1.0 - e) if e < 1.0 else q / (e - 1.0)
+    if semi_major_axis > 0:
+        mean_motion = GAUSSIAN_GRAVITATIONAL_CONSTANT / math.sqrt(abs(semi_major_axis) ** 3)
+    else:
+        mean_motion = GAUSSIAN_GRAVITATIONAL_CONSTANT
+    mean_anomaly = mean_motion * (jd - perihelion_time_jd)
+
+    # Kepler's equation with Danby's iteration (see _solve_kepler), then true anomaly
+    if e < 1.0:
+        m = mean_anomaly % (2 * math.pi)
+        sin_m = math.sin(m)
+        if e <= KEPLER_SERIES_MAX_ECCENTRICITY:
+            E = _kepler_series_seed(m, e, sin_m, math.cos(m))
+        else:
+            E = m + 0.85 * e * ((sin_m > 0) - (sin_m < 0))
+        for _ in range(KEPLER_MAX_ITERATIONS):
+            e_sin, e_cos = e * math.sin(E), e * math.cos(E)
+            f = E - e_sin - m
+            if abs(f) < KEPLER_TOLERANCE:
+                break
+            E += _danby_step(f, 1.0 - e_cos, e_sin, e_cos)
+        true_anomaly = 2 * math.atan2(math.sqrt(1 + e) * math.sin(E / 2), math.sqrt(1 - e) * math.cos(E / 2))
+    else:
+        H = math.copysign(math.log(2 * abs(mean_anomaly) / e + 1.8), mean_anomaly)
+        for _ in range(KEPLER_MAX_ITERATIONS):
+            e_sinh, e_cosh = e * math.sinh(H), e * math.cosh(H)
+            f = e_sinh - H - mean_anomaly
+            if abs(f) < KEPLER_TOLERANCE:
+                break
+            H += _danby_step(f, e_cosh - 1.0, e_sinh, e_cosh)
+        true_anomaly = 2 * math.atan(math.sqrt((e + 1) / (e - 1)) * math.tanh(H / 2))
+
+    r = q * (1 + e) / (1 + e * math.cos(true_anomaly))
+
+    # Ecliptic position from the argument of latitude (ω + ν), then rotate by the obliquity
+    arg_latitude = math.radians(arg_perihelion_deg) + true_anomaly
+    x_orb, y_orb = r * math.cos(arg_latitude), r * math.sin(arg_latitude)
+    incl, node = math.radians(inclination_deg), math.radians(ascending_node_deg)
+    cos_incl = math.cos(incl)
+    x_eq = math.cos(node) * x_orb - math.sin(node) * y_orb * cos_incl
+    y_ecl = math.sin(node) * x_orb + math.cos(node) * y_orb * cos_incl
+    z_ecl = y_orb * math.sin(incl)
+    y_eq = y_ecl * COS_OBLIQUITY - z_ecl * SIN_OBLIQUITY
+    z_eq = y_ecl * SIN_OBLIQUITY + z_ecl * COS_OBLIQUITY
+
+    r_eq = math.sqrt(x_eq * x_eq + y_eq * y_eq + z_eq * z_eq)
+    if absolute_magnitude is not None:
+        magnitude = absolute_magnitude + (5 + 2.5 * magnitude_slope) * math.log10(r)
+    else:
+        magnitude = float("nan")
+
+    # Geocentric distance approximated by the heliocentric one, as in the batch version
+    return (
+        (math.atan2(y_eq, x_eq) % (2 * math.pi)) * HOURS_PER_RADIAN,
+        math.degrees(math.asin(max(-1.0, min(1.0, z_eq / r_eq)))),
+        r,
+        r,
+        magnitude,
+    )
+
+
+def _compute_ephemeris_batch(elements: Dict[str, np.ndarray], jd: Union[float, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Compute simplified ephemerides for many comets at one time in a single array pass.
+
+    Args:
+        elements: Arrays from _orbital_element_arrays
+        jd: Julian date to compute positions at, or one date per element row
+
+    Returns:
+        Arrays ra_hours, dec_degrees, helio_distance_au, geo_distance_au and magnitude,
+        aligned with the input; NaN where an orbit can't be solved
+    """
+    q = elements["q"]
+    e = elements["e"]
+
+    # Orbits the solver can't handle (e.g. parabolic) come out as NaN
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Semi-major axis magnitude in AU: q / (1 - e) for elliptical orbits,
+        # q / (e - 1) for hyperbolic ones
+        semi_major_axis = np.where(e < 1.0, q / (1.0 - e), q / (e - 1.0))
+
+        # Mean motion in rad/day from Kepler's 3rd law
+        mean_motion = np.where(
+            semi_major_axis > 0,
+            GAUSSIAN_GRAVITATIONAL_CONSTANT / np.sqrt(np.abs(semi_major_axis) ** 3),
+            GAUSSIAN_GRAVITATIONAL_CONSTANT,
+        )
+
+        # Mean anomaly from time since perihelion in days
+        mean_anomaly = mean_motion * (jd - elements["perihelion_jd"])
+
+        # Solve Kepler's equation for the eccentric (or hyperbolic) anomaly
+        anomaly = _solve_kepler(mean_anomaly, e)
+
+        # True anomaly and heliocentric distance
+        true_anomaly = np.where(
+            e < 1.0,
+            2 * np.arctan2(np.sqrt(1 + e) * np.sin(anomaly / 2), np.sqrt(1 - e) * np.cos(anomaly / 2)),
+            2 * np.arctan(np.sqrt((e + 1) / (e - 1)) * np.tanh(anomaly / 2)),
+        )
+        r = q * (1 + e) / (1 + e * np.cos(true_anomaly))
+
+        # Position in the orbital plane (x toward perihelion), rotated to equatorial
+        # coordinates with one stacked matrix product
+        in_plane = np.stack((r * np.cos(true_anomaly), r * np.sin(true_anomaly)), axis=-1)
+        x_eq, y_eq, z_eq = np.einsum("nij,nj->in", _orbital_plane_to_equatorial(elements), in_plane)
+
+        # RA in [0, 24h) and Dec (clamped to valid range)
+        ra_hours = np.mod(np.arctan2(y_eq, x_eq), 2 * np.pi) * HOURS_PER_RADIAN
+        r_eq = np.sqrt(x_eq**2 + y_eq**2 + z_eq**2)
+        dec_degrees = np.degrees(np.arcsin(np.clip(z_eq / r_eq, -1.0, 1.0)))
+
+        # Geocentric distance approximated by the heliocentric one (Earth's position is ignored)
+        geo_distance_au = r
+
+        # Magnitude from the comet H-n model: m = H + 5*log10(delta) + 2.5*n*log10(r),
+        # with delta = r so the logarithm is taken once
+        log_r = np.log10(r)
+        magnitude = elements["abs_magnitude"] + (5 + 2.5 * elements["slope"]) * log_r
+
+    return {
+        "ra_hours": ra_hours,
+        "dec_degrees": dec_degrees,
+        "helio_distance_au": r,
+        "geo_distance_au": geo_distance_au,
+        "magnitude": magnitude,
+    }
+
 
 class CometService:
     """Service for managing comet catalog and computing ephemerides."""
@@ -30,33 +439,55 @@ class CometService:
         Returns:
             Database ID of inserted comet
         """
-        oe = comet.orbital_elements
+        return self.add_comets([comet])[0]
 
-        db_comet = CometCatalog(
-            designation=comet.designation,
-            name=comet.name,
-            discovery_date=comet.discovery_date,
-            epoch_jd=oe.epoch_jd,
-            perihelion_distance_au=oe.perihelion_distance_au,
-            eccentricity=oe.eccentricity,
-            inclination_deg=oe.inclination_deg,
-            arg_perihelion_deg=oe.arg_perihelion_deg,
-            ascending_node_deg=oe.ascending_node_deg,
-            perihelion_time_jd=oe.perihelion_time_jd,
-            absolute_magnitude=comet.absolute_magnitude,
-            magnitude_slope=comet.magnitude_slope,
-            current_magnitude=comet.current_magnitude,
-            activity_status=comet.activity_status,
-            comet_type=comet.comet_type,
-            data_source=comet.data_source,
-            notes=comet.notes,
-        )
+    def add_comets(self, comets: Sequence[CometTarget]) -> List[int]:
+        """
+        Add many comets to the catalog in one transaction.
+
+        Rows are sent as a single executemany INSERT (batched by SQLAlchemy), so a
+        bulk ingest commits once instead of once per comet.
+
+        Args:
+            comets: CometTarget objects to add
 
-        self.db.add(db_comet)
+        Returns:
+            Database IDs of the inserted comets, in input order
+        """
+        if not comets:
+            return []
+
+        rows = [self._comet_to_row(comet) for comet in comets]
+        statement = insert(CometCatalog).returning(CometCatalog.id, sort_by_parameter_order=True)
+        comet_ids = list(self.db.scalars(statement, rows))
         self.db.commit()
-        self.db.refresh(db_comet)
 
-        return db_comet.id
+        return comet_ids
+
+    @staticmethod
+    def _comet_to_row(comet: CometTarget) -> Dict[str, object]:
+        """Convert CometTarget to comet_catalog column values."""
+        oe = comet.orbital_elements
+
+        return {
+            "designation": comet.designation,
+            "name": comet.name,
+            "discovery_date": comet.discovery_date,
+            "epoch_jd": oe.epoch_jd,
+            "perihelion_distance_au": oe.perihelion_distance_au,
+            "eccentricity": oe.eccentricity,
+            "inclination_deg": oe.inclination_deg,
+            "arg_perihelion_deg": oe.arg_perihelion_deg,
+            "ascending_node_deg": oe.ascending_node_deg,
+            "perihelion_time_jd": oe.perihelion_time_jd,
+            "absolute_magnitude": comet.absolute_magnitude,
+            "magnitude_slope": comet.magnitude_slope,
+            "current_magnitude": comet.current_magnitude,
+            "activity_status": comet.activity_status,
+            "comet_type": comet.comet_type,
+            "data_source": comet.data_source,
+            "notes": comet.notes,
+        }
 
     def get_comet_by_designation(self, designation: str) -> Optional[CometTarget]:
         """
@@ -120,6 +551,43 @@ class CometService:
             notes=db_comet.notes,
         )
 
+    def _fetch_orbital_arrays(self, max_magnitude: float) -> Dict[str, np.ndarray]:
+        """
+        Orbital elements of comets no fainter than max_magnitude, read as columns.
+
+        The magnitude filter runs in the database and only the columns the
+        ephemeris needs are selected, so no ORM objects are built per row.
+
+        Args:
+            max_magnitude: Maximum (faintest) current magnitude; comets without one are kept
+
+        Returns:
+            Element arrays as from _orbital_element_arrays, plus the comets' database "id"
+        """
+        rows = (
+            self.db.query(
+                CometCatalog.id,
+                CometCatalog.perihelion_distance_au,
+                CometCatalog.eccentricity,
+                CometCatalog.inclination_deg,
+                CometCatalog.arg_perihelion_deg,
+                CometCatalog.ascending_node_deg,
+                CometCatalog.perihelion_time_jd,
+                CometCatalog.absolute_magnitude,
+                CometCatalog.magnitude_slope,
+            )
+            .filter(or_(CometCatalog.current_magnitude.is_(None), CometCatalog.current_magnitude <= max_magnitude))
+            .order_by(CometCatalog.current_magnitude.asc())
+            .all()
+        )
+        if not rows:
+            return {"id": np.empty(0, dtype=np.int64)}
+
+        ids, *columns = zip(*rows)
+        elements = _element_arrays(*columns)
+        elements["id"] = np.asarray(ids, dtype=np.int64)
+        return elements
+
     def compute_ephemeris(self, comet: CometTarget, time_utc: datetime) -> CometEphemeris:
         """
         Compute ephemeris for a comet at a specific time.
@@ -134,119 +602,72 @@ class CometService:
         Returns:
             CometEphemeris object
         """
-        # Convert to astropy Time
-        t = Time(time_utc)
-        jd = t.jd
-
+        # Positions are solved (and cached) at the rounded time, which is also the
+        # time the ephemeris reports
+        jd = round(Time(time_utc).jd, EPHEMERIS_JD_DECIMALS)
         oe = comet.orbital_elements
-
-        # Compute mean anomaly (simplified)
-        # M = n * (t - T) where n is mean motion
-        # For comets, we use Kepler's 3rd law: n = sqrt(GM_sun / a^3)
-        # a = q / (1 - e) for elliptical orbits
-
-        # Semi-major axis in AU
-        if oe.eccentricity < 1.0:
-            semi_major_axis = oe.perihelion_distance_au / (1.0 - oe.eccentricity)
-        else:
-            # Hyperbolic orbit - use approximation
-            semi_major_axis = oe.perihelion_distance_au / (oe.eccentricity - 1.0)
-
-        # Mean motion in radians per day
-        # Using GM_sun = 1.32712440018e20 m³/s²
-        # Simplified: n ≈ 0.01720209895 / sqrt(a^3) rad/day (Gaussian constant)
-        k = 0.01720209895  # Gaussian gravitational constant
-        if semi_major_axis > 0:
-            mean_motion = k / np.sqrt(abs(semi_major_axis) ** 3)
-        else:
-            mean_motion = k  # Fallback
-
-        # Time since perihelion in days
-        dt = jd - oe.perihelion_time_jd
-
-        # Mean anomaly
-        mean_anomaly = mean_motion * dt
-
-        # Solve Kepler's equation for eccentric anomaly (simplified Newton-Raphson)
-        E = mean_anomaly  # Initial guess
-        for _ in range(10):  # Iterate
-            E = E - (E - oe.eccentricity * np.sin(E) - mean_anomaly) / (1 - oe.eccentricity * np.cos(E))
-
-        # True anomaly
-        true_anomaly = 2 * np.arctan2(
-            np.sqrt(1 + oe.eccentricity) * np.sin(E / 2), np.sqrt(1 - oe.eccentricity) * np.cos(E / 2)
+        values = _compute_ephemeris_scalar(
+            oe.perihelion_distance_au,
+            oe.eccentricity,
+            oe.inclination_deg,
+            oe.arg_perihelion_deg,
+            oe.ascending_node_deg,
+            oe.perihelion_time_jd,
+            comet.absolute_magnitude,
+            comet.magnitude_slope,
+            jd,
         )
+        return self._build_ephemeris(comet, time_utc, jd, dict(zip(EPHEMERIS_FIELDS, values)))
 
-        # Heliocentric distance
-        r = oe.perihelion_distance_au * (1 + oe.eccentricity) / (1 + oe.eccentricity * np.cos(true_anomaly))
-
-        # Convert orbital elements to ecliptic coordinates
-        # This is a simplified approach - production should use JPL Horizons or more sophisticated orbital propagation
-
-        # Argument of latitude (ω + ν)
-        arg_latitude = np.radians(oe.arg_perihelion_deg) + true_anomaly
-
-        # Position in orbital plane
-        x_orb = r * np.cos(arg_latitude)
-        y_orb = r * np.sin(arg_latitude)
-
-        # Transform to ecliptic frame
-        incl = np.radians(oe.inclination_deg)
-        omega = np.radians(oe.ascending_node_deg)
-
-        # Ecliptic coordinates
-        x_ecl = np.cos(omega) * x_orb - np.sin(omega) * y_orb * np.cos(incl)
-        y_ecl = np.sin(omega) * x_orb + np.cos(omega) * y_orb * np.cos(incl)
-        z_ecl = y_orb * np.sin(incl)
-
-        # Convert ecliptic to equatorial (J2000)
-        # Obliquity of ecliptic (23.4393 degrees)
-        epsilon = np.radians(23.4393)
-
-        x_eq = x_ecl
-        y_eq = y_ecl * np.cos(epsilon) - z_ecl * np.sin(epsilon)
-        z_eq = y_ecl * np.sin(epsilon) + z_ecl * np.cos(epsilon)
-
-        # Calculate RA and Dec
-        ra_rad = np.arctan2(y_eq, x_eq)
-        if ra_rad < 0:
-            ra_rad += 2 * np.pi
-        ra_hours = np.degrees(ra_rad) / 15.0
-
-        # Declination (clamped to valid range)
-        r_eq = np.sqrt(x_eq**2 + y_eq**2 + z_eq**2)
-        dec_degrees = np.degrees(np.arcsin(np.clip(z_eq / r_eq, -1.0, 1.0)))
+    def compute_ephemerides(self, comet: CometTarget, times_utc: Sequence[datetime]) -> List[CometEphemeris]:
+        """
+        Compute ephemerides for one comet at many times (e.g. an hourly grid).
 
-        # Get Sun position for elongation calculation
-        get_sun(t)
+        All times are converted in one astropy call and solved in one array pass,
+        instead of paying per-call overhead for each time as compute_ephemeris does.
 
-        # Estimate geocentric distance (simplified - doesn't account for Earth's position properly)
-        # For better accuracy, should compute Earth's position and vector difference
-        geo_distance_au = r  # Approximation
+        Args:
+            comet: Comet to compute ephemerides for
+            times_utc: Times to compute ephemerides at (UTC)
 
-        # Estimate magnitude using H-G model for comets
-        # m = H + 5*log10(delta) + 2.5*n*log10(r)
-        # where delta is Earth distance, r is Sun distance, n is slope parameter
-        if comet.absolute_magnitude is not None:
-            magnitude = (
-                comet.absolute_magnitude + 5 * np.log10(geo_distance_au) + 2.5 * comet.magnitude_slope * np.log10(r)
+        Returns:
+            CometEphemeris objects, one per time
+        """
+        if not times_utc:
+            return []
+
+        return self._ephemerides_at(comet, times_utc, Time(list(times_utc)).jd)
+
+    def _ephemerides_at(
+        self, comet: CometTarget, times_utc: Sequence[datetime], jds: np.ndarray
+    ) -> List[CometEphemeris]:
+        """Ephemerides of one comet at already-converted Julian dates, in one array pass."""
+        # The comet's elements repeated along the time axis
+        elements = {key: np.repeat(values, len(jds)) for key, values in _orbital_element_arrays([comet]).items()}
+        batch = _compute_ephemeris_batch(elements, jds)
+
+        return [
+            self._build_ephemeris(
+                comet, time_utc, float(jds[position]), {key: values[position] for key, values in batch.items()}
             )
-        else:
-            magnitude = None
-
-        # Solar elongation (angle from Sun) - simplified
-        elongation_deg = 90.0  # Placeholder
+            for position, time_utc in enumerate(times_utc)
+        ]
 
+    def _build_ephemeris(
+        self, comet: CometTarget, time_utc: datetime, jd: float, values: Dict[str, float]
+    ) -> CometEphemeris:
+        """Build the CometEphemeris for one comet from computed position values."""
         return CometEphemeris(
             designation=comet.designation,
             date_utc=time_utc,
             date_jd=jd,
-            ra_hours=ra_hours,
-            dec_degrees=dec_degrees,
-            geo_distance_au=geo_distance_au,
-            helio_distance_au=r,
-            magnitude=magnitude,
-            elongation_deg=elongation_deg,
+            ra_hours=float(values["ra_hours"]),
+            dec_degrees=float(values["dec_degrees"]),
+            geo_distance_au=float(values["geo_distance_au"]),
+            helio_distance_au=float(values["helio_distance_au"]),
+            magnitude=float(values["magnitude"]) if comet.absolute_magnitude is not None else None,
+            # Solar elongation (angle from Sun) - simplified placeholder
+            elongation_deg=90.0,
             phase_angle_deg=None,  # Would compute from geometry
         )
 
@@ -265,34 +686,71 @@ class CometService:
         # Compute ephemeris
         ephemeris = self.compute_ephemeris(comet, time_utc)
 
-        # Create observer location
-        obs_location = EarthLocation(
-            lat=location.latitude * u.deg, lon=location.longitude * u.deg, height=location.elevation * u.m
+        # Observer frame and darkness are cached per location and time
+        observer = (location.latitude, location.longitude, location.elevation, time_utc)
+
+        # Turn RA/Dec to the horizon with the same rotation get_visible_comets uses
+        altitude, azimuth = _horizon_coordinates(
+            np.float64(ephemeris.ra_hours), np.float64(ephemeris.dec_degrees), _icrs_to_horizon(*observer)
         )
 
-        # Create astropy time
-        t = Time(time_utc)
+        return self._visibility_from_ephem(comet, ephemeris, altitude, azimuth, _is_dark_enough(*observer))
 
-        # Create coordinate from RA/Dec
-        coord = SkyCoord(ra=ephemeris.ra_hours * u.hourangle, dec=ephemeris.dec_degrees * u.deg, frame="icrs")
+    def compute_visibility_track(
+        self, comet: CometTarget, location: Location, times_utc: Sequence[datetime]
+    ) -> List[CometVisibility]:
+        """
+        Compute visibility of one comet from a location at many times (e.g. tonight's track).
 
-        # Transform to AltAz frame
-        altaz_frame = AltAz(obstime=t, location=obs_location)
-        altaz = coord.transform_to(altaz_frame)
+        Positions come from one array pass over the times; the horizon rotations for
+        the comet track and the Sun's position are each computed in a single astropy call.
 
-        altitude_deg = altaz.alt.degree
-        azimuth_deg = altaz.az.degree
+        Args:
+            comet: Comet to check visibility for
+            location: Observer location
+            times_utc: Times to check (UTC)
 
-        # Check visibility conditions
-        is_visible = altitude_deg > 0
+        Returns:
+            CometVisibility objects, one per time
+        """
+        if not times_utc:
+            return []
+
+        obs_location = EarthLocation(
+            lat=location.latitude * u.deg, lon=location.longitude * u.deg, height=location.elevation * u.m
+        )
+        altaz_frame = AltAz(obstime=Time(list(times_utc)), location=obs_location)
+        ephemerides = self._ephemerides_at(comet, times_utc, altaz_frame.obstime.jd)
+
+        # Horizon rotations for every time from one astropy call, as compute_visibility uses
+        altitudes, azimuths = _horizon_coordinates(
+            np.array([eph.ra_hours for eph in ephemerides]),
+            np.array([eph.dec_degrees for eph in ephemerides]),
+            _horizon_rotations(altaz_frame),
+        )
 
-        # Check if it's dark enough (Sun below -18 degrees)
-        sun = get_sun(t)
-        sun_altaz = sun.transform_to(altaz_frame)
-        is_dark_enough = sun_altaz.alt.degree < -18
+        # Astronomical darkness (Sun below -18 degrees) at each time
+        dark = get_sun(altaz_frame.obstime).transform_to(altaz_frame).alt.degree < -18
+
+        return [
+            self._visibility_from_ephem(comet, ephemeris, altitude, azimuth, bool(is_dark))
+            for ephemeris, altitude, azimuth, is_dark in zip(ephemerides, altitudes, azimuths, dark)
+        ]
+
+    def _visibility_from_ephem(
+        self,
+        comet: CometTarget,
+        ephemeris: CometEphemeris,
+        altitude_deg: float,
+        azimuth_deg: float,
+        is_dark_enough: bool,
+    ) -> CometVisibility:
+        """Build CometVisibility from a computed position and the observer's darkness."""
+        # Check visibility conditions
+        is_visible = bool(altitude_deg > 0)
 
         # Check elongation (should be > 30 degrees from Sun for comets)
-        elongation_ok = ephemeris.elongation_deg and ephemeris.elongation_deg > 30
+        elongation_ok = bool(ephemeris.elongation_deg and ephemeris.elongation_deg > 30)
 
         # Overall recommendation
         recommended = is_visible and is_dark_enough and elongation_ok
@@ -300,8 +758,8 @@ class CometService:
         return CometVisibility(
             comet=comet,
             ephemeris=ephemeris,
-            altitude_deg=altitude_deg,
-            azimuth_deg=azimuth_deg,
+            altitude_deg=float(altitude_deg),
+            azimuth_deg=float(azimuth_deg),
             is_visible=is_visible,
             is_dark_enough=is_dark_enough,
             elongation_ok=elongation_ok,
@@ -323,25 +781,47 @@ class CometService:
         Returns:
             List of visible comets with visibility info
         """
-        all_comets = self.get_all_comets()
-        visible = []
-
-        for comet in all_comets:
-            # Skip if too faint
-            if comet.current_magnitude and comet.current_magnitude > max_magnitude:
-                continue
-
-            try:
-                visibility = self.compute_visibility(comet, location, time_utc)
-
-                if visibility.is_visible and visibility.altitude_deg >= min_altitude and visibility.is_dark_enough:
-                    visible.append(visibility)
-            except Exception as e:
-                # Skip comets that fail computation
-                print(f"Warning: Failed to compute visibility for {comet.designation}: {e}")
-                continue
-
-        # Sort by magnitude (brightest first)
-        visible.sort(key=lambda v: v.ephemeris.magnitude if v.ephemeris.magnitude else 99.0)
-
-        return visible
+        # Dark enough (Sun below -18 degrees) is the same for every comet
+        observer = (location.latitude, location.longitude, location.elevation, time_utc)
+        if not _is_dark_enough(*observer):
+            return []
+        jd = _altaz_frame(*observer).obstime.jd
+
+        # Elements of comets bright enough, filtered in the database
+        elements = self._fetch_orbital_arrays(max_magnitude)
+        comet_ids = elements.pop("id")
+        if not len(comet_ids):
+            return []
+
+        # Positions of all comets in one array pass, turned to the horizon with one
+        # cached rotation; comets whose orbit can't be solved come out as NaN and
+        # are never visible
+        batch = _compute_ephemeris_batch(elements, jd)
+        altitudes, azimuths = _horizon_coordinates(batch["ra_hours"], batch["dec_degrees"], _icrs_to_horizon(*observer))
+
+        # Only load full catalog rows for comets that made the cut
+        positions = np.flatnonzero((altitudes > 0) & (altitudes >= min_altitude))
+        if not len(positions):
+            return []
+
+        # Brightest first; comets without a magnitude sort last
+        magnitudes = np.nan_to_num(batch["magnitude"][positions], nan=99.0)
+        positions = positions[np.argsort(magnitudes, kind="stable")]
+        survivor_ids = comet_ids[positions].tolist()
+        survivors = {
+            db_comet.id: self._db_to_comet(db_comet)
+            for db_comet in self.db.query(CometCatalog).filter(CometCatalog.id.in_(survivor_ids))
+        }
+
+        return [
+            self._visibility_from_ephem(
+                survivors[comet_id],
+                self._build_ephemeris(
+                    survivors[comet_id], time_utc, jd, {key: values[position] for key, values in batch.items()}
+                ),
+                altitudes[position],
+                azimuths[position],
+                is_dark_enough=True,
+            )
+            for position, comet_id in zip(positions, survivor_ids)
+        ]
@@ -1,22 +1,188 @@
 """Direct FITS processing without Docker containers."""
 
+import hashlib
 import logging
+import os
+import tempfile
+import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
+import tifffile
 from astropy.io import fits
 from PIL import Image
 
+from app.core.config import get_settings
+
 logger = logging.getLogger(__name__)
 
+# Robust min/max used to normalize each channel - more aggressive to match Seestar
+STRETCH_CLIP_PERCENTILES = (0.1, 99.9)
+
+# Histogram resolution for locating clip points (16-bit)
+STRETCH_HISTOGRAM_BINS = 65536
+
+# Clip points of larger channels are found from an evenly strided sample of
+# about this many values; at 24 MP (step 3) they stay within ~0.3% of the
+# exact values, under one 8-bit output level
+STRETCH_PERCENTILE_SAMPLES = 1 << 23
+
+# Values per channel handled at a time by the histogram and midtone passes, so
+# their float64 temporaries stay a few MB instead of full-frame sized
+STRETCH_BLOCK_SIZE = 1 << 20
+
+# Pillow TIFF compression names meaning "no compression"
+TIFF_UNCOMPRESSED_NAMES = ("none", "raw", "tiff_raw")
+
+
+def _histogram_percentiles(rows: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    """
+    Percentiles of each row of a 2D array from one bincount over all rows.
+
+    Each row is binned into STRETCH_HISTOGRAM_BINS bins between its own min and max,
+    the rows' bins are offset so a single np.bincount histograms them all, and the
+    percentiles are read off the cumulative counts. Results are bin lower edges, so
+    they are within (max - min) / (STRETCH_HISTOGRAM_BINS - 1) of np.percentile.
+    Non-finite values (NaN, +/-inf) are ignored, as np.nanpercentile ignores NaN;
+    rows without finite values give NaN.
+
+    Args:
+        rows: Array of shape (rows, values)
+        percentiles: Percentiles to compute, in [0, 100]
+
+    Returns:
+        Array of shape (rows, len(percentiles))
+    """
+    n_rows, n_values = rows.shape
+    blocks = range(0, n_values, STRETCH_BLOCK_SIZE)
+
+    # Range of each row's finite values, accumulated over column blocks
+    dtype = np.promote_types(rows.dtype, np.float32)
+    lo = np.full((n_rows, 1), np.inf, dtype=dtype)
+    hi = np.full((n_rows, 1), -np.inf, dtype=dtype)
+    for start in blocks:
+        block = rows[:, start : start + STRETCH_BLOCK_SIZE]
+        finite = np.isfinite(block)
+        np.minimum(lo, np.min(block, axis=1, keepdims=True, where=finite, initial=np.inf), out=lo)
+        np.maximum(hi, np.max(block, axis=1, keepdims=True, where=finite, initial=-np.inf), out=hi)
+    empty = ~np.isfinite(lo[:, 0])
+    lo[empty] = hi[empty] = 0.0
+
+    scale = (STRETCH_HISTOGRAM_BINS - 1) / np.where(hi > lo, hi - lo, 1)
+    offsets = (np.arange(n_rows, dtype=np.uint32) * STRETCH_HISTOGRAM_BINS)[:, np.newaxis]
+
+    # Histogram accumulated over column blocks to bound the temporaries; non-finite
+    # values go to one extra bin past every row's bins, which is dropped afterwards
+    n_bins = n_rows * STRETCH_HISTOGRAM_BINS
+    counts = np.zeros(n_bins + 1, dtype=np.intp)
+    for start in blocks:
+        block = rows[:, start : start + STRETCH_BLOCK_SIZE]
+        finite = np.isfinite(block)
+        scaled = (block - lo) * scale
+        all_finite = finite.all()
+        if not all_finite:
+            np.copyto(scaled, 0, where=~finite)
+        bins = scaled.astype(np.uint32)
+        bins += offsets
+        if not all_finite:
+            bins[~finite] = n_bins
+        counts += np.bincount(bins.ravel(), minlength=n_bins + 1)
+    cdf = np.cumsum(counts[:n_bins].reshape(n_rows, STRETCH_HISTOGRAM_BINS), axis=1)
+
+    # Bin holding the value at each rank among the row's finite values (0-based,
+    # as np.percentile counts them)
+    fractions = np.asarray(percentiles, dtype=np.float64) / 100.0
+    ranks = np.floor(fractions[np.newaxis, :] * (cdf[:, -1:] - 1))
+    idx = np.stack([np.searchsorted(row_cdf, row_ranks, side="right") for row_cdf, row_ranks in zip(cdf, ranks)])
+
+    result = lo + idx / scale
+    result[empty] = np.nan
+    return result
+
+
+def _read_fits_data(fits_path: Path) -> np.ndarray:
+    """Read the first image HDU of a FITS file as float32."""
+    # Raw (unscaled) pixels are memory-mapped and converted to float32 in one
+    # copy; BSCALE/BZERO are then applied in place rather than astropy
+    # materializing a scaled array first
+    with fits.open(fits_path, do_not_scale_image_data=True) as hdul:
+        # Get the primary HDU or first image HDU
+        for hdu in hdul:
+            if isinstance(hdu, (fits.PrimaryHDU, fits.ImageHDU)) and hdu.data is not None:
+                raw = hdu.data
+                logger.debug("Loaded FITS data: shape=%s, dtype=%s", raw.shape, raw.dtype)
+                data = raw.astype(np.float32)
+
+                header = hdu.header
+                if "BLANK" in header and raw.dtype.kind in "iu":
+                    data[raw == header["BLANK"]] = np.nan
+                if header.get("BSCALE", 1) != 1:
+                    data *= header["BSCALE"]
+                if header.get("BZERO", 0) != 0:
+                    data += header["BZERO"]
+                return data
+
+    raise ValueError(f"No image data found in FITS file: {fits_path}")
+
+
+def _fits_cache_file(cache_dir: Path, fits_path: Path, stat: os.stat_result) -> Path:
+    """Cache file for a FITS file's decoded frame; a rewritten file gets a new name."""
+    key = hashlib.sha1(str(fits_path.resolve()).encode()).hexdigest()
+    return cache_dir / f"{key}-{stat.st_mtime_ns}-{stat.st_size}.npy"
+
+
+def _store_fits_cache(cache_file: Path, data: np.ndarray, max_bytes: int) -> None:
+    """Write a decoded frame to the cache, then evict least recently used frames over max_bytes."""
+    if data.nbytes > max_bytes:
+        return
+
+    cache_dir = cache_file.parent
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # Frames of earlier versions of the same file can never be hit again
+    key = cache_file.name.split("-", 1)[0]
+    for stale in cache_dir.glob(f"{key}-*.npy"):
+        stale.unlink(missing_ok=True)
+
+    # Written under a temporary name so a concurrent reader never maps a partial file
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as tmp:
+        np.save(tmp, data)
+    os.replace(tmp.name, cache_file)
+
+    # Hits touch their file, so modification time orders entries by last use
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".npy"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        Path(path).unlink(missing_ok=True)
+        total -= size
+
 
 class DirectProcessor:
     """Process FITS files directly without Docker."""
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, cache_max_mb: Optional[int] = None):
+        """
+        Initialize processor.
+
+        Args:
+            cache_dir: Directory for cached decoded frames (default: settings.fits_cache_dir;
+                empty disables the cache)
+            cache_max_mb: Cache size limit in MB (default: settings.fits_cache_max_mb)
+        """
         self.supported_formats = ["jpeg", "jpg", "tiff", "tif", "png"]
 
+        settings = get_settings()
+        cache_dir = settings.fits_cache_dir if cache_dir is None else cache_dir
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_max_bytes = (settings.fits_cache_max_mb if cache_max_mb is None else cache_max_mb) * 1024 * 1024
+
     def process_fits(self, input_file: Path, output_dir: Path, pipeline_steps: List[Dict[str, Any]]) -> List[Path]:
         """
         Process a FITS file through a pipeline.
@@ -29,12 +195,13 @@ class DirectProcessor:
         Returns:
             List of output file paths
         """
-        logger.info(f"Processing {input_file} with {len(pipeline_steps)} steps")
+        start = time.perf_counter()
 
         # Load FITS file
         data = self._load_fits(input_file)
 
-        # Apply pipeline steps
+        # Apply pipeline steps (step details are logged at DEBUG; one summary at INFO)
+        output_files = None
         for step in pipeline_steps:
             step_name = step.get("step")
             params = step.get("params", {})
@@ -42,58 +209,108 @@ class DirectProcessor:
             if step_name == "histogram_stretch":
                 data = self.histogram_stretch(data, **params)
             elif step_name == "export":
-                return self.export_image(data, output_dir, input_file.stem, **params)
+                output_files = self.export_image(data, output_dir, input_file.stem, **params)
+                break
             else:
-                logger.warning(f"Unknown processing step: {step_name}")
+                logger.warning("Unknown processing step: %s", step_name)
 
-        # Default: export as JPEG
-        return self.export_image(data, output_dir, input_file.stem, format="jpeg", quality=95)
+        if output_files is None:
+            # Default: export as JPEG
+            output_files = self.export_image(data, output_dir, input_file.stem, format="jpeg", quality=95)
 
-    def _load_fits(self, fits_path: Path) -> np.ndarray:
-        """Load FITS file and return image data."""
-        logger.info(f"Loading FITS file: {fits_path}")
+        logger.info(
+            "Processed %s (%d steps) in %.2fs: %s",
+            input_file,
+            len(pipeline_steps),
+            time.perf_counter() - start,
+            ", ".join(str(path) for path in output_files),
+        )
+        return output_files
 
-        with fits.open(fits_path) as hdul:
-            # Get the primary HDU or first image HDU
-            for hdu in hdul:
-                if isinstance(hdu, (fits.PrimaryHDU, fits.ImageHDU)) and hdu.data is not None:
-                    data = hdu.data
-                    logger.info(f"Loaded FITS data: shape={data.shape}, dtype={data.dtype}")
-                    return data.astype(np.float32)
+    def _load_fits(self, fits_path: Path) -> np.ndarray:
+        """
+        Load FITS file and return image data.
 
-        raise ValueError(f"No image data found in FITS file: {fits_path}")
+        With a cache directory configured, decoded frames are kept there as .npy files
+        keyed on the file's path, modification time and size, and a cached frame is
+        memory-mapped read-only instead of decoding the FITS file again.
+        """
+        logger.debug("Loading FITS file: %s", fits_path)
+        fits_path = Path(fits_path)
+        if self.cache_dir is None:
+            return _read_fits_data(fits_path)
+
+        cache_file = _fits_cache_file(self.cache_dir, fits_path, fits_path.stat())
+        try:
+            data = np.load(cache_file, mmap_mode="r")
+            os.utime(cache_file)  # Mark as recently used
+            logger.debug("Loaded cached FITS data: %s", cache_file)
+            return data
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable FITS cache file %s: %s", cache_file, e)
+
+        data = _read_fits_data(fits_path)
+        try:
+            _store_fits_cache(cache_file, data, self.cache_max_bytes)
+        except OSError as e:
+            logger.warning("Could not cache FITS data for %s: %s", fits_path, e)
+        return data
 
     def histogram_stretch(
         self, data: np.ndarray, algorithm: str = "auto", midtones: float = 0.5, **kwargs
     ) -> np.ndarray:
         """Apply histogram stretch to image data."""
-        logger.info(f"Applying histogram stretch: algorithm={algorithm}, midtones={midtones}")
-
-        # Handle multi-channel images (RGB/color)
-        if data.ndim == 3:
-            # Process each channel separately
-            stretched = np.zeros_like(data)
-            for i in range(data.shape[0]):
-                stretched[i] = self._stretch_channel(data[i], algorithm, midtones)
-            return stretched
-        else:
-            return self._stretch_channel(data, algorithm, midtones)
-
-    def _stretch_channel(self, channel: np.ndarray, algorithm: str, midtones: float) -> np.ndarray:
-        """Stretch a single channel."""
-        # Clip outliers (robust min/max) - more aggressive to match Seestar
-        vmin, vmax = np.percentile(channel, [0.1, 99.9])
-
-        # Normalize to 0-1
-        stretched = np.clip((channel - vmin) / (vmax - vmin), 0, 1)
+        logger.debug("Applying histogram stretch: algorithm=%s, midtones=%s", algorithm, midtones)
+
+        # Clip points of every channel from one histogram pass, over a strided sample
+        # of large frames; the step is odd so it alternates row and column parity
+        # and samples every color of a Bayer mosaic
+        channels = data if data.ndim == 3 else data[np.newaxis]
+        rows = channels.reshape(len(channels), -1)
+        step = max(1, rows.shape[1] // STRETCH_PERCENTILE_SAMPLES) | 1
+        clip_points = _histogram_percentiles(rows[:, ::step], STRETCH_CLIP_PERCENTILES)
+
+        # Each channel is stretched straight into one preallocated output
+        stretched = np.empty_like(channels, dtype=np.float32)
+        for i in range(len(channels)):
+            self._stretch_channel(channels[i], *clip_points[i], algorithm, midtones, out=stretched[i])
+        return stretched if data.ndim == 3 else stretched[0]
+
+    def _stretch_channel(
+        self,
+        channel: np.ndarray,
+        vmin: float,
+        vmax: float,
+        algorithm: str,
+        midtones: float,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Stretch a single channel between its clip points, into out if given."""
+        # Normalize to 0-1 in place in the output (a flat channel maps to 0)
+        inv_range = 1.0 / (vmax - vmin) if vmax > vmin else 0.0
+        stretched = np.subtract(channel, vmin, out=out, dtype=np.float32)
+        stretched *= inv_range
+        np.clip(stretched, 0, 1, out=stretched)
 
         if algorithm == "auto" or algorithm == "midtone":
             # Apply midtone transfer function
             # MTF formula: ((median - 1) * x) / ((2 * median - 1) * x - median)
             median = midtones
             if median != 0.5:
-                stretched = ((median - 1) * stretched) / ((2 * median - 1) * stretched - median + 1e-10)
-                stretched = np.clip(stretched, 0, 1)
+                # Evaluated in float64 so the white point maps back to exactly 1, in
+                # place in two buffers (numerator, denominator) instead of a
+                # temporary per operation, one block at a time
+                rows_per_block = max(1, STRETCH_BLOCK_SIZE * len(stretched) // max(stretched.size, 1))
+                for start in range(0, len(stretched), rows_per_block):
+                    block = stretched[start : start + rows_per_block]
+                    x = block.astype(np.float64)
+                    denominator = x * (2 * median - 1)
+                    denominator += 1e-10 - median
+                    x *= median - 1
+                    np.divide(x, denominator, out=x)
+                    np.clip(x, 0, 1, out=block)
 
         return stretched
 
@@ -113,54 +330,67 @@ class DirectProcessor:
         if format not in self.supported_formats:
             raise ValueError(f"Unsupported format: {format}. Supported: {self.supported_formats}")
 
-        logger.info(f"Exporting to {format}: quality={quality}, bit_depth={bit_depth}")
+        logger.debug("Exporting to %s: quality=%s, bit_depth=%s", format, quality, bit_depth)
 
         # Ensure output directory exists
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Convert to appropriate bit depth
         if bit_depth == 8:
-            img_data = (data * 255).astype(np.uint8)
+            dtype, scale = np.uint8, 255
         elif bit_depth == 16:
-            img_data = (data * 65535).astype(np.uint16)
+            dtype, scale = np.uint16, 65535
         else:
             raise ValueError(f"Unsupported bit depth: {bit_depth}")
 
         # Handle different image dimensions
-        if img_data.ndim == 3:
-            # Multi-channel: convert to HxWxC for PIL
-            if img_data.shape[0] == 3:  # CxHxW to HxWxC
-                img_data = np.transpose(img_data, (1, 2, 0))
+        if data.ndim == 3:
+            # Multi-channel: PIL needs contiguous HxWxC, so CxHxW data is quantized
+            # straight into an HxWxC buffer instead of transposed (and copied) after
+            if data.shape[0] == 3:
+                img_data = np.empty(data.shape[1:] + (3,), dtype=dtype)
+                quantized = img_data.transpose(2, 0, 1)
+            else:
+                img_data = quantized = np.empty(data.shape, dtype=dtype)
             mode = "RGB"
-        elif img_data.ndim == 2:
+        elif data.ndim == 2:
             # Single channel grayscale
+            img_data = quantized = np.empty(data.shape, dtype=dtype)
             mode = "L"
         else:
-            raise ValueError(f"Unexpected image dimensions: {img_data.shape}")
+            raise ValueError(f"Unexpected image dimensions: {data.shape}")
 
-        # Create PIL Image
-        if bit_depth == 16:
-            # PIL doesn't support 16-bit grayscale well, use 'I;16' for single channel
-            if mode == "L":
-                image = Image.fromarray(img_data, mode="I;16")
-            else:
-                # For RGB 16-bit, we need to use mode 'I' per channel or convert to 8-bit
-                logger.warning("16-bit RGB export not fully supported, converting to 8-bit")
-                img_data = (img_data / 256).astype(np.uint8)
-                image = Image.fromarray(img_data, mode="RGB")
-        else:
-            image = Image.fromarray(img_data, mode=mode)
+        # Scale straight into the integer buffer (truncating like astype) without a scaled float copy
+        np.multiply(data, scale, out=quantized, casting="unsafe")
 
         # Determine file extension
         ext_map = {"jpeg": "jpg", "jpg": "jpg", "tiff": "tif", "tif": "tif", "png": "png"}
         ext = ext_map.get(format, format)
         output_file = output_dir / f"{base_name}.{ext}"
 
+        if bit_depth == 16 and mode == "RGB":
+            if format in ["tiff", "tif"]:
+                # PIL has no 16-bit RGB mode; tifffile writes it natively
+                self._write_tiff_rgb16(output_file, img_data, compression)
+                logger.debug("Saved output to: %s", output_file)
+                return [output_file]
+
+            logger.warning("16-bit RGB export not supported for %s, converting to 8-bit", format)
+            img_data = (img_data >> 8).astype(np.uint8)
+
+        # Create PIL Image (16-bit grayscale maps to 'I;16' without a copy)
+        if bit_depth == 16 and mode == "L":
+            image = Image.fromarray(img_data)
+        else:
+            image = Image.fromarray(img_data, mode=mode)
+
         # Save with appropriate parameters
         save_kwargs = {}
         if format in ["jpeg", "jpg"]:
             save_kwargs["quality"] = quality
-            save_kwargs["optimize"] = True
+            # The extra Huffman optimization pass triples encode time and buys
+            # little at high quality settings
+            save_kwargs["optimize"] = quality < 90
         elif format in ["tiff", "tif"]:
             if compression and compression != "none":
                 save_kwargs["compression"] = compression
@@ -168,6 +398,20 @@ class DirectProcessor:
             save_kwargs["optimize"] = True
 
         image.save(output_file, **save_kwargs)
-        logger.info(f"Saved output to: {output_file}")
+        logger.debug("Saved output to: %s", output_file)
 
         return [output_file]
+
+    def _write_tiff_rgb16(self, output_file: Path, img_data: np.ndarray, compression: Optional[str]) -> None:
+        """Write 16-bit HxWx3 data as an RGB TIFF, taking Pillow-style compression names."""
+        # Pillow names TIFF codecs "tiff_deflate", "tiff_lzw", ...; tifffile drops the prefix
+        codec = None
+        if compression and compression not in TIFF_UNCOMPRESSED_NAMES:
+            codec = compression.removeprefix("tiff_")
+        try:
+            tifffile.imwrite(output_file, img_data, photometric="rgb", compression=codec)
+        except (KeyError, ValueError, ImportError):
+            # LZW, packbits and JPEG need the optional imagecodecs package, and some Pillow
+            # codecs (CCITT, group3/4) have no tifffile name; deflate is built in
+            logger.warning("TIFF compression %s unavailable for 16-bit RGB, using deflate", compression)
+            tifffile.imwrite(output_file, img_data, photometric="rgb", compression="adobe_deflate")
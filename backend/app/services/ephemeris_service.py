@@ -2,31 +2,91 @@
 
 import math
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pytz
 from skyfield import almanac
 from skyfield.api import Loader, Star, wgs84
 
 from app.models import DSOTarget, Location
 
+# dark_twilight_day transitions (previous state, new state) -> twilight time key
+# States: 0=Night, 1=Astronomical, 2=Nautical, 3=Civil, 4=Day
+TWILIGHT_TRANSITIONS = {
+    # Evening transitions (going from light to dark)
+    (4, 3): "civil_twilight_end",
+    (3, 2): "nautical_twilight_end",
+    (2, 1): "astronomical_twilight_end",
+    # Morning transitions (going from dark to light)
+    (1, 2): "astronomical_twilight_start",
+    (2, 3): "nautical_twilight_start",
+    (3, 4): "civil_twilight_start",
+}
+
+# Observer locations whose geographic positions are kept (a deployment uses a handful)
+OBSERVER_CACHE_SIZE = 64
+
+
+# Altitude (degrees) above which field rotation is reported as FIELD_ROTATION_ZENITH_RATE
+FIELD_ROTATION_ZENITH_ALTITUDE = 85.0
+FIELD_ROTATION_ZENITH_RATE = 999.9
+
+
+def field_rotation_rates(latitude: float, altitudes: np.ndarray, azimuths: np.ndarray) -> np.ndarray:
+    """
+    Field rotation rates for an alt-az mount, vectorized over positions.
+
+    Formula: rate = 15 * cos(lat) / cos(alt) * |sin(az)|
+
+    Args:
+        latitude: Observer latitude in degrees
+        altitudes: Altitudes in degrees
+        azimuths: Azimuths in degrees
+
+    Returns:
+        Rates in degrees per minute (FIELD_ROTATION_ZENITH_RATE near zenith)
+    """
+    altitudes = np.asarray(altitudes, dtype=float)
+    rate_per_hour = 15.0 * math.cos(math.radians(latitude)) / np.cos(np.radians(altitudes))
+    rate_per_hour *= np.abs(np.sin(np.radians(azimuths)))
+
+    # Avoid division by zero near zenith
+    return np.where(altitudes > FIELD_ROTATION_ZENITH_ALTITUDE, FIELD_ROTATION_ZENITH_RATE, rate_per_hour / 60.0)
+
+
+@lru_cache(maxsize=None)
+def _load_ephemeris():
+    """Skyfield timescale and planetary ephemeris, loaded once per process and shared by every service."""
+    # Configure Skyfield to use local ephemeris directory
+    base_dir = Path(__file__).resolve().parent.parent.parent.parent
+    ephemeris_dir = base_dir / "data" / "ephemeris"
+    loader = Loader(str(ephemeris_dir))
+
+    return loader.timescale(), loader("de421.bsp")
+
+
+@lru_cache(maxsize=OBSERVER_CACHE_SIZE)
+def _geographic_position(latitude: float, longitude: float, elevation: float):
+    """WGS84 position of an observer, built once per location (it precomputes the site's trig)."""
+    return wgs84.latlon(latitude, longitude, elevation_m=elevation)
+
 
 class EphemerisService:
     """Service for astronomical calculations."""
 
     def __init__(self):
         """Initialize with ephemeris data."""
-        # Configure Skyfield to use local ephemeris directory
-        base_dir = Path(__file__).resolve().parent.parent.parent.parent
-        ephemeris_dir = base_dir / "data" / "ephemeris"
-        loader = Loader(str(ephemeris_dir))
-
-        self.ts = loader.timescale()
-        self.eph = loader("de421.bsp")
+        self.ts, self.eph = _load_ephemeris()
         self.earth = self.eph["earth"]
         self.sun = self.eph["sun"]
 
+    def _observer(self, location: Location):
+        """Observer at a location, as a vector from the solar system barycenter."""
+        return self.earth + _geographic_position(location.latitude, location.longitude, location.elevation)
+
     def calculate_twilight_times(self, location: Location, date: datetime) -> Dict[str, datetime]:
         """
         Calculate twilight times for a given location and date.
@@ -39,7 +99,7 @@ class EphemerisService:
             Dictionary with sunset, twilight times, and sunrise
         """
         # Create observer location
-        topos = wgs84.latlon(location.latitude, location.longitude, elevation_m=location.elevation)
+        topos = _geographic_position(location.latitude, location.longitude, location.elevation)
 
         # Get timezone
         tz = pytz.timezone(location.timezone)
@@ -52,80 +112,34 @@ class EphemerisService:
         t0 = self.ts.from_datetime(noon_utc)
         t1 = self.ts.from_datetime(noon_utc + timedelta(hours=36))
 
-        # Find sunset and sunrise
-        f = almanac.sunrise_sunset(self.eph, topos)
-        times, events = almanac.find_discrete(t0, t1, f)
-
-        # Find twilight times (civil, nautical, astronomical)
-        twilight_times = {}
-
-        # Sunset/Sunrise (0° below horizon)
-        sunset_idx = None
-        for i, (t, event) in enumerate(zip(times, events)):
-            if event == 0:  # Sunset
-                sunset_idx = i
-                twilight_times["sunset"] = t.utc_datetime().replace(tzinfo=pytz.UTC).astimezone(tz)
-            elif event == 1 and sunset_idx is not None:  # Sunrise after sunset
-                twilight_times["sunrise"] = t.utc_datetime().replace(tzinfo=pytz.UTC).astimezone(tz)
-                break
-
-        # Use dark_twilight_day for all twilight calculations
-        # Events: 0=Night, 1=Astronomical, 2=Nautical, 3=Civil, 4=Day
+        # One walk over the sun's altitude finds every transition (see TWILIGHT_TRANSITIONS)
         f_twilight = almanac.dark_twilight_day(self.eph, topos)
         times_twilight, events_twilight = almanac.find_discrete(t0, t1, f_twilight)
 
-        for i, (t, event) in enumerate(zip(times_twilight, events_twilight)):
-            dt = t.utc_datetime().replace(tzinfo=pytz.UTC).astimezone(tz)
-
-            # Evening transitions (going from light to dark) - take first occurrence only
-            if i > 0 and events_twilight[i - 1] == 4 and event == 3:
-                if "civil_twilight_end" not in twilight_times:
-                    twilight_times["civil_twilight_end"] = dt
-            elif i > 0 and events_twilight[i - 1] == 3 and event == 2:
-                if "nautical_twilight_end" not in twilight_times:
-                    twilight_times["nautical_twilight_end"] = dt
-            elif i > 0 and events_twilight[i - 1] == 2 and event == 1:
-                if "astronomical_twilight_end" not in twilight_times:
-                    twilight_times["astronomical_twilight_end"] = dt
-
-            # Morning transitions (going from dark to light) - take first occurrence only
-            elif i > 0 and events_twilight[i - 1] == 1 and event == 2:
-                if "astronomical_twilight_start" not in twilight_times:
-                    twilight_times["astronomical_twilight_start"] = dt
-            elif i > 0 and events_twilight[i - 1] == 2 and event == 3:
-                if "nautical_twilight_start" not in twilight_times:
-                    twilight_times["nautical_twilight_start"] = dt
-            elif i > 0 and events_twilight[i - 1] == 3 and event == 4:
-                if "civil_twilight_start" not in twilight_times:
-                    twilight_times["civil_twilight_start"] = dt
-
-        return twilight_times
-
-    def _find_twilight_angle(self, observer, t0, t1, angle: float) -> Tuple[datetime, datetime]:
-        """Find times when sun reaches a specific angle below horizon."""
-
-        def sun_altitude_below(t):
-            """Return True when sun is below the specified angle."""
-            sun_apparent = observer.at(t).observe(self.sun).apparent()
-            alt, _, _ = sun_apparent.altaz()
-            return alt.degrees < angle
+        # Event times in the location's timezone, converted in one call
+        local_times = [dt.replace(tzinfo=pytz.UTC).astimezone(tz) for dt in times_twilight.utc_datetime()]
+        events = events_twilight.tolist()
+        previous_events = [int(f_twilight(t0)), *events[:-1]]
 
-        times, events = almanac.find_discrete(t0, t1, sun_altitude_below)
-
-        # First True event is evening (sun going below angle)
-        # First False event after that is morning (sun coming back above angle)
-        evening_time = None
-        morning_time = None
+        twilight_times = {}
 
-        for t, event in zip(times, events):
-            dt = t.utc_datetime().replace(tzinfo=pytz.UTC)
-            if event and evening_time is None:
-                evening_time = dt
-            elif not event and evening_time is not None:
-                morning_time = dt
+        # Sunset/Sunrise are the day boundaries, at the same -0.8333° altitude
+        # almanac.sunrise_sunset uses
+        for dt, event, previous in zip(local_times, events, previous_events):
+            if "sunset" not in twilight_times:
+                if previous == 4 and event < 4:
+                    twilight_times["sunset"] = dt
+            elif event == 4:  # Sunrise after sunset
+                twilight_times["sunrise"] = dt
                 break
 
-        return evening_time, morning_time
+        # Find twilight times (civil, nautical, astronomical) - take first occurrence only
+        for dt, event, previous in zip(local_times[1:], events[1:], previous_events[1:]):
+            key = TWILIGHT_TRANSITIONS.get((previous, event))
+            if key is not None and key not in twilight_times:
+                twilight_times[key] = dt
+
+        return twilight_times
 
     def calculate_position(self, target: DSOTarget, location: Location, time: datetime) -> Tuple[float, float]:
         """
@@ -140,7 +154,7 @@ class EphemerisService:
             Tuple of (altitude, azimuth) in degrees
         """
         # Create observer location
-        observer = self.earth + wgs84.latlon(location.latitude, location.longitude, elevation_m=location.elevation)
+        observer = self._observer(location)
 
         # Convert time to UTC
         time_utc = time.astimezone(pytz.UTC)
@@ -156,6 +170,66 @@ class EphemerisService:
 
         return alt.degrees, az.degrees
 
+    def calculate_positions_batch(
+        self, ra_hours: np.ndarray, dec_degrees: np.ndarray, location: Location, time: datetime
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate altitude and azimuth for many targets at one time.
+
+        Vectorized form of calculate_position: a single Skyfield Star holding all
+        coordinates is observed once, instead of one observation per target.
+
+        Args:
+            ra_hours: Right ascensions in hours
+            dec_degrees: Declinations in degrees
+            location: Observer location
+            time: Time for calculation (timezone-aware)
+
+        Returns:
+            Tuple of (altitudes, azimuths) arrays in degrees
+        """
+        observer = self._observer(location)
+        t = self.ts.from_datetime(time.astimezone(pytz.UTC))
+
+        stars = Star(ra_hours=np.asarray(ra_hours, dtype=float), dec_degrees=np.asarray(dec_degrees, dtype=float))
+        alt, az, _ = observer.at(t).observe(stars).apparent().altaz()
+
+        return alt.degrees, az.degrees
+
+    def calculate_positions_over_time(
+        self, targets: Sequence[DSOTarget], location: Location, times: Sequence[datetime]
+    ) -> np.ndarray:
+        """
+        Calculate altitude and azimuth for several targets at several times.
+
+        Vectorized over time: the observer's position is computed once for the whole
+        time array and each target is observed against it, instead of one
+        calculate_position call per (target, time). (Skyfield can't broadcast an
+        array of stars against an array of times, so targets are still looped.)
+
+        Args:
+            targets: DSO targets
+            location: Observer location
+            times: Times for calculation (timezone-aware)
+
+        Returns:
+            Array of shape (len(targets), len(times), 2) holding (altitude, azimuth) in degrees
+        """
+        positions = np.empty((len(targets), len(times), 2))
+        if not len(targets) or not len(times):
+            return positions
+
+        observer = self._observer(location)
+        observer_at = observer.at(self.ts.from_datetimes([time.astimezone(pytz.UTC) for time in times]))
+
+        for i, target in enumerate(targets):
+            star = Star(ra_hours=target.ra_hours, dec_degrees=target.dec_degrees)
+            alt, az, _ = observer_at.observe(star).apparent().altaz()
+            positions[i, :, 0] = alt.degrees
+            positions[i, :, 1] = az.degrees
+
+        return positions
+
     def calculate_field_rotation_rate(self, target: DSOTarget, location: Location, time: datetime) -> float:
         """
         Calculate field rotation rate for alt-az mount.
@@ -171,23 +245,27 @@ class EphemerisService:
             Field rotation rate in degrees per minute
         """
         alt, az = self.calculate_position(target, location, time)
+        return float(field_rotation_rates(location.latitude, alt, az))
 
-        # Avoid division by zero near zenith
-        if alt > 85:
-            return 999.9  # Very high rotation rate
-
-        # Convert to radians
-        lat_rad = math.radians(location.latitude)
-        alt_rad = math.radians(alt)
-        az_rad = math.radians(az)
+    def calculate_field_rotation_rates(
+        self, target: DSOTarget, location: Location, times: Sequence[datetime]
+    ) -> np.ndarray:
+        """
+        Calculate field rotation rates for alt-az mount at several times.
 
-        # Calculate rate in degrees per hour
-        rate_per_hour = 15.0 * math.cos(lat_rad) / math.cos(alt_rad) * abs(math.sin(az_rad))
+        Vectorized form of calculate_field_rotation_rate, e.g. for plotting the
+        rate over a night.
 
-        # Convert to degrees per minute
-        rate_per_minute = rate_per_hour / 60.0
+        Args:
+            target: DSO target
+            location: Observer location
+            times: Times for calculation (timezone-aware)
 
-        return rate_per_minute
+        Returns:
+            Array of field rotation rates in degrees per minute
+        """
+        positions = self.calculate_positions_over_time([target], location, times)[0]
+        return field_rotation_rates(location.latitude, positions[:, 0], positions[:, 1])
 
     def is_target_visible(
         self, target: DSOTarget, location: Location, time: datetime, min_alt: float, max_alt: float
@@ -223,24 +301,25 @@ class EphemerisService:
         Returns:
             Tuple of (best_time, best_altitude) or (None, None) if never rises
         """
-        # Sample altitude every 15 minutes
+        # Sample altitude every 15 minutes, all samples in one vectorized call
         sample_interval = timedelta(minutes=15)
+        sample_times: List[datetime] = []
         current_time = start_time
-
-        best_time = None
-        best_altitude = -90.0  # Start below horizon
-
         while current_time <= end_time:
-            alt, _ = self.calculate_position(target, location, current_time)
+            sample_times.append(current_time)
+            current_time += sample_interval
+
+        if not sample_times:
+            return None, None
 
-            if alt > best_altitude:
-                best_altitude = alt
-                best_time = current_time
+        altitudes = self.calculate_positions_over_time([target], location, sample_times)[0, :, 0]
 
-            current_time += sample_interval
+        # First sample at the peak, as the earlier strictly-greater scan picked
+        best = int(np.argmax(altitudes))
+        best_altitude = float(altitudes[best])
 
         # Return None if object never rises above horizon
         if best_altitude < 0:
             return None, None
 
-        return best_time, best_altitude
+        return sample_times[best], best_altitude
@@ -1,16 +1,108 @@
 """File scanner service for discovering and processing image files."""
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Collection, Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 from astropy.io import fits
+from rapidfuzz import fuzz, process, utils
 from sqlalchemy.orm import Session
-from thefuzz import fuzz
 
 from app.core.config import get_settings
 from app.models.capture_models import OutputFile
 from app.models.catalog_models import DSOCatalog
+from app.services.catalog_service import CATALOG_ID_PATTERN
+
+# Minimum fuzzy match score (0-100) for a target name to be accepted
+FUZZY_MATCH_THRESHOLD = 70
+
+# Extensions whose FITS headers are read for metadata
+FITS_EXTENSIONS = (".fit", ".fits")
+
+# Threads reading FITS headers during a directory scan; header reads are
+# mostly I/O wait, especially on network-mounted capture directories
+FITS_METADATA_WORKERS = 4
+
+# OutputFile records committed per transaction during a directory scan
+SCAN_COMMIT_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class CatalogNames:
+    """Catalog names and IDs used to match target names, loaded once per process.
+
+    The catalog is read-only during normal operation; call
+    FileScannerService.clear_cache() after re-importing it.
+    """
+
+    # Normalized common name -> catalog ID (first row wins, in query order)
+    by_name: Dict[str, str]
+    # Every catalog ID (M31, C80, NGC224, IC434)
+    ids: FrozenSet[str]
+    # Fuzzy match choices (by_name keys, pre-processed for scoring) and their catalog IDs, index-aligned
+    choices: Tuple[str, ...]
+    choice_ids: Tuple[str, ...]
+
+
+_catalog_names: Optional[CatalogNames] = None
+_catalog_names_lock = threading.Lock()
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize a target name for matching - uppercase, spaces removed."""
+    return name.strip().upper().replace(" ", "")
+
+
+def _iter_scan_entries(directory: str, extensions: Collection[str]) -> Iterator[List[Tuple[os.DirEntry, str]]]:
+    """
+    Walk a directory tree with os.scandir, yielding each directory's matching files.
+
+    Like os.walk (top-down, symlinked directories not followed, unreadable
+    directories skipped), but the DirEntry objects are kept so callers can use
+    their cached type and stat information instead of re-stating each path.
+
+    Args:
+        directory: Root directory
+        extensions: Lowercase file extensions to include (with leading dot)
+
+    Yields:
+        List of (entry, extension) for the matching files in one directory
+    """
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        matches = []
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+                continue
+            file_ext = os.path.splitext(entry.name)[1].lower()
+            if file_ext in extensions:
+                matches.append((entry, file_ext))
+
+        yield matches
+        # Reversed so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+
+def _read_primary_header(file_path: str) -> fits.Header:
+    """Read only the primary header of a FITS file, without building an HDU list."""
+    with open(file_path, "rb") as f:
+        return fits.Header.fromfile(f)
 
 
 class FileScannerService:
@@ -20,6 +112,35 @@ class FileScannerService:
         """Initialize file scanner service with database session."""
         self.db = db
 
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop the cached catalog names (e.g. after the catalog tables change)."""
+        global _catalog_names
+        with _catalog_names_lock:
+            _catalog_names = None
+
+    def _get_catalog_names(self) -> CatalogNames:
+        """Get the process-wide catalog names, loading them on first use."""
+        global _catalog_names
+        names = _catalog_names
+        if names is None:
+            with _catalog_names_lock:
+                if _catalog_names is None:
+                    # Only the columns needed; catalog_id is derived in SQL by the model
+                    rows = self.db.query(DSOCatalog.catalog_id, DSOCatalog.common_name).all()
+                    by_name: Dict[str, str] = {}
+                    for row in rows:
+                        if row.common_name:
+                            by_name.setdefault(_normalize_name(row.common_name), row.catalog_id)
+                    _catalog_names = CatalogNames(
+                        by_name=by_name,
+                        ids=frozenset(row.catalog_id for row in rows),
+                        choices=tuple(utils.default_process(name) for name in by_name),
+                        choice_ids=tuple(by_name.values()),
+                    )
+                names = _catalog_names
+        return names
+
     def _fuzzy_match_catalog(self, target_name: str) -> Optional[Tuple[str, float]]:
         """
         Fuzzy match a target name to catalog.
@@ -36,40 +157,35 @@ class FileScannerService:
             return None
 
         # Normalize input name - remove spaces for better matching
-        normalized_input = target_name.strip().upper().replace(" ", "")
-        threshold = 70  # 70% confidence minimum
-
-        # Get all DSO catalog entries
-        all_dsos = self.db.query(DSOCatalog).all()
-
-        best_match = None
-        best_score = 0
-
-        for dso in all_dsos:
-            # Try matching against common_name
-            if dso.common_name:
-                # Normalize database value - remove spaces
-                db_name = dso.common_name.strip().upper().replace(" ", "")
-                # Use token_set_ratio for better matching
-                score = fuzz.token_set_ratio(normalized_input, db_name)
-                if score > best_score:
-                    best_score = score
-                    # Generate catalog ID
-                    if dso.common_name.startswith("M") and len(dso.common_name) > 1 and dso.common_name[1:].isdigit():
-                        # Messier: M031 -> M31
-                        catalog_id = f"M{int(dso.common_name[1:])}"
-                    elif dso.caldwell_number:
-                        catalog_id = f"C{dso.caldwell_number}"
-                    else:
-                        catalog_id = f"{dso.catalog_name}{dso.catalog_number}"
-                    best_match = catalog_id
-
-        # Only return if above threshold
-        if best_score >= threshold:
-            confidence = best_score / 100.0
-            return (best_match, confidence)
-
-        return None
+        normalized_input = _normalize_name(target_name)
+        names = self._get_catalog_names()
+
+        # Exact common name (e.g. "M31", "Andromeda Galaxy")
+        exact = names.by_name.get(normalized_input)
+        if exact is not None:
+            return (exact, 1.0)
+
+        # Catalog designation (e.g. "NGC 224", "M031")
+        match = CATALOG_ID_PATTERN.match(normalized_input)
+        if match:
+            catalog_id = f"{match.group(1)}{int(match.group(2))}"
+            if catalog_id in names.ids:
+                return (catalog_id, 1.0)
+
+        # Fall back to the best fuzzy match; token_set_ratio copes with word order and extra words.
+        # Choices were pre-processed when cached, so only the input is processed here.
+        best = process.extractOne(
+            utils.default_process(normalized_input),
+            names.choices,
+            scorer=fuzz.token_set_ratio,
+            processor=None,
+            score_cutoff=FUZZY_MATCH_THRESHOLD,
+        )
+        if best is None:
+            return None
+
+        _, score, index = best
+        return (names.choice_ids[index], score / 100.0)
 
     def _extract_fits_metadata(self, file_path: str) -> Optional[Dict[str, Any]]:
         """
@@ -86,42 +202,57 @@ class FileScannerService:
             Returns None if file cannot be read
         """
         try:
-            with fits.open(file_path) as hdul:
-                header = hdul[0].header
-
-                # Extract metadata with safe access
-                metadata = {
-                    "target_name": header.get("OBJECT"),
-                    "exposure_seconds": None,
-                    "filter_name": header.get("FILTER"),
-                    "temperature_celsius": header.get("CCD-TEMP"),
-                    "gain": header.get("GAIN"),
-                    "observation_date": None,
-                }
-
-                # Convert exposure time to int (from float seconds)
-                if "EXPTIME" in header:
-                    try:
-                        metadata["exposure_seconds"] = int(header["EXPTIME"])
-                    except (ValueError, TypeError):
-                        pass
-
-                # Parse DATE-OBS if present
-                if "DATE-OBS" in header:
-                    try:
-                        # Try to parse ISO format datetime
-                        date_str = header["DATE-OBS"]
-                        # Handle common formats like "2024-12-25T20:30:00"
-                        metadata["observation_date"] = datetime.fromisoformat(date_str)
-                    except (ValueError, TypeError):
-                        pass
-
-                return metadata
+            header = _read_primary_header(file_path)
+
+            # Extract metadata with safe access
+            metadata = {
+                "target_name": header.get("OBJECT"),
+                "exposure_seconds": None,
+                "filter_name": header.get("FILTER"),
+                "temperature_celsius": header.get("CCD-TEMP"),
+                "gain": header.get("GAIN"),
+                "observation_date": None,
+            }
+
+            # Convert exposure time to int (from float seconds)
+            if "EXPTIME" in header:
+                try:
+                    metadata["exposure_seconds"] = int(header["EXPTIME"])
+                except (ValueError, TypeError):
+                    pass
+
+            # Parse DATE-OBS if present
+            if "DATE-OBS" in header:
+                try:
+                    # Try to parse ISO format datetime
+                    date_str = header["DATE-OBS"]
+                    # Handle common formats like "2024-12-25T20:30:00"
+                    metadata["observation_date"] = datetime.fromisoformat(date_str)
+                except (ValueError, TypeError):
+                    pass
+
+            return metadata
 
         except Exception:
             # Return None if file cannot be read
             return None
 
+    def _extract_fits_metadata_batch(self, file_paths: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Extract FITS metadata from several files, reading headers in parallel.
+
+        Args:
+            file_paths: Paths to FITS files
+
+        Returns:
+            Dict mapping each path to its _extract_fits_metadata result
+        """
+        if len(file_paths) <= 1:
+            return {file_path: self._extract_fits_metadata(file_path) for file_path in file_paths}
+
+        with ThreadPoolExecutor(max_workers=FITS_METADATA_WORKERS) as executor:
+            return dict(zip(file_paths, executor.map(self._extract_fits_metadata, file_paths)))
+
     def _calculate_quality_metrics(self, file_path: str) -> Dict[str, Any]:
         """
         Calculate quality metrics for an image file.
@@ -142,6 +273,41 @@ class FileScannerService:
             "star_count": None,
         }
 
+    @staticmethod
+    def _commit_output_files(db: Session, output_files: List[OutputFile]) -> int:
+        """
+        Commit a batch of already-added OutputFile records in one transaction.
+
+        If the batch fails, it is rolled back and each record is retried in its
+        own transaction, so one bad record only skips that file.
+
+        Args:
+            db: Database session the records were added to
+            output_files: Records pending in the session
+
+        Returns:
+            Number of records committed
+        """
+        if not output_files:
+            return 0
+
+        try:
+            db.commit()
+            return len(output_files)
+        except Exception:
+            db.rollback()
+
+        committed = 0
+        for output_file in output_files:
+            try:
+                db.add(output_file)
+                db.commit()
+                committed += 1
+            except Exception:
+                # Skip files that cannot be stored
+                db.rollback()
+        return committed
+
     def scan_files(self, directory: str, db: Session) -> int:
         """
         Scan directory for files and create OutputFile records.
@@ -151,7 +317,7 @@ class FileScannerService:
            - Extract FITS metadata (if FITS)
            - Fuzzy match target name to catalog
            - Calculate quality metrics
-           - Create OutputFile record in database
+           - Create OutputFile record in database (committed every SCAN_COMMIT_BATCH_SIZE files)
         3. Returns count of files processed
 
         Args:
@@ -163,26 +329,23 @@ class FileScannerService:
         """
         settings = get_settings()
         file_count = 0
+        pending: List[OutputFile] = []
 
-        # Walk through directory
-        for root, _dirs, files in os.walk(directory):
-            for filename in files:
-                # Check if file has matching extension
-                file_ext = os.path.splitext(filename)[1].lower()
-                if file_ext not in settings.file_scan_extensions:
-                    continue
-
-                # Get full file path
-                file_path = os.path.join(root, filename)
+        # Walk through directory, one directory's matching files at a time
+        for scan_entries in _iter_scan_entries(directory, settings.file_scan_extensions):
+            # Read this directory's FITS headers up front, in parallel
+            fits_metadata = self._extract_fits_metadata_batch(
+                [entry.path for entry, file_ext in scan_entries if file_ext in FITS_EXTENSIONS]
+            )
 
+            for entry, file_ext in scan_entries:
+                file_path = entry.path
                 try:
                     # Get file size
-                    file_size = os.path.getsize(file_path)
+                    file_size = entry.stat().st_size
 
-                    # Extract FITS metadata if applicable
-                    metadata = None
-                    if file_ext in [".fit", ".fits"]:
-                        metadata = self._extract_fits_metadata(file_path)
+                    # FITS metadata if applicable
+                    metadata = fits_metadata.get(file_path)
 
                     # Determine target name and fuzzy match
                     target_name = None
@@ -216,11 +379,15 @@ class FileScannerService:
                     )
 
                     db.add(output_file)
-                    db.commit()
-                    file_count += 1
+                    pending.append(output_file)
 
                 except Exception:
                     # Skip files that cannot be processed
                     continue
 
+                if len(pending) >= SCAN_COMMIT_BATCH_SIZE:
+                    file_count += self._commit_output_files(db, pending)
+                    pending = []
+
+        file_count += self._commit_output_files(db, pending)
         return file_count
@@ -105,12 +105,9 @@ class PlannerService:
         # Get candidate targets
         t0 = time.time()
         if request.custom_targets:
-            # Use custom target list
-            targets = []
-            for catalog_id in request.custom_targets:
-                target = self.catalog.get_target_by_id(catalog_id)
-                if target:
-                    targets.append(target)
+            # Use custom target list (resolved in one lookup, keeping the requested order)
+            found = self.catalog.get_targets_by_ids(request.custom_targets)
+            targets = [found[catalog_id] for catalog_id in request.custom_targets if catalog_id in found]
 
             if len(targets) == 0:
                 raise ValueError("None of the custom targets were found in catalog")
@@ -116,29 +116,15 @@ class SchedulerService:
                 duration = max_duration
 
             # Calculate positions and field rotation
-            start_alt, start_az = self.ephemeris.calculate_position(best_target, location, current_time)
             end_time = current_time + duration
-            end_alt, end_az = self.ephemeris.calculate_position(best_target, location, end_time)
+            start_alt, start_az, end_alt, end_az, altitude_points = self._sample_positions(
+                best_target, location, current_time, end_time
+            )
 
             # Field rotation rate at midpoint
             mid_time = current_time + (duration / 2)
             rotation_rate = self.ephemeris.calculate_field_rotation_rate(best_target, location, mid_time)
 
-            # Calculate altitude points at 15-minute intervals
-            altitude_points = []
-            sample_time = current_time
-            sample_interval = timedelta(minutes=15)
-
-            while sample_time <= end_time:
-                alt, _ = self.ephemeris.calculate_position(best_target, location, sample_time)
-                altitude_points.append((sample_time, alt))
-                sample_time += sample_interval
-
-            # Ensure end point is included
-            if altitude_points and altitude_points[-1][0] != end_time:
-                alt, _ = self.ephemeris.calculate_position(best_target, location, end_time)
-                altitude_points.append((end_time, alt))
-
             # Debug: Print altitude range
             if altitude_points:
                 alts = [alt for _, alt in altitude_points]
@@ -295,6 +281,38 @@ class SchedulerService:
 
         return low - start_time
 
+    def _sample_positions(
+        self, target: DSOTarget, location: Location, start_time: datetime, end_time: datetime
+    ) -> Tuple[float, float, float, float, List[Tuple[datetime, float]]]:
+        """
+        Calculate start/end positions and altitude points for a scheduled target.
+
+        Altitude is sampled every 15 minutes from start_time, plus end_time itself,
+        with every sample calculated in one vectorized ephemeris call.
+
+        Returns:
+            Tuple of (start_alt, start_az, end_alt, end_az, altitude_points)
+        """
+        sample_times = []
+        sample_time = start_time
+        sample_interval = timedelta(minutes=15)
+
+        while sample_time <= end_time:
+            sample_times.append(sample_time)
+            sample_time += sample_interval
+
+        # Ensure end point is included
+        if not sample_times or sample_times[-1] != end_time:
+            sample_times.append(end_time)
+
+        positions = self.ephemeris.calculate_positions_over_time([target], location, sample_times)[0]
+
+        start_alt, start_az = positions[0].tolist()
+        end_alt, end_az = positions[-1].tolist()
+        altitude_points = list(zip(sample_times, positions[:, 0].tolist()))
+
+        return start_alt, start_az, end_alt, end_az, altitude_points
+
     def _score_target(
         self,
         target: DSOTarget,
@@ -602,28 +620,15 @@ class SchedulerService:
                 target, duration, score_data, alternatives = best_candidate
 
                 # Calculate positions and field rotation
-                start_alt, start_az = self.ephemeris.calculate_position(target, location, gap.start_time)
                 end_time = gap.start_time + duration
-                end_alt, end_az = self.ephemeris.calculate_position(target, location, end_time)
+                start_alt, start_az, end_alt, end_az, altitude_points = self._sample_positions(
+                    target, location, gap.start_time, end_time
+                )
 
                 # Field rotation rate at midpoint
                 mid_time = gap.start_time + (duration / 2)
                 rotation_rate = self.ephemeris.calculate_field_rotation_rate(target, location, mid_time)
 
-                # Calculate altitude points
-                altitude_points = []
-                sample_time = gap.start_time
-                sample_interval = timedelta(minutes=15)
-
-                while sample_time <= end_time:
-                    alt, _ = self.ephemeris.calculate_position(target, location, sample_time)
-                    altitude_points.append((sample_time, alt))
-                    sample_time += sample_interval
-
-                if altitude_points and altitude_points[-1][0] != end_time:
-                    alt, _ = self.ephemeris.calculate_position(target, location, end_time)
-                    altitude_points.append((end_time, alt))
-
                 # Calculate exposure settings
                 recommended_exposure, recommended_frames = self._calculate_exposure_settings(target, duration)
 
@@ -437,32 +437,20 @@ def print_statistics(conn: sqlite3.Connection) -> None:
     print("="*50)
 
 
-def main():
-    """Main import function."""
-    import argparse
-
-    parser = argparse.ArgumentParser(description='Import OpenNGC catalog to SQLite')
-    parser.add_argument(
-        '--database',
-        default='backend/data/catalogs.db',
-        help='Path to SQLite database file (default: backend/data/catalogs.db)'
-    )
-    parser.add_argument(
-        '--limit',
-        type=int,
-        default=None,
-        help='Limit number of objects to import (for testing)'
-    )
-    parser.add_argument(
-        '--rebuild',
-        action='store_true',
-        help='Drop existing tables and rebuild from scratch'
-    )
-
-    args = parser.parse_args()
-
+def build_catalog(database: str, limit: Optional[int] = None, rebuild: bool = False) -> None:
+    """
+    Build (or extend) the SQLite catalog database.
+
+    Importable so callers can build the catalog in-process instead of
+    launching this script in a new interpreter.
+
+    Args:
+        database: Path to SQLite database file
+        limit: Limit number of objects to import per catalog (for testing)
+        rebuild: Drop existing tables and rebuild from scratch
+    """
     # Ensure data directory exists
-    db_path = Path(args.database)
+    db_path = Path(database)
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     print(f"📚 OpenNGC Catalog Import")
@@ -472,7 +460,7 @@ def main():
     # Connect to database
     conn = sqlite3.connect(str(db_path))
 
-    if args.rebuild:
+    if rebuild:
         print("⚠️  Rebuilding database (dropping existing tables)...")
         cursor = conn.cursor()
         cursor.execute("DROP TABLE IF EXISTS dso_catalog")
@@ -486,8 +474,8 @@ def main():
     populate_constellation_names(conn)
 
     # Import catalogs
-    ngc_count = import_ngc_objects(conn, limit=args.limit)
-    ic_count = import_ic_objects(conn, limit=args.limit)
+    ngc_count = import_ngc_objects(conn, limit=limit)
+    ic_count = import_ic_objects(conn, limit=limit)
 
     # Print statistics
     print_statistics(conn)
@@ -501,5 +489,32 @@ def main():
     print(f"   Database: {db_path}")
 
 
+def main():
+    """Main import function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Import OpenNGC catalog to SQLite')
+    parser.add_argument(
+        '--database',
+        default='backend/data/catalogs.db',
+        help='Path to SQLite database file (default: backend/data/catalogs.db)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=None,
+        help='Limit number of objects to import (for testing)'
+    )
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Drop existing tables and rebuild from scratch'
+    )
+
+    args = parser.parse_args()
+
+    build_catalog(args.database, limit=args.limit, rebuild=args.rebuild)
+
+
 if __name__ == '__main__':
     main()
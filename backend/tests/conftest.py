@@ -4,6 +4,7 @@ Database fixtures are lazy-loaded to avoid connection failures when running
 non-integration tests (e.g., on macOS CI without database services).
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -13,6 +14,10 @@ import pytest
 app_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(app_dir))
 
+# Don't build the catalog index from the real database at app startup;
+# tests load it from their own session (read before settings are cached)
+os.environ.setdefault("PRELOAD_CATALOG_INDEX", "false")
+
 # Lazy-loaded database components (only initialized when needed)
 _test_engine = None
 _TestSessionLocal = None
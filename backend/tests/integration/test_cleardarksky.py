@@ -6,11 +6,16 @@ from unittest.mock import Mock, patch
 import pytest
 
 from app.services.cleardarksky_service import (
+    CHART_CACHE_SIZE,
     ClearDarkSkyForecast,
     ClearDarkSkyService,
     CloudCover,
     Seeing,
     Transparency,
+    _forecast_cache,
+    _nearest_chart_quantized,
+    astronomy_scores,
+    close_http_client,
 )
 
 
@@ -86,6 +91,30 @@ class TestClearDarkSkyForecast:
         score_poor = forecast_poor.astronomy_score()
         assert score_poor <= 0.3  # Very poor
 
+    def test_astronomy_scores_batch(self):
+        """Test vectorized scoring matches per-forecast scores."""
+        forecasts = [
+            ClearDarkSkyForecast(
+                time=datetime(2025, 11, 20, hour, 0),
+                cloud_cover=cloud_cover,
+                transparency=transparency,
+                seeing=seeing,
+                temperature_c=10.0,
+                wind_speed_kmh=10.0,
+            )
+            for hour, cloud_cover, transparency, seeing in [
+                (20, CloudCover.CLEAR, Transparency.EXCELLENT, Seeing.EXCELLENT),
+                (21, CloudCover.PARTLY_CLOUDY, Transparency.AVERAGE, Seeing.GOOD),
+                (22, CloudCover.OVERCAST, Transparency.POOR, Seeing.POOR),
+            ]
+        ]
+
+        scores = astronomy_scores(forecasts)
+
+        assert scores == pytest.approx([f.astronomy_score() for f in forecasts])
+        assert scores[0] == pytest.approx(0.98)
+        assert len(astronomy_scores([])) == 0
+
 
 class TestClearDarkSkyService:
     """Test ClearDarkSkyService."""
@@ -93,7 +122,9 @@ class TestClearDarkSkyService:
     @pytest.fixture
     def service(self):
         """Create service instance."""
-        return ClearDarkSkyService()
+        _forecast_cache.clear()
+        yield ClearDarkSkyService()
+        _forecast_cache.clear()
 
     def test_find_nearest_chart(self, service):
         """Test finding nearest ClearDarkSky chart."""
@@ -105,27 +136,85 @@ class TestClearDarkSkyService:
     def test_find_nearest_chart_cache(self, service):
         """Test chart lookup caching."""
         chart_id_1 = service.find_nearest_chart(latitude=40.7, longitude=-74.0)
-        chart_id_2 = service.find_nearest_chart(latitude=40.7, longitude=-74.0)
+        hits = _nearest_chart_quantized.cache_info().hits
+        chart_id_2 = ClearDarkSkyService().find_nearest_chart(latitude=40.701, longitude=-74.0)
         assert chart_id_1 == chart_id_2  # Should be cached
+        assert _nearest_chart_quantized.cache_info().hits == hits + 1
+        assert _nearest_chart_quantized.cache_info().maxsize == CHART_CACHE_SIZE
+
+    def test_find_nearest_chart_batch(self, service):
+        """Test batched chart lookup matches single lookups and rejects distant locations."""
+        chart_ids = service.find_nearest_chart_batch([34.5, 0.0, 41.0], [-118.0, 0.0, -88.0])
+        assert chart_ids == ["LA", None, "Chicago"]
+        assert service.find_nearest_chart(latitude=34.5, longitude=-118.0) == "LA"
 
-    @patch("requests.get")
-    def test_fetch_forecast_success(self, mock_get, service):
+    def test_fetch_forecast_success(self, service):
         """Test successful forecast fetch."""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.content = b"<mock chart data>"
-        mock_get.return_value = mock_response
+        mock_response.headers = {}
+
+        with patch.object(service._client, "get", Mock(return_value=mock_response)) as mock_get:
+            forecasts = service.fetch_forecast(chart_id="test_chart")
 
-        forecasts = service.fetch_forecast(chart_id="test_chart")
         assert isinstance(forecasts, list)
+        mock_get.assert_called_once_with("/c/test_chartcsk.gif", headers={})
 
-    @patch("requests.get")
-    def test_fetch_forecast_api_error(self, mock_get, service):
+    def test_fetch_forecast_api_error(self, service):
         """Test handling API errors."""
-        mock_get.side_effect = Exception("Network error")
+        with patch.object(service._client, "get", Mock(side_effect=Exception("Network error"))):
+            forecasts = service.fetch_forecast(chart_id="test_chart")
 
-        forecasts = service.fetch_forecast(chart_id="test_chart")
         assert forecasts == []  # Returns empty list on error
+        assert "test_chart" not in _forecast_cache
+
+    def test_fetch_forecast_cached(self, service):
+        """Test parsed forecasts are reused until expiry, then revalidated with the chart's ETag."""
+        ok_response = Mock(status_code=200, content=b"<mock chart data>", headers={"etag": '"abc"'})
+        not_modified = Mock(status_code=304, headers={})
+
+        with patch.object(service._client, "get", Mock(return_value=ok_response)) as mock_get:
+            first = service.fetch_forecast(chart_id="test_chart")
+            second = ClearDarkSkyService().fetch_forecast(chart_id="test_chart")
+        assert second is first
+        mock_get.assert_called_once()
+
+        # Expire the entry; a 304 keeps the parsed forecasts without re-parsing
+        forecasts, _, validators = _forecast_cache["test_chart"]
+        _forecast_cache["test_chart"] = (forecasts, 0.0, validators)
+        with (
+            patch.object(service._client, "get", Mock(return_value=not_modified)) as mock_get,
+            patch.object(service, "_parse_chart_data") as mock_parse,
+        ):
+            third = service.fetch_forecast(chart_id="test_chart")
+        assert third is first
+        mock_get.assert_called_once_with("/c/test_chartcsk.gif", headers={"If-None-Match": '"abc"'})
+        mock_parse.assert_not_called()
+
+    def test_fetch_forecast_expired_falls_back_on_error(self, service):
+        """Test a failed revalidation returns the last good forecast and keeps it cached."""
+        ok_response = Mock(status_code=200, content=b"<mock chart data>", headers={"etag": '"abc"'})
+        with patch.object(service._client, "get", Mock(return_value=ok_response)):
+            first = service.fetch_forecast(chart_id="test_chart")
+
+        forecasts, _, validators = _forecast_cache["test_chart"]
+        _forecast_cache["test_chart"] = (forecasts, 0.0, validators)
+        with patch.object(service._client, "get", Mock(side_effect=Exception("Network error"))):
+            stale = service.fetch_forecast(chart_id="test_chart")
+
+        assert stale is first
+        assert _forecast_cache["test_chart"][0] is first
+
+    def test_http_client_shared_until_closed(self, service):
+        """Test that service instances share one HTTP client, replaced after it is closed."""
+        client = service._client
+        assert ClearDarkSkyService()._client is client
+
+        close_http_client()
+        assert client.is_closed
+        assert service._client is not client
+        close_http_client()
 
     def test_parse_chart_data(self, service):
         """Test parsing chart image data."""
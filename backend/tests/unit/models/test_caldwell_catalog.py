@@ -2,7 +2,7 @@
 
 import pytest
 
-from app.services.caldwell_catalog import CaldwellCatalog, CaldwellObject
+from app.services.caldwell_catalog import CaldwellCatalog, CaldwellObject, get_caldwell_catalog
 
 
 class TestCaldwellObject:
@@ -50,6 +50,11 @@ class TestCaldwellCatalog:
         """Create catalog instance."""
         return CaldwellCatalog()
 
+    def test_get_caldwell_catalog_is_shared(self):
+        """Test the factory returns one cached catalog instance."""
+        assert get_caldwell_catalog() is get_caldwell_catalog()
+        assert len(get_caldwell_catalog().objects) == 109
+
     def test_catalog_initialization(self, catalog):
         """Test catalog loads objects."""
         assert len(catalog.objects) == 109
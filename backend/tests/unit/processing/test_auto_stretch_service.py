@@ -56,6 +56,16 @@ class TestArcsinhStretch:
         # For mid-values, higher 'a' produces more stretched (higher) output
         assert result_high[1] > result_low[1]
 
+    def test_arcsinh_stretch_in_place(self):
+        """Stretching into out=data should match the allocating call and return the same buffer."""
+        data = np.linspace(0, 1, 11)
+        expected = self.service.arcsinh_stretch(data, a=10)
+
+        result = self.service.arcsinh_stretch(data, a=10, out=data)
+
+        assert result is data
+        np.testing.assert_array_equal(result, expected)
+
 
 class TestDetectStretchParams:
     """Tests for automatic parameter detection."""
@@ -89,6 +99,15 @@ class TestDetectStretchParams:
         assert galaxy_params.black_pct == 0.5
         assert galaxy_params.white_pct == 99.95
 
+    def test_detect_params_large_galaxy_like(self):
+        """Subsampled CV detection should still classify large sparse images as galaxy-like."""
+        data = np.zeros((1000, 1000, 3), dtype=np.float64)
+        data[480:520, 480:520, :] = 10000
+
+        params = self.service.detect_stretch_params(data)
+
+        assert params.stretch_factor == 20
+
     def test_detect_params_returns_correct_type(self):
         """Should return StretchParams dataclass."""
         data = np.random.rand(50, 50, 3) * 1000
@@ -200,6 +219,19 @@ class TestSaveOutputs:
             extensions = {f.suffix for f in output_files}
             assert extensions == {".jpg", ".png", ".tiff"}
 
+    def test_save_without_optimize(self):
+        """Fast (non-optimized) encoding should still produce valid images."""
+        data = np.random.rand(100, 100, 3)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base_path = Path(tmpdir) / "test"
+            output_files = self.service.save_outputs(data, base_path, formats=["jpg", "png"], optimize=False)
+
+            assert len(output_files) == 2
+            for output_file in output_files:
+                img = Image.open(output_file)
+                assert img.size == (100, 100)
+
     def test_save_creates_astroplanner_suffix(self):
         """Output filename should have _astroplanner suffix."""
         data = np.random.rand(100, 100, 3)
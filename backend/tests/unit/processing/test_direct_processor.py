@@ -0,0 +1,285 @@
+"""Tests for direct FITS processing."""
+
+import os
+import time
+
+import numpy as np
+import pytest
+import tifffile
+from astropy.io import fits
+from PIL import Image
+
+from app.services import direct_processor
+from app.services.direct_processor import (
+    STRETCH_CLIP_PERCENTILES,
+    STRETCH_HISTOGRAM_BINS,
+    DirectProcessor,
+    _fits_cache_file,
+    _histogram_percentiles,
+)
+
+
+class TestHistogramPercentiles:
+    """Tests for histogram-based clip point estimation."""
+
+    def test_matches_numpy_percentile(self):
+        """Percentiles should be within one histogram bin of the order statistic np.percentile picks."""
+        rng = np.random.default_rng(0)
+        rows = rng.gamma(2, 300, (3, 100_000)).astype(np.float32)
+        rows[0, 0] = 65535  # Hot pixel widening the first row's range
+
+        result = _histogram_percentiles(rows, STRETCH_CLIP_PERCENTILES)
+
+        expected = np.percentile(rows, STRETCH_CLIP_PERCENTILES, axis=1, method="lower").T
+        bin_width = np.ptp(rows, axis=1, keepdims=True) / (STRETCH_HISTOGRAM_BINS - 1)
+        assert result.shape == (3, 2)
+        assert np.all(np.abs(result - expected) <= bin_width)
+
+    @pytest.mark.parametrize("block_size", [7, 1 << 20])
+    def test_ignores_non_finite_values(self, monkeypatch, block_size):
+        """NaN and +/-inf pixels should be ignored, matching np.nanpercentile over the finite values."""
+        monkeypatch.setattr(direct_processor, "STRETCH_BLOCK_SIZE", block_size)
+        rng = np.random.default_rng(6)
+        rows = rng.gamma(2, 300, (2, 1000)).astype(np.float32)
+        rows[0, [3, 500]] = np.nan
+        rows[0, 10] = np.inf
+        rows[1, 20] = -np.inf
+
+        result = _histogram_percentiles(rows, STRETCH_CLIP_PERCENTILES)
+
+        finite = [row[np.isfinite(row)] for row in rows]
+        expected = np.array([np.percentile(row, STRETCH_CLIP_PERCENTILES, method="lower") for row in finite])
+        bin_width = np.array([[np.ptp(row)] for row in finite]) / (STRETCH_HISTOGRAM_BINS - 1)
+        assert np.all(np.abs(result - expected) <= bin_width)
+
+    def test_row_without_finite_values(self):
+        """A row with only NaN and inf values should give NaN without affecting other rows."""
+        rows = np.array([[np.nan, np.inf, -np.inf], [1.0, 2.0, 3.0]], dtype=np.float32)
+
+        result = _histogram_percentiles(rows, (0.0, 100.0))
+
+        assert np.all(np.isnan(result[0]))
+        np.testing.assert_allclose(result[1], [1.0, 3.0])
+
+    def test_flat_row(self):
+        """A constant row should return its value for every percentile."""
+        result = _histogram_percentiles(np.full((1, 100), 7.0, dtype=np.float32), (0.1, 99.9))
+        assert np.allclose(result, 7.0)
+
+
+class TestHistogramStretch:
+    """Tests for DirectProcessor.histogram_stretch."""
+
+    def setup_method(self):
+        self.processor = DirectProcessor()
+
+    def test_stretch_rgb_range_and_shape(self):
+        """Stretched channels should be normalized to 0-1 independently."""
+        rng = np.random.default_rng(1)
+        data = np.stack([rng.normal(loc, 50, (64, 64)) for loc in (500, 1500, 3000)]).astype(np.float32)
+
+        result = self.processor.histogram_stretch(data, midtones=0.3)
+
+        assert result.shape == data.shape
+        assert result.dtype == np.float32
+        for channel in result:
+            assert channel.min() == 0.0
+            assert channel.max() == 1.0
+
+    def test_midtone_transfer(self):
+        """The midtone transfer function should follow its formula and keep black and white fixed."""
+        channel = np.linspace(0, 1, 11, dtype=np.float32)
+
+        result = self.processor._stretch_channel(channel, 0.0, 1.0, "midtone", 0.2)
+
+        x = channel.astype(np.float64)
+        expected = ((0.2 - 1) * x) / ((2 * 0.2 - 1) * x - 0.2)
+        np.testing.assert_allclose(result, expected, rtol=1e-6)
+        assert result[0] == 0.0
+        assert result[-1] == 1.0
+
+    @pytest.mark.parametrize("block_size", [7, 64])
+    def test_stretch_in_blocks_matches_single_block(self, monkeypatch, block_size):
+        """Blocked histogram and midtone passes should match processing each channel at once."""
+        rng = np.random.default_rng(3)
+        data = rng.gamma(2, 300, (3, 20, 30)).astype(np.float32)
+        expected = self.processor.histogram_stretch(data, midtones=0.3)
+
+        monkeypatch.setattr(direct_processor, "STRETCH_BLOCK_SIZE", block_size)
+        result = self.processor.histogram_stretch(data, midtones=0.3)
+
+        np.testing.assert_array_equal(result, expected)
+
+    def test_stretch_samples_large_channels(self, monkeypatch):
+        """Sampled clip points of a Bayer-like mosaic should stay close to the exact ones."""
+        rng = np.random.default_rng(4)
+        data = rng.normal(1000, 20, (200, 300)).astype(np.float32)
+        data[::2, ::2] += 500  # One CFA color much brighter
+        expected = self.processor.histogram_stretch(data, midtones=0.3)
+
+        monkeypatch.setattr(direct_processor, "STRETCH_PERCENTILE_SAMPLES", 30_000)  # Step 2 -> 3
+        result = self.processor.histogram_stretch(data, midtones=0.3)
+
+        np.testing.assert_allclose(result, expected, atol=0.02)
+
+    def test_stretch_frame_with_non_finite_pixels(self):
+        """NaN and inf pixels shouldn't shift the clip points of the finite pixels."""
+        rng = np.random.default_rng(7)
+        data = rng.gamma(2, 300, (32, 32)).astype(np.float32)
+        expected = self.processor.histogram_stretch(data, midtones=0.3)
+
+        data[0, 0], data[1, 1], data[2, 2] = np.nan, np.inf, -np.inf
+        result = self.processor.histogram_stretch(data, midtones=0.3)
+
+        finite = np.isfinite(data)
+        np.testing.assert_allclose(result[finite], expected[finite], atol=1e-3)
+        assert np.all((result[finite] >= 0.0) & (result[finite] <= 1.0))
+
+    def test_stretch_flat_channel(self):
+        """A flat channel should stretch to black without dividing by zero."""
+        result = self.processor.histogram_stretch(np.ones((8, 8), dtype=np.float32))
+        assert np.all(result == 0.0)
+
+
+class TestLoadFits:
+    """Tests for DirectProcessor._load_fits."""
+
+    def test_load_unsigned_16bit(self, tmp_path):
+        """Unsigned 16-bit data (stored with BZERO) should load as exact float32 values."""
+        data = np.array([[0, 1, 32768], [40000, 65534, 65535]], dtype=np.uint16)
+        path = tmp_path / "frame.fit"
+        fits.PrimaryHDU(data).writeto(path)
+
+        result = DirectProcessor()._load_fits(path)
+
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, data.astype(np.float32))
+
+    def test_load_scaled_with_blank(self, tmp_path):
+        """BSCALE/BZERO should be applied and BLANK pixels loaded as NaN."""
+        hdu = fits.PrimaryHDU(np.array([[-32768, 0], [2, 4]], dtype=np.int16))
+        hdu.header["BSCALE"] = 0.5
+        hdu.header["BZERO"] = 10.0
+        hdu.header["BLANK"] = -32768
+        path = tmp_path / "scaled.fit"
+        hdu.writeto(path)
+
+        result = DirectProcessor()._load_fits(path)
+
+        assert np.isnan(result[0, 0])
+        np.testing.assert_array_equal(result[0, 1:], [10.0])
+        np.testing.assert_array_equal(result[1], [11.0, 12.0])
+
+    def test_load_uncached_by_default(self, tmp_path):
+        """Without a cache directory every load decodes the FITS file into a writable array."""
+        path = tmp_path / "frame.fit"
+        fits.PrimaryHDU(np.zeros((2, 2), dtype=np.uint16)).writeto(path)
+
+        result = DirectProcessor(cache_dir="")._load_fits(path)
+
+        assert not isinstance(result, np.memmap)
+        assert result.flags.writeable
+
+    def test_load_cached_until_file_changes(self, tmp_path):
+        """A cached frame is memory-mapped read-only; a rewritten file is decoded again and replaces it."""
+        cache_dir = tmp_path / "cache"
+        path = tmp_path / "frame.fit"
+        fits.PrimaryHDU(np.arange(4, dtype=np.uint16).reshape(2, 2)).writeto(path)
+        processor = DirectProcessor(cache_dir=str(cache_dir))
+
+        first = processor._load_fits(path)
+        cached = processor._load_fits(path)
+        assert isinstance(cached, np.memmap)
+        assert not cached.flags.writeable
+        np.testing.assert_array_equal(cached, first)
+
+        fits.PrimaryHDU(np.ones((2, 3), dtype=np.uint16)).writeto(path, overwrite=True)
+        os.utime(path, ns=(0, 12345))
+        np.testing.assert_array_equal(processor._load_fits(path), np.ones((2, 3), dtype=np.float32))
+        assert len(list(cache_dir.glob("*.npy"))) == 1
+
+    def test_cache_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        """Frames beyond the size limit are evicted least recently used first."""
+        cache_dir = tmp_path / "cache"
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.fit"
+            fits.PrimaryHDU(np.zeros((16, 16), dtype=np.uint16)).writeto(path)
+            paths.append(path)
+        processor = DirectProcessor(cache_dir=str(cache_dir))
+        # Room for two 16x16 float32 frames (1 KB each plus the .npy header)
+        monkeypatch.setattr(processor, "cache_max_bytes", 2 * 1200)
+
+        processor._load_fits(paths[0])
+        processor._load_fits(paths[1])
+        time.sleep(0.01)
+        processor._load_fits(paths[0])  # Hit: a is now more recent than b
+        time.sleep(0.01)
+        processor._load_fits(paths[2])
+
+        cached = {path.name for path in paths if _fits_cache_file(cache_dir, path, path.stat()).exists()}
+        assert cached == {"a.fit", "c.fit"}
+
+
+class TestExportImage:
+    """Tests for DirectProcessor.export_image."""
+
+    def test_export_rgb_planes_to_png(self, tmp_path):
+        """CxHxW channels should be written as the matching RGB pixels."""
+        rng = np.random.default_rng(2)
+        data = rng.random((3, 5, 7), dtype=np.float32)
+
+        (output_file,) = DirectProcessor().export_image(data, tmp_path, "rgb", format="png")
+
+        expected = np.transpose((data * 255).astype(np.uint8), (1, 2, 0))
+        np.testing.assert_array_equal(np.asarray(Image.open(output_file)), expected)
+
+    def test_export_grayscale_16bit(self, tmp_path):
+        """Single-channel 16-bit export should keep the full range."""
+        data = np.array([[0.0, 0.5], [0.25, 1.0]], dtype=np.float32)
+
+        (output_file,) = DirectProcessor().export_image(data, tmp_path, "gray", format="png", bit_depth=16)
+
+        np.testing.assert_array_equal(np.asarray(Image.open(output_file)), (data * 65535).astype(np.uint16))
+
+    @pytest.mark.parametrize("compression", ["none", "raw", "tiff_raw", "tiff_deflate", "tiff_lzw", "group4"])
+    def test_export_rgb_16bit_tiff(self, tmp_path, compression):
+        """16-bit RGB TIFF export should keep full 16-bit channels, whatever the compression."""
+        rng = np.random.default_rng(5)
+        data = rng.random((3, 5, 7), dtype=np.float32)
+
+        (output_file,) = DirectProcessor().export_image(
+            data, tmp_path, "rgb16", format="tiff", bit_depth=16, compression=compression
+        )
+
+        expected = np.transpose((data * 65535).astype(np.uint16), (1, 2, 0))
+        np.testing.assert_array_equal(tifffile.imread(output_file), expected)
+
+    def test_export_rgb_16bit_png_falls_back_to_8bit(self, tmp_path):
+        """Formats without 16-bit RGB support should get the top 8 bits."""
+        data = np.full((3, 2, 2), 0.5, dtype=np.float32)
+
+        (output_file,) = DirectProcessor().export_image(data, tmp_path, "rgb", format="png", bit_depth=16)
+
+        image = Image.open(output_file)
+        assert image.mode == "RGB"
+        assert np.all(np.asarray(image) == int(0.5 * 65535) >> 8)
+
+
+class TestProcessFits:
+    """Tests for DirectProcessor.process_fits."""
+
+    def test_logs_one_summary_at_info(self, tmp_path, caplog, monkeypatch):
+        """A processed file should produce a single INFO record, with step details at DEBUG."""
+        # logging.config.fileConfig (run by Alembic migrations in other tests) disables existing loggers
+        monkeypatch.setattr(direct_processor.logger, "disabled", False)
+        path = tmp_path / "frame.fit"
+        fits.PrimaryHDU(np.arange(64, dtype=np.uint16).reshape(8, 8)).writeto(path)
+        steps = [{"step": "histogram_stretch", "params": {}}, {"step": "export", "params": {"format": "png"}}]
+
+        with caplog.at_level("INFO", logger=direct_processor.__name__):
+            (output_file,) = DirectProcessor().process_fits(path, tmp_path, steps)
+
+        assert output_file.exists()
+        assert len(caplog.records) == 1
+        assert str(output_file) in caplog.records[0].getMessage()
@@ -78,3 +78,15 @@ def test_update_suggested_status(override_get_db, sample_output_files):
     # With 30 seconds total (0.008 hours), should not suggest any status
     # (below the 1.0 hour threshold for "needs_more_data")
     assert capture.suggested_status is None
+
+
+def test_update_all_capture_histories(override_get_db, sample_output_files):
+    """Test batch update writes histories for every target in one transaction."""
+    service = CaptureStatsService(override_get_db)
+
+    count = service.update_all_capture_histories()
+
+    assert count == 1
+    capture = override_get_db.query(CaptureHistory).filter(CaptureHistory.catalog_id == "M31").first()
+    assert capture is not None
+    assert capture.total_frames == 3
@@ -85,8 +85,9 @@ class TestCatalogServiceComprehensive:
         assert service.get_target_by_id("X123") is None
         assert service.get_target_by_id("") is None
         assert service.get_target_by_id("M") is None
-        # Note: "NGC" and "IC" without numbers cause ValueError in current implementation
-        # This is a known bug but keeping test simple
+        assert service.get_target_by_id("NGC") is None
+        assert service.get_target_by_id("IC") is None
+        assert service.get_target_by_id("NGC224A") is None
 
     def test_filter_targets_by_magnitude(self, override_get_db):
         """Test filtering by magnitude range."""
@@ -165,6 +166,34 @@ class TestCatalogServiceComprehensive:
         assert all(t.object_type == "galaxy" for t in bright_galaxies)
         assert all(t.magnitude <= 12.0 for t in bright_galaxies if t.magnitude < 99)
 
+    def test_filter_targets_by_catalog(self, override_get_db):
+        """Test restricting results to a single catalog."""
+
+        service = CatalogService(override_get_db)
+
+        messier = service.filter_targets(catalog="M", limit=50)
+        assert all(t.catalog_id.startswith("M") for t in messier)
+
+        caldwell = service.filter_targets(catalog="C", limit=50)
+        assert all(t.catalog_id.startswith("C") for t in caldwell)
+
+        # Messier and Caldwell designations take precedence in catalog_id, so NGC/IC
+        # membership is checked against the catalog rows themselves
+        def catalog_names(targets):
+            ids = [t.catalog_id for t in targets]
+            rows = override_get_db.query(DSOCatalog.catalog_name).filter(DSOCatalog.catalog_id.in_(ids))
+            return {row.catalog_name for row in rows}
+
+        ic = service.filter_targets(catalog="IC", limit=50)
+        assert ic
+        assert catalog_names(ic) == {"IC"}
+
+        ngc = service.filter_targets(catalog="NGC", limit=50)
+        assert ngc
+        assert catalog_names(ngc) == {"NGC"}
+
+        assert service.filter_targets(catalog="XYZ", limit=50) == []
+
     def test_get_caldwell_targets(self, override_get_db):
         """Test retrieving Caldwell catalog objects."""
 
@@ -6,13 +6,26 @@ They are marked as integration tests and skipped on macOS CI.
 
 from datetime import datetime
 
+import numpy as np
 import pytest
+from astropy import units as u
+from astropy.coordinates import SkyCoord
 
 # Mark all tests in this file as integration tests
 pytestmark = pytest.mark.integration
 
 from app.models import CometTarget, Location, OrbitalElements
-from app.services.comet_service import CometService
+from app.services.comet_service import (
+    EPHEMERIS_JD_DECIMALS,
+    CometService,
+    _altaz_frame,
+    _compute_ephemeris_batch,
+    _compute_ephemeris_scalar,
+    _horizon_coordinates,
+    _icrs_to_horizon,
+    _orbital_element_arrays,
+    _solve_kepler,
+)
 
 
 @pytest.fixture
@@ -62,6 +75,17 @@ def test_add_comet(comet_service, test_comet, override_get_db):
     assert comet_id > 0
 
 
+def test_add_comets(comet_service, test_comet, override_get_db):
+    """Test adding several comets in one batch."""
+    second = test_comet.model_copy(update={"designation": "C/2023 A3", "name": "Tsuchinshan-ATLAS"})
+
+    comet_ids = comet_service.add_comets([test_comet, second])
+
+    assert len(comet_ids) == 2
+    assert comet_service.get_comet_by_designation("C/2023 A3").name == "Tsuchinshan-ATLAS"
+    assert comet_service.add_comets([]) == []
+
+
 def test_get_comet_by_designation(comet_service, test_comet, override_get_db):
     """Test retrieving a comet by designation."""
     # Add comet first
@@ -100,6 +124,83 @@ def test_compute_ephemeris(comet_service, test_comet):
     assert ephemeris.magnitude is not None
 
 
+def test_compute_ephemeris_batch_matches_scalar(test_comet):
+    """Test the batched solver matches per-comet ephemerides and yields NaN for unsolvable orbits."""
+
+    def with_eccentricity(designation, eccentricity):
+        return test_comet.model_copy(
+            update={
+                "designation": designation,
+                "orbital_elements": test_comet.orbital_elements.model_copy(update={"eccentricity": eccentricity}),
+            }
+        )
+
+    comets = [test_comet, with_eccentricity("C/2019 Q4", 3.36), with_eccentricity("C/2017 U1", 1.0)]
+    service = CometService(db=None)
+    time_utc = datetime(2020, 7, 15, 0, 0, 0)
+    jd = 2459045.5
+
+    batch = _compute_ephemeris_batch(_orbital_element_arrays(comets), jd)
+
+    for position, comet in enumerate(comets[:2]):
+        scalar = service.compute_ephemeris(comet, time_utc)
+        assert batch["ra_hours"][position] == pytest.approx(scalar.ra_hours)
+        assert batch["dec_degrees"][position] == pytest.approx(scalar.dec_degrees)
+        assert batch["helio_distance_au"][position] == pytest.approx(scalar.helio_distance_au)
+        assert batch["magnitude"][position] == pytest.approx(scalar.magnitude)
+    assert np.isnan(batch["ra_hours"][2])
+    assert np.isnan(service.compute_ephemeris(comets[2], time_utc).ra_hours)
+
+
+def test_compute_ephemerides_matches_single(test_comet):
+    """Test computing a time grid at once matches per-time ephemerides."""
+    comet_service = CometService(db=None)
+    times = [datetime(2020, 7, 15, hour, 0, 0) for hour in range(0, 24, 6)]
+
+    ephemerides = comet_service.compute_ephemerides(test_comet, times)
+
+    assert [eph.date_utc for eph in ephemerides] == times
+    for ephemeris, time_utc in zip(ephemerides, times):
+        single = comet_service.compute_ephemeris(test_comet, time_utc)
+        assert ephemeris.date_jd == pytest.approx(single.date_jd)
+        assert ephemeris.ra_hours == pytest.approx(single.ra_hours)
+        assert ephemeris.dec_degrees == pytest.approx(single.dec_degrees)
+        assert ephemeris.magnitude == pytest.approx(single.magnitude)
+    assert comet_service.compute_ephemerides(test_comet, []) == []
+
+
+def test_compute_ephemeris_cached(test_comet):
+    """Test repeated queries for the same orbit within seconds reuse the cached solution."""
+    comet_service = CometService(db=None)
+    first = comet_service.compute_ephemeris(test_comet, datetime(2020, 7, 15, 0, 0, 0))
+    hits = _compute_ephemeris_scalar.cache_info().hits
+
+    second = comet_service.compute_ephemeris(test_comet, datetime(2020, 7, 15, 0, 0, 2))
+
+    assert _compute_ephemeris_scalar.cache_info().hits == hits + 1
+    assert second.ra_hours == first.ra_hours
+    assert second.date_utc == datetime(2020, 7, 15, 0, 0, 2)
+    assert second.date_jd == first.date_jd == round(second.date_jd, EPHEMERIS_JD_DECIMALS)
+
+
+def test_solve_kepler_converges():
+    """Test Kepler's equation is solved for low, near-parabolic and hyperbolic eccentricities."""
+    e = np.array([0.0, 0.3, 0.9, 0.999, 0.99999, 1.5, 4.0])
+    mean_anomaly = np.array([1.0, -7.0, 3.1, 0.001, 250.0, -3.0, 1e4])
+
+    anomaly = _solve_kepler(mean_anomaly, e)
+
+    elliptic = e < 1
+    np.testing.assert_allclose(
+        anomaly[elliptic] - e[elliptic] * np.sin(anomaly[elliptic]),
+        np.mod(mean_anomaly[elliptic], 2 * np.pi),
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        e[~elliptic] * np.sinh(anomaly[~elliptic]) - anomaly[~elliptic], mean_anomaly[~elliptic], rtol=1e-12
+    )
+
+
 def test_compute_visibility(comet_service, test_comet, test_location):
     """Test computing visibility for a comet."""
     time_utc = datetime(2020, 7, 15, 3, 0, 0)  # 9 PM local time
@@ -113,6 +214,40 @@ def test_compute_visibility(comet_service, test_comet, test_location):
     assert isinstance(visibility.is_dark_enough, bool)
 
 
+def test_compute_visibility_track(test_comet, test_location):
+    """Test a visibility track matches per-time visibility checks."""
+    comet_service = CometService(db=None)
+    times = [datetime(2020, 7, 15, hour, 0, 0) for hour in (3, 9)]
+
+    track = comet_service.compute_visibility_track(test_comet, test_location, times)
+
+    assert len(track) == len(times)
+    for visibility, time_utc in zip(track, times):
+        single = comet_service.compute_visibility(test_comet, test_location, time_utc)
+        assert visibility.ephemeris.date_utc == time_utc
+        assert visibility.altitude_deg == pytest.approx(single.altitude_deg, abs=1e-9)
+        assert visibility.azimuth_deg == pytest.approx(single.azimuth_deg, abs=1e-9)
+        assert visibility.is_dark_enough == single.is_dark_enough
+        assert visibility.recommended == single.recommended
+    assert comet_service.compute_visibility_track(test_comet, test_location, []) == []
+
+
+def test_horizon_rotation_matches_astropy(test_location):
+    """Test the ICRS-to-horizon rotation stays within 1 arcminute of a full AltAz transform."""
+    observer = (test_location.latitude, test_location.longitude, test_location.elevation, datetime(2020, 7, 15, 7))
+    ra_hours = np.array([0.0, 6.5, 13.2, 20.0])
+    dec_degrees = np.array([-30.0, 10.0, 60.0, 85.0])
+
+    altitudes, azimuths = _horizon_coordinates(ra_hours, dec_degrees, _icrs_to_horizon(*observer))
+
+    expected = SkyCoord(ra=ra_hours * u.hourangle, dec=dec_degrees * u.deg, frame="icrs").transform_to(
+        _altaz_frame(*observer)
+    )
+    np.testing.assert_allclose(altitudes, expected.alt.degree, atol=1 / 60)
+    azimuth_error = (azimuths - expected.az.degree + 180) % 360 - 180
+    np.testing.assert_allclose(azimuth_error * np.cos(np.radians(altitudes)), 0.0, atol=1 / 60)
+
+
 def test_get_visible_comets(comet_service, test_comet, test_location, override_get_db):
     """Test getting all visible comets."""
     # Add comet
@@ -130,6 +265,13 @@ def test_get_visible_comets(comet_service, test_comet, test_location, override_g
         assert vis.ephemeris is not None
         assert vis.altitude_deg is not None
 
+    # The batch path and the single-comet path share one horizon transform
+    single = comet_service.compute_visibility(test_comet, test_location, time_utc)
+    assert [vis.comet.designation for vis in visible] == ([test_comet.designation] if single.is_visible else [])
+    for vis in visible:
+        assert vis.altitude_deg == pytest.approx(single.altitude_deg, abs=1e-9)
+        assert vis.azimuth_deg == pytest.approx(single.azimuth_deg, abs=1e-9)
+
 
 def test_orbital_elements_validation():
     """Test that orbital elements are properly validated."""
@@ -2,11 +2,17 @@
 
 from datetime import datetime, timedelta
 
+import numpy as np
 import pytest
 import pytz
 
 from app.models import DSOTarget, Location
-from app.services.ephemeris_service import EphemerisService
+from app.services.ephemeris_service import (
+    FIELD_ROTATION_ZENITH_RATE,
+    EphemerisService,
+    _geographic_position,
+    field_rotation_rates,
+)
 
 
 class TestEphemerisServiceComprehensive:
@@ -100,6 +106,13 @@ class TestEphemerisServiceComprehensive:
         assert ephemeris.earth is not None
         assert ephemeris.sun is not None
 
+    def test_init_shares_loaded_ephemeris(self, ephemeris):
+        """Test that services share one loaded timescale and ephemeris."""
+        other = EphemerisService()
+
+        assert other.ts is ephemeris.ts
+        assert other.eph is ephemeris.eph
+
     # Twilight calculation tests
     def test_calculate_twilight_times_winter(self, ephemeris, test_location):
         """Test twilight times for winter date."""
@@ -221,6 +234,36 @@ class TestEphemerisServiceComprehensive:
         # Position should change over 3 hours
         assert alt1 != alt2 or az1 != az2
 
+    def test_calculate_positions_over_time_matches_single(self, ephemeris, test_location, m31_target, southern_target):
+        """Test the vectorized positions match calculate_position for every (target, time)."""
+        tz = pytz.timezone("America/Denver")
+        start = tz.localize(datetime(2025, 1, 15, 20, 0, 0))
+        times = [start + timedelta(minutes=45 * i) for i in range(6)]
+        targets = [m31_target, southern_target]
+
+        positions = ephemeris.calculate_positions_over_time(targets, test_location, times)
+
+        assert positions.shape == (2, 6, 2)
+        for i, target in enumerate(targets):
+            for j, time in enumerate(times):
+                alt, az = ephemeris.calculate_position(target, test_location, time)
+                assert positions[i, j, 0] == pytest.approx(alt, abs=1e-9)
+                assert positions[i, j, 1] == pytest.approx(az, abs=1e-9)
+
+    def test_calculate_positions_over_time_empty(self, ephemeris, test_location, m31_target):
+        """Test no times gives an empty result without calling Skyfield."""
+        positions = ephemeris.calculate_positions_over_time([m31_target], test_location, [])
+        assert positions.shape == (1, 0, 2)
+
+    def test_geographic_position_cached_per_location(self, test_location, equatorial_location):
+        """Test observer positions are built once per location."""
+        position = _geographic_position(test_location.latitude, test_location.longitude, test_location.elevation)
+
+        assert position is _geographic_position(45.92, -111.28, 1234.0)
+        assert position is not _geographic_position(
+            equatorial_location.latitude, equatorial_location.longitude, equatorial_location.elevation
+        )
+
     # Field rotation rate tests
     def test_calculate_field_rotation_rate_basic(self, ephemeris, test_location, m31_target):
         """Test field rotation rate calculation."""
@@ -267,6 +310,25 @@ class TestEphemerisServiceComprehensive:
         # Should return a value (may be high near pole)
         assert rate >= 0
 
+    def test_calculate_field_rotation_rates_matches_single(self, ephemeris, test_location, m31_target):
+        """Test vectorized rotation rates match the per-time calculation, including near zenith."""
+        tz = pytz.timezone("America/Denver")
+        start = tz.localize(datetime(2025, 1, 15, 18, 0, 0))
+        times = [start + timedelta(minutes=30 * i) for i in range(16)]
+
+        rates = ephemeris.calculate_field_rotation_rates(m31_target, test_location, times)
+
+        assert rates.shape == (16,)
+        expected = [ephemeris.calculate_field_rotation_rate(m31_target, test_location, time) for time in times]
+        assert rates == pytest.approx(expected, rel=1e-9)
+
+    def test_field_rotation_rates_near_zenith(self):
+        """Test positions above 85° get the capped zenith rate."""
+        rates = field_rotation_rates(45.0, np.array([30.0, 86.0, 90.0]), np.array([90.0, 90.0, 90.0]))
+
+        assert rates[0] == pytest.approx(15.0 * np.cos(np.radians(45.0)) / np.cos(np.radians(30.0)) / 60.0)
+        assert rates[1:].tolist() == [FIELD_ROTATION_ZENITH_RATE, FIELD_ROTATION_ZENITH_RATE]
+
     def test_calculate_field_rotation_varies_with_azimuth(self, ephemeris, test_location, m42_target):
         """Test that field rotation varies through the night."""
         tz = pytz.timezone("America/Denver")
@@ -414,7 +476,7 @@ class TestTwilightAngleIntegration:
         )
 
     def test_nautical_twilight_occurs_after_sunset(self, ephemeris, test_location):
-        """Test that nautical twilight end occurs after sunset (indirectly tests _find_twilight_angle)."""
+        """Test that nautical twilight end occurs after sunset."""
         tz = pytz.timezone("America/Denver")
         date = tz.localize(datetime(2025, 1, 15, 12, 0, 0))
 
@@ -429,7 +491,7 @@ class TestTwilightAngleIntegration:
         assert 15 * 60 < time_diff < 90 * 60, "Nautical twilight should be 15-90 min after sunset"
 
     def test_astronomical_twilight_duration(self, ephemeris, test_location):
-        """Test astronomical twilight timing (indirectly tests _find_twilight_angle with -18°)."""
+        """Test astronomical twilight timing."""
         tz = pytz.timezone("America/Denver")
         date = tz.localize(datetime(2025, 1, 15, 12, 0, 0))
 
@@ -1,9 +1,11 @@
 """Tests for file scanner service."""
 
 from datetime import datetime
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
+from astropy.io import fits
 from sqlalchemy.orm import Session
 
 from app.services.file_scanner_service import FileScannerService
@@ -32,10 +34,18 @@ class TestFileScannerService:
 class TestFuzzyMatching:
     """Test fuzzy matching of target names to catalog."""
 
+    @pytest.fixture(autouse=True)
+    def clear_catalog_names(self):
+        """Each test mocks its own catalog, so drop the process-wide name cache."""
+        FileScannerService.clear_cache()
+        yield
+        FileScannerService.clear_cache()
+
     def test_fuzzy_match_exact(self, file_scanner_service, mock_db):
         """Test exact match of target name."""
         # Mock DSOCatalog to return a match
         mock_dso = Mock()
+        mock_dso.catalog_id = "M31"
         mock_dso.common_name = "M031"
         mock_dso.caldwell_number = None
         mock_dso.catalog_name = "NGC"
@@ -52,6 +62,7 @@ class TestFuzzyMatching:
     def test_fuzzy_match_with_space(self, file_scanner_service, mock_db):
         """Test match handling space normalization (M 31 vs M31)."""
         mock_dso = Mock()
+        mock_dso.catalog_id = "M31"
         mock_dso.common_name = "M031"
         mock_dso.caldwell_number = None
         mock_dso.catalog_name = "NGC"
@@ -68,6 +79,7 @@ class TestFuzzyMatching:
         """Test matching alternate names (Andromeda vs M31)."""
         # This tests fuzzy matching with common names
         mock_dso = Mock()
+        mock_dso.catalog_id = "NGC224"
         mock_dso.common_name = "Andromeda"
         mock_dso.caldwell_number = None
         mock_dso.catalog_name = "NGC"
@@ -89,26 +101,44 @@ class TestFuzzyMatching:
 
         assert result is None
 
+    def test_fuzzy_match_catalog_designation(self, file_scanner_service, mock_db):
+        """Test catalog designations match by ID even without a matching common name."""
+        mock_db.query.return_value.all.return_value = [
+            Mock(catalog_id="NGC224", common_name="Andromeda Galaxy"),
+            Mock(catalog_id="IC434", common_name=None),
+        ]
+
+        assert file_scanner_service._fuzzy_match_catalog("NGC 0224") == ("NGC224", 1.0)
+        assert file_scanner_service._fuzzy_match_catalog("ic434") == ("IC434", 1.0)
+        assert file_scanner_service._fuzzy_match_catalog("NGC 7000") is None
+
+    def test_fuzzy_match_caches_catalog_names(self, file_scanner_service, mock_db):
+        """Test the catalog is queried once and reused across matches."""
+        mock_dso = Mock(catalog_id="M31", common_name="Andromeda Galaxy")
+        mock_db.query.return_value.all.return_value = [mock_dso]
+
+        assert file_scanner_service._fuzzy_match_catalog("Andromeda Galaxy") == ("M31", 1.0)
+        assert file_scanner_service._fuzzy_match_catalog("andromeda galaxy") == ("M31", 1.0)
+
+        mock_db.query.assert_called_once()
+
 
 class TestFitsMetadataExtraction:
     """Test FITS metadata extraction from image files."""
 
-    @patch("app.services.file_scanner_service.fits")
-    def test_extract_fits_metadata_success(self, mock_fits, file_scanner_service):
+    def test_extract_fits_metadata_success(self, file_scanner_service, tmp_path):
         """Test successful FITS metadata extraction."""
-        # Mock FITS file reading
-        mock_hdu = MagicMock()
-        mock_hdu.header = {
-            "OBJECT": "M31",
-            "EXPTIME": 10.0,
-            "FILTER": "L",
-            "CCD-TEMP": -10.5,
-            "GAIN": 100,
-            "DATE-OBS": "2024-12-25T20:30:00",
-        }
-        mock_fits.open.return_value.__enter__.return_value = [mock_hdu]
-
-        result = file_scanner_service._extract_fits_metadata("/path/to/file.fits")
+        hdu = fits.PrimaryHDU(np.zeros((4, 4), dtype=np.uint16))
+        hdu.header["OBJECT"] = "M31"
+        hdu.header["EXPTIME"] = 10.0
+        hdu.header["FILTER"] = "L"
+        hdu.header["CCD-TEMP"] = -10.5
+        hdu.header["GAIN"] = 100
+        hdu.header["DATE-OBS"] = "2024-12-25T20:30:00"
+        file_path = tmp_path / "file.fits"
+        hdu.writeto(file_path)
+
+        result = file_scanner_service._extract_fits_metadata(str(file_path))
 
         assert result is not None
         assert result["target_name"] == "M31"
@@ -116,19 +146,16 @@ class TestFitsMetadataExtraction:
         assert result["filter_name"] == "L"
         assert result["temperature_celsius"] == -10.5
         assert result["gain"] == 100
-        assert result["observation_date"] is not None
+        assert result["observation_date"] == datetime(2024, 12, 25, 20, 30)
 
-    @patch("app.services.file_scanner_service.fits")
-    def test_extract_fits_metadata_missing_fields(self, mock_fits, file_scanner_service):
+    def test_extract_fits_metadata_missing_fields(self, file_scanner_service, tmp_path):
         """Test FITS extraction with missing optional fields."""
-        # Mock FITS file with minimal fields
-        mock_hdu = MagicMock()
-        mock_hdu.header = {
-            "OBJECT": "M42",
-        }
-        mock_fits.open.return_value.__enter__.return_value = [mock_hdu]
+        hdu = fits.PrimaryHDU(np.zeros((4, 4), dtype=np.uint16))
+        hdu.header["OBJECT"] = "M42"
+        file_path = tmp_path / "file.fits"
+        hdu.writeto(file_path)
 
-        result = file_scanner_service._extract_fits_metadata("/path/to/file.fits")
+        result = file_scanner_service._extract_fits_metadata(str(file_path))
 
         assert result is not None
         assert result["target_name"] == "M42"
@@ -138,16 +165,30 @@ class TestFitsMetadataExtraction:
         assert result.get("temperature_celsius") is None
         assert result.get("gain") is None
 
-    @patch("app.services.file_scanner_service.fits")
-    def test_extract_fits_metadata_file_error(self, mock_fits, file_scanner_service):
+    def test_extract_fits_metadata_file_error(self, file_scanner_service, tmp_path):
         """Test FITS extraction with file read error."""
-        # Mock file read error
-        mock_fits.open.side_effect = Exception("File not found")
-
-        result = file_scanner_service._extract_fits_metadata("/path/to/nonexistent.fits")
+        result = file_scanner_service._extract_fits_metadata(str(tmp_path / "nonexistent.fits"))
 
         assert result is None
 
+    @patch("app.services.file_scanner_service._read_primary_header")
+    def test_extract_fits_metadata_batch(self, mock_read_header, file_scanner_service):
+        """Test batch extraction returns each file's metadata, None for unreadable files."""
+        headers = {"/a.fits": {"OBJECT": "M31"}, "/b.fits": {"OBJECT": "M42"}}
+
+        def read_header(file_path):
+            if file_path not in headers:
+                raise OSError("File not found")
+            return headers[file_path]
+
+        mock_read_header.side_effect = read_header
+
+        result = file_scanner_service._extract_fits_metadata_batch(["/a.fits", "/b.fits", "/missing.fits"])
+
+        assert result["/a.fits"]["target_name"] == "M31"
+        assert result["/b.fits"]["target_name"] == "M42"
+        assert result["/missing.fits"] is None
+
 
 class TestQualityMetrics:
     """Test quality metrics calculation placeholder."""
@@ -172,36 +213,24 @@ class TestQualityMetrics:
 class TestScanFiles:
     """Test main scan_files method that orchestrates file discovery and processing."""
 
-    @patch("app.services.file_scanner_service.os.walk")
-    @patch("app.services.file_scanner_service.os.path.getsize")
-    def test_scan_files_empty_directory(self, mock_getsize, mock_walk, file_scanner_service, mock_db):
+    def test_scan_files_empty_directory(self, tmp_path, file_scanner_service, mock_db):
         """Test scanning an empty directory."""
-        # Mock empty directory
-        mock_walk.return_value = [("/path/to/dir", [], [])]
-
-        result = file_scanner_service.scan_files("/path/to/dir", mock_db)
+        result = file_scanner_service.scan_files(str(tmp_path), mock_db)
 
         assert result == 0
 
-    @patch("app.services.file_scanner_service.os.walk")
-    @patch("app.services.file_scanner_service.os.path.getsize")
-    @patch("app.services.file_scanner_service.fits")
-    def test_scan_files_with_fits_files(self, mock_fits, mock_getsize, mock_walk, file_scanner_service, mock_db):
+    @patch("app.services.file_scanner_service._read_primary_header")
+    def test_scan_files_with_fits_files(self, mock_read_header, tmp_path, file_scanner_service, mock_db):
         """Test scanning directory with FITS files."""
-        # Mock directory with one FITS file
-        mock_walk.return_value = [
-            ("/path/to/dir", [], ["image.fits"]),
-        ]
-        mock_getsize.return_value = 1024 * 1024  # 1 MB
+        # Directory with one FITS file
+        (tmp_path / "image.fits").write_bytes(b"\0" * 2880)
 
         # Mock FITS metadata extraction
-        mock_hdu = MagicMock()
-        mock_hdu.header = {
+        mock_read_header.return_value = {
             "OBJECT": "M31",
             "EXPTIME": 10.0,
             "FILTER": "L",
         }
-        mock_fits.open.return_value.__enter__.return_value = [mock_hdu]
 
         # Mock database operations
         mock_db.add = Mock()
@@ -210,46 +239,80 @@ class TestScanFiles:
         # Mock fuzzy matching
         file_scanner_service._fuzzy_match_catalog = Mock(return_value=("M31", 1.0))
 
-        result = file_scanner_service.scan_files("/path/to/dir", mock_db)
+        result = file_scanner_service.scan_files(str(tmp_path), mock_db)
 
         assert result == 1
         mock_db.add.assert_called_once()
         mock_db.commit.assert_called_once()
+        output_file = mock_db.add.call_args[0][0]
+        assert output_file.file_path == str(tmp_path / "image.fits")
+        assert output_file.file_size_bytes == 2880
+        assert output_file.catalog_id == "M31"
 
-    @patch("app.services.file_scanner_service.os.walk")
-    @patch("app.services.file_scanner_service.os.path.getsize")
-    def test_scan_files_non_fits_file_skipped(self, mock_getsize, mock_walk, file_scanner_service, mock_db):
+    def test_scan_files_non_fits_file_skipped(self, tmp_path, file_scanner_service, mock_db):
         """Test that non-FITS files are skipped."""
-        # Mock directory with non-matching file
-        mock_walk.return_value = [
-            ("/path/to/dir", [], ["readme.txt"]),
-        ]
+        # Directory with non-matching file
+        (tmp_path / "readme.txt").write_text("notes")
 
-        result = file_scanner_service.scan_files("/path/to/dir", mock_db)
+        result = file_scanner_service.scan_files(str(tmp_path), mock_db)
 
         assert result == 0
         mock_db.add.assert_not_called()
 
-    @patch("app.services.file_scanner_service.os.walk")
-    @patch("app.services.file_scanner_service.os.path.getsize")
-    @patch("app.services.file_scanner_service.fits")
-    def test_scan_files_no_fuzzy_match(self, mock_fits, mock_getsize, mock_walk, file_scanner_service, mock_db):
+    @patch("app.services.file_scanner_service._read_primary_header")
+    def test_scan_files_no_fuzzy_match(self, mock_read_header, tmp_path, file_scanner_service, mock_db):
         """Test handling file when fuzzy matching returns no match."""
-        # Mock directory with FITS file
-        mock_walk.return_value = [
-            ("/path/to/dir", [], ["unknown.fits"]),
-        ]
-        mock_getsize.return_value = 1024
+        # Directory with FITS file
+        (tmp_path / "unknown.fits").write_bytes(b"\0" * 1024)
 
         # Mock FITS metadata
-        mock_hdu = MagicMock()
-        mock_hdu.header = {"OBJECT": "UNKNOWN_OBJECT"}
-        mock_fits.open.return_value.__enter__.return_value = [mock_hdu]
+        mock_read_header.return_value = {"OBJECT": "UNKNOWN_OBJECT"}
 
         # Mock no match from fuzzy matching
         file_scanner_service._fuzzy_match_catalog = Mock(return_value=None)
 
-        result = file_scanner_service.scan_files("/path/to/dir", mock_db)
+        result = file_scanner_service.scan_files(str(tmp_path), mock_db)
 
         # Should still process but with None catalog_id
         assert result == 1
+
+    def test_scan_files_walks_subdirectories(self, tmp_path, file_scanner_service, mock_db):
+        """Matching files in nested directories should be found, case-insensitively, without following symlinks."""
+        (tmp_path / "night1" / "lights").mkdir(parents=True)
+        (tmp_path / "top.JPG").write_bytes(b"x")
+        (tmp_path / "night1" / "a.png").write_bytes(b"x")
+        (tmp_path / "night1" / "lights" / "b.tiff").write_bytes(b"x")
+        (tmp_path / "link").symlink_to(tmp_path / "night1", target_is_directory=True)
+
+        result = file_scanner_service.scan_files(str(tmp_path), mock_db)
+
+        assert result == 3
+        assert [call[0][0].file_path for call in mock_db.add.call_args_list] == [
+            str(tmp_path / "top.JPG"),
+            str(tmp_path / "night1" / "a.png"),
+            str(tmp_path / "night1" / "lights" / "b.tiff"),
+        ]
+
+    @patch("app.services.file_scanner_service.SCAN_COMMIT_BATCH_SIZE", 2)
+    def test_scan_files_commits_in_batches(self, tmp_path, file_scanner_service, mock_db):
+        """Records should be committed once per batch and once for the remainder."""
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            (tmp_path / name).write_bytes(b"x")
+
+        result = file_scanner_service.scan_files(str(tmp_path), mock_db)
+
+        assert result == 3
+        assert mock_db.add.call_count == 3
+        assert mock_db.commit.call_count == 2
+
+    def test_scan_files_failed_batch_retries_each_file(self, tmp_path, file_scanner_service, mock_db):
+        """A failed batch commit should be rolled back and each file committed on its own, skipping bad ones."""
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            (tmp_path / name).write_bytes(b"x")
+        # Batch commit fails, then two retries succeed and the last fails
+        mock_db.commit.side_effect = [Exception("batch"), None, None, Exception("bad")]
+
+        result = file_scanner_service.scan_files(str(tmp_path), mock_db)
+
+        assert result == 2
+        assert mock_db.rollback.call_count == 2
@@ -3,14 +3,70 @@
 from datetime import datetime
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 import pytz
 
 from app.models import DSOTarget, Location, TargetVisibility
-from app.services.catalog_service import CatalogService
+from app.services.catalog_service import (
+    SKY_BOX_COLUMNS,
+    SKY_BOX_ROWS,
+    VISIBILITY_STATUS_CODES,
+    CatalogService,
+    _classify_altitudes,
+    _filter_positions,
+    angular_separation_arcmin,
+    sky_box_ids,
+    sky_boxes_in_cone,
+)
 from app.services.ephemeris_service import EphemerisService
 
 
+@pytest.fixture(autouse=True)
+def clear_catalog_index():
+    """Start and end each test without the process-wide catalog index."""
+    CatalogService.clear_cache()
+    yield
+    CatalogService.clear_cache()
+
+
+def _catalog_row(**overrides):
+    """A catalog query row (a Pisces NGC galaxy unless overridden; catalog_id follows catalog_number)."""
+    fields = {
+        "catalog_name": "NGC",
+        "catalog_number": 1,
+        "common_name": None,
+        "caldwell_number": None,
+        "object_type": "galaxy",
+        "ra_hours": 1.0,
+        "dec_degrees": 10.0,
+        "magnitude": 1.0,
+        "size_major_arcmin": 2.0,
+        "constellation": "Psc",
+        "full_constellation": "Pisces",
+    }
+    fields.update(overrides)
+    fields.setdefault("catalog_id", f"{fields['catalog_name']}{fields['catalog_number']}")
+    return MagicMock(**fields)
+
+
+def _catalog_db(rows):
+    """A database session whose catalog query returns rows, whether streamed (index load) or paged."""
+    query = MagicMock()
+    query.outerjoin.return_value = query
+    query.add_columns.return_value = query
+    query.filter.return_value = query
+    query.count.return_value = len(rows)
+    query.order_by.return_value = query
+    query.offset.return_value = query
+    query.limit.return_value = query
+    query.yield_per.return_value = rows
+    query.all.return_value = rows
+    db = MagicMock()
+    db.query.return_value = query
+    return db
+
+
 def test_add_visibility_info():
     """Test adding visibility info to target."""
     # Mock database session
@@ -95,3 +151,268 @@ def test_add_visibility_info_at_horizon():
     assert enriched.visibility.current_altitude == 15.0
     # 15° altitude is in the "rising" category (between 0-30°)
     assert enriched.visibility.status == "rising"
+
+
+def test_add_visibility_info_bulk():
+    """Test batched visibility for several targets in one pass."""
+    db = MagicMock()
+    service = CatalogService(db)
+    tz = pytz.timezone("America/Denver")
+
+    # Target 0 peaks at 62.5° on the second sample; target 1 never rises
+    ephemeris = MagicMock(spec=EphemerisService)
+    ephemeris.calculate_twilight_times.return_value = {
+        "astronomical_twilight_end": tz.localize(datetime(2025, 11, 15, 19, 30)),
+        "astronomical_twilight_start": tz.localize(datetime(2025, 11, 15, 20, 0)),
+    }
+    ephemeris.calculate_positions_batch.side_effect = [
+        (np.array([40.0, -20.0]), np.array([100.0, 10.0])),
+        (np.array([62.5, -15.0]), np.array([180.5, 20.0])),
+        (np.array([50.0, -25.0]), np.array([200.0, 30.0])),
+        (np.array([-12.0]), np.array([350.0])),  # midnight position for target 1 only
+    ]
+
+    targets = [
+        DSOTarget(
+            name=name,
+            catalog_id=name,
+            ra_hours=ra,
+            dec_degrees=dec,
+            object_type="galaxy",
+            magnitude=3.4,
+            size_arcmin=10.0,
+            description=name,
+        )
+        for name, ra, dec in [("M31", 0.71, 41.27), ("NGC 55", 0.25, -39.2)]
+    ]
+    location = Location(latitude=45.9183, longitude=-111.5433, elevation=1234, timezone="America/Denver")
+    current_time = tz.localize(datetime(2025, 11, 15, 21, 0))
+
+    enriched = service.add_visibility_info_bulk(targets, location, ephemeris, current_time)
+
+    assert [t.catalog_id for t in enriched] == ["M31", "NGC 55"]
+    assert enriched[0].visibility.current_altitude == 62.5
+    assert enriched[0].visibility.status == "visible"
+    assert enriched[0].visibility.is_optimal_now is True
+    assert enriched[0].visibility.best_time_tonight == tz.localize(datetime(2025, 11, 15, 19, 45))
+    assert enriched[1].visibility.current_altitude == -12.0
+    assert enriched[1].visibility.status == "below_horizon"
+    assert enriched[1].visibility.best_time_tonight is None
+    assert enriched[1].visibility.best_altitude_tonight is None
+    for target in enriched:
+        assert TargetVisibility.model_validate(target.visibility.model_dump(), strict=True) == target.visibility
+    assert service.add_visibility_info_bulk([], location, ephemeris, current_time) == []
+
+
+def test_db_row_to_target_is_valid_model():
+    """Test that targets built without validation still pass strict validation."""
+    db = MagicMock()
+    db.query.return_value.all.return_value = [("Ori", "Orion")]
+    service = CatalogService(db)
+    row = MagicMock(
+        catalog_id="M42",
+        catalog_name="NGC",
+        catalog_number=1976,
+        common_name="M042",
+        caldwell_number=None,
+        object_type="emission_nebula",
+        ra_hours=5.59,
+        dec_degrees=-5.39,
+        magnitude=4.0,
+        size_major_arcmin=85.0,
+        constellation="Ori",
+    )
+
+    target = service._db_row_to_target(row)
+
+    validated = DSOTarget.model_validate(target.model_dump(), strict=True)
+    assert validated == target
+    assert target.catalog_id == "M42"
+    assert target.description == "Emission Nebula in Orion (mag 4.0), 85.0' across"
+    assert target.visibility is None
+
+
+def test_classify_altitudes_boundaries():
+    """Test vectorized status classification matches the scalar thresholds."""
+    altitudes = np.array([-5.0, 0.0, 0.1, 29.9, 30.0, 70.0, 70.1, 89.0])
+
+    statuses = [VISIBILITY_STATUS_CODES[code] for code in _classify_altitudes(altitudes)]
+
+    assert statuses == [
+        "below_horizon",
+        "below_horizon",
+        "rising",
+        "rising",
+        "visible",
+        "visible",
+        "setting",
+        "setting",
+    ]
+
+
+def test_catalog_index_loaded_once():
+    """Test that lookups and listings are served from the in-memory index after one query."""
+    db = _catalog_db(
+        [
+            _catalog_row(
+                catalog_id="M31",
+                catalog_number=224,
+                common_name="M031",
+                ra_hours=0.71,
+                dec_degrees=41.27,
+                magnitude=3.4,
+                constellation="And",
+                full_constellation="Andromeda",
+            )
+        ]
+    )
+
+    first = CatalogService(db).get_target_by_id("M31")
+    second = CatalogService(db).get_target_by_id("ngc224")
+    galaxies = CatalogService(db).filter_targets(object_types=["galaxy"], catalog="M")
+
+    assert first.catalog_id == "M31"
+    assert first.description.startswith("Galaxy in Andromeda")
+    assert second is first
+    assert galaxies == [first]
+    assert list(CatalogService(db).iter_all_targets()) == [first]
+    assert list(CatalogService(db).iter_all_targets(limit=1, offset=1)) == []
+    assert CatalogService(db).get_targets_by_ids(["m31", "NGC 224", "IC434", "bogus"]) == {
+        "m31": first,
+        "NGC 224": first,
+    }
+    assert db.query.call_count == 1
+
+
+def test_filter_targets_cached_per_filter():
+    """Test that repeated filters, including other pages, reuse the cached matches until the cache is cleared."""
+    rows = [
+        _catalog_row(catalog_number=number, object_type=object_type, magnitude=float(number))
+        for number, object_type in [(1, "galaxy"), (2, "galaxy"), (3, "open_cluster")]
+    ]
+    service = CatalogService(_catalog_db(rows))
+
+    first_page = service.filter_targets(object_types=["galaxy"], limit=1)
+    second_page = service.filter_targets(object_types=["galaxy", "galaxy"], limit=1, offset=1)
+
+    assert [t.catalog_id for t in first_page + second_page] == ["NGC1", "NGC2"]
+    assert _filter_positions.cache_info().misses == 1
+    assert _filter_positions.cache_info().hits == 1
+
+    matches = service.iter_targets(object_types=["galaxy"])
+    assert next(matches).catalog_id == "NGC1"
+    assert [t.catalog_id for t in matches] == ["NGC2"]
+
+    CatalogService.clear_cache()
+    assert _filter_positions.cache_info().currsize == 0
+
+
+def test_filter_targets_in_cone():
+    """Test cone search returns only targets within the radius, brightest first, across RA 0h."""
+    rows = [
+        _catalog_row(catalog_number=number, ra_hours=ra_hours, dec_degrees=dec_degrees, magnitude=magnitude)
+        for number, ra_hours, dec_degrees, magnitude in [
+            (4, 12.0, 10.0, 5.0),  # opposite side of the sky
+            (3, 0.0, 11.5, 6.0),  # 90' north, outside
+            (2, 0.02, 10.2, 7.0),  # ~20' from center
+            (1, 23.99, 10.0, 8.0),  # ~9' from center, across RA 0h
+        ]
+    ]
+
+    targets = CatalogService(_catalog_db(rows)).filter_targets_in_cone(
+        ra_hours=0.0, dec_degrees=10.0, radius_arcmin=30.0
+    )
+
+    assert [t.catalog_id for t in targets] == ["NGC2", "NGC1"]
+
+
+def test_sky_boxes():
+    """Test box assignment and that cone coverage wraps RA 0h and spans all RA around a pole."""
+    ids = sky_box_ids(np.array([0.0, 23.99, 12.0]), np.array([-90.0, 0.0, 90.0]))
+    assert ids.tolist() == [
+        0,
+        SKY_BOX_ROWS // 2 * SKY_BOX_COLUMNS + SKY_BOX_COLUMNS - 1,
+        SKY_BOX_ROWS * SKY_BOX_COLUMNS - SKY_BOX_COLUMNS // 2,
+    ]
+
+    across_zero = sky_boxes_in_cone(ra_hours=0.0, dec_degrees=0.0, radius_degrees=1.0)
+    assert sky_box_ids(23.99, 0.5) in across_zero
+    assert sky_box_ids(0.01, -0.5) in across_zero
+    assert sky_box_ids(12.0, 0.0) not in across_zero
+
+    # 87°-90° spans the two northernmost box rows, all the way around
+    polar = sky_boxes_in_cone(ra_hours=6.0, dec_degrees=89.0, radius_degrees=2.0)
+    assert len(polar) == 2 * SKY_BOX_COLUMNS
+    assert sky_box_ids(18.0, 89.5) in polar
+
+
+def test_get_targets_in_boxes():
+    """Test that box lookups return only targets in the requested boxes, brightest first."""
+    rows = [
+        _catalog_row(catalog_number=number, ra_hours=ra_hours, dec_degrees=dec_degrees, magnitude=float(number))
+        for number, ra_hours, dec_degrees in [(1, 1.0, 10.0), (2, 1.01, 10.1), (3, 12.0, -40.0)]
+    ]
+    service = CatalogService(_catalog_db(rows))
+
+    box = int(sky_box_ids(1.0, 10.0))
+
+    assert [t.catalog_id for t in service.get_targets_in_boxes([box])] == ["NGC1", "NGC2"]
+    assert [t.catalog_id for t in service.get_targets_in_boxes([int(sky_box_ids(12.0, -40.0)), box])] == [
+        "NGC1",
+        "NGC2",
+        "NGC3",
+    ]
+    assert service.get_targets_in_boxes([box + 1]) == []
+
+
+def test_angular_separation_arcmin():
+    """Test separations against known values, including across RA 0h and at the pole."""
+    ra1 = np.radians([0.0, 359.9, 10.0, 45.0])
+    dec1 = np.radians([0.0, 0.0, 90.0, 30.0])
+    ra2 = np.radians([1.0, 0.1, 190.0, 45.0])
+    dec2 = np.radians([0.0, 0.0, 89.0, 31.0])
+
+    separation = angular_separation_arcmin(ra1, dec1, ra2, dec2)
+
+    np.testing.assert_allclose(separation, [60.0, 12.0, 60.0, 60.0], atol=1e-6)
+
+
+def test_get_targets_page_before_index_loaded():
+    """Test that a page is read from the database without building the full index."""
+    db = _catalog_db(
+        [
+            _catalog_row(
+                catalog_number=7000,
+                common_name="North America Nebula",
+                object_type="emission_nebula",
+                constellation="Cyg",
+                full_constellation="Cygnus",
+            )
+        ]
+    )
+
+    page = CatalogService(db).get_targets_page(offset=0, page_size=50)
+
+    assert [t.catalog_id for t in page] == ["NGC7000"]
+    assert page[0].description.startswith("Emission Nebula in Cygnus")
+    db.query.return_value.limit.assert_called_once_with(50)
+    db.query.return_value.yield_per.assert_not_called()
+    assert not CatalogService.is_index_loaded()
+
+
+def test_search_catalog():
+    """Test that a search filters, counts and pages in SQL and returns rows with the total."""
+    rows = [_catalog_row(catalog_number=7000, constellation="Cyg", constellation_common="Swan")]
+    db = _catalog_db(rows)
+    query = db.query.return_value
+
+    results, total = CatalogService(db).search_catalog(
+        search="7000", object_type="emission_nebula", constellation="Cyg", sort_by="magnitude", offset=40, limit=20
+    )
+
+    assert results == rows
+    assert total == 1
+    assert query.filter.call_count == 3
+    query.order_by.assert_called_once()
+    query.limit.assert_called_once_with(20)
+    query.offset.assert_called_once_with(40)